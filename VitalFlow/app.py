@@ -1,54 +1,336 @@
 """
 VitalFlow AI - FastAPI Backend Server
 Run with: uvicorn app:app --reload --port 8000
+Production: gunicorn -c gunicorn_conf.py app:app
 """
+import os
 import sys
+import json
+import time
+import uuid
+import asyncio
+import hashlib
+import functools
+import threading
+from collections import OrderedDict
+from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import Optional, List
+from typing import Optional, List, Dict, Any, Literal, Iterable
 from datetime import datetime
 
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from fastapi import FastAPI, HTTPException
+import anyio
+from fastapi import FastAPI, BackgroundTasks, HTTPException, Request, Response, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel, field_validator
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 # Import our modules
 from shared.models import Patient, Bed, Staff, PatientStatus, BedType, StaffRole, StaffStatus
-from shared.utils import get_enum_value
+from shared.utils import get_enum_value, ENUM_STR
 from backend.core_logic.state import hospital_state
 from backend.core_logic.bed_manager import bed_manager
 from backend.core_logic.staff_manager import staff_manager
 from backend.core_logic.triage_engine import triage_engine
 from backend.core_logic.emergency_protocols import emergency_protocol_engine as protocol_engine
 from backend.core_logic.ambulance_manager import ambulance_manager
-from backend.core_logic.billing_agent import billing_agent
+from backend.core_logic.billing_agent import billing_agent, InsuranceType
 from backend.core_logic.stock_manager import stock_manager
-from backend.core_logic.patient_report import patient_report_system
+from backend.core_logic.patient_report import patient_report_system, MealStatus
 from backend.core_logic.prescription_scanner import prescription_scanner
 from backend.core_logic.doctor_alerts import doctor_alert_system, DoctorStatus, AlertPriority
+from backend.core_logic.response_cache import (
+    response_cache, SHORT_TTL, NORMAL_TTL, LONG_TTL, PATIENT_CACHE_NAMESPACES
+)
+from backend.core_logic.redis_pool import get_redis_client, close_redis_clients, RedisError
+from backend.core_logic.alert_events import alert_events
 from backend.ai_services.medicine_ai import medicine_ai
 from backend.ai_services.voice_alerts import voice_service
 from backend.ai_services.fall_detector import fall_detector
 from backend.agents.vitalflow_agent import vitalflow_agent
 
 # ============== APP SETUP ==============
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered with orjson (falls back to stdlib json)"""
+    
+    def render(self, content) -> bytes:
+        if ORJSON_AVAILABLE:
+            return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+        return super().render(content)
+
+# Items per chunk when streaming list responses
+STREAM_BATCH_SIZE = 256
+
+def stream_json_list(key: str, items: Iterable, fields: Optional[Dict[str, Any]] = None) -> StreamingResponse:
+    """
+    Stream {key: [...]} without building the full list or its JSON in memory.
+    Items are encoded as they are produced and sent in batches; items that are
+    already JSON bytes are written as-is.
+    Small summary fields, if given, are written ahead of the list.
+    """
+    if ORJSON_AVAILABLE:
+        dumps = lambda item: orjson.dumps(item, option=orjson.OPT_NON_STR_KEYS)
+    else:
+        dumps = lambda item: json.dumps(item, default=str).encode()
+    
+    def generate():
+        if fields:
+            yield dumps(fields)[:-1] + b',"' + key.encode() + b'":['
+        else:
+            yield b'{"' + key.encode() + b'":['
+        chunk = []
+        for i, item in enumerate(items):
+            if i:
+                chunk.append(b",")
+            chunk.append(item if isinstance(item, bytes) else dumps(item))
+            if len(chunk) >= STREAM_BATCH_SIZE:
+                yield b"".join(chunk)
+                chunk.clear()
+        chunk.append(b"]}")
+        yield b"".join(chunk)
+    
+    return StreamingResponse(generate(), media_type="application/json")
+
+def cached_json_response(namespace: str, expire: int = NORMAL_TTL):
+    """
+    Cache an endpoint's rendered JSON body instead of its return value.
+    Hits ship the stored bytes directly, skipping serialization entirely;
+    misses skip FastAPI's jsonable_encoder pass as orjson renders the result directly.
+    The namespace may reference keyword arguments like response_cache.cached.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            ns = namespace.format(**kwargs)
+            key = response_cache.make_key(func, args, kwargs)
+            body = response_cache.get(ns, key, raw=True)
+            if body is None:
+                body = FastJSONResponse(func(*args, **kwargs)).body
+                response_cache.set(ns, key, body, expire, raw=True)
+            return Response(content=body, media_type="application/json")
+        return wrapper
+    return decorator
+
+# Alert check endpoints are hit by schedulers; calls within this many seconds reuse the last run
+CHECK_MIN_INTERVAL = int(os.getenv("CHECK_MIN_INTERVAL", "30"))
+# Seconds a worker that lost the Redis lock waits for the winner's result before checking itself
+CHECK_WAIT_TIMEOUT = 10.0
+CHECK_POLL_INTERVAL = 0.05
+_check_locks: Dict[str, threading.Lock] = {}  # check name -> lock, so unrelated checks don't serialize
+_check_locks_guard = threading.Lock()
+_last_checks: Dict[str, tuple] = {}  # check name -> (monotonic time, result)
+
+def _shared_check_result(redis_client, name: str):
+    """
+    Claim a check run across workers, or fetch the result of the run another worker claimed.
+    
+    Returns:
+        (token, None) if this worker should run the check and publish under token,
+        (None, result) with the other worker's result, or (None, None) to check locally
+    """
+    token = uuid.uuid4().hex
+    lock_key = f"vf:check:{name}"
+    if redis_client.set(lock_key, token, nx=True, ex=CHECK_MIN_INTERVAL):
+        return token, None
+    
+    # Wait for the winner to publish the result of its run
+    winner = redis_client.get(lock_key)
+    deadline = time.monotonic() + CHECK_WAIT_TIMEOUT
+    while winner is not None and time.monotonic() < deadline:
+        shared = redis_client.get(f"{lock_key}:result:{winner.decode()}")
+        if shared is not None:
+            return None, json.loads(shared)
+        time.sleep(CHECK_POLL_INTERVAL)
+    return None, None
+
+def run_debounced_check(name: str, check):
+    """
+    Run a periodic alert check at most once per CHECK_MIN_INTERVAL.
+    Overlapping or retried calls get the previous result instead of rescanning.
+    With Redis configured, a SET NX lock with the same TTL keeps several
+    workers from running the same check back to back; the winner stores its
+    result under the lock's token and the other workers return that result.
+    Redis errors fall back to running the check locally.
+    
+    Args:
+        name: Check identifier
+        check: Callable performing the check
+        
+    Returns:
+        Tuple of (result, fresh) where fresh is False for a reused result
+    """
+    with _check_locks_guard:
+        lock = _check_locks.setdefault(name, threading.Lock())
+    with lock:
+        last = _last_checks.get(name)
+        now = time.monotonic()
+        if last and now - last[0] < CHECK_MIN_INTERVAL:
+            return last[1], False
+        
+        try:
+            redis_client = get_redis_client()
+        except Exception:
+            redis_client = None
+        token = None
+        if redis_client is not None:
+            try:
+                token, shared = _shared_check_result(redis_client, name)
+                if shared is not None:
+                    _last_checks[name] = (now, shared)
+                    return shared, False
+            except RedisError as e:
+                print(f"Warning: Redis check lock failed, running {name} check locally: {e}")
+                redis_client = None
+        
+        result = check()
+        _last_checks[name] = (now, result)
+        if redis_client is not None and token is not None:
+            try:
+                redis_client.set(f"vf:check:{name}:result:{token}", json.dumps(result, default=str),
+                                 ex=CHECK_MIN_INTERVAL)
+            except RedisError as e:
+                print(f"Warning: Could not share {name} check result: {e}")
+        return result, True
+
+# Manual agent cycles run off the request path; results are kept for polling
+AGENT_CYCLE_JOBS_MAX = 100
+agent_cycle_queue: Optional[asyncio.Queue] = None
+agent_cycle_jobs: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+async def agent_cycle_worker():
+    """Run queued agent cycles one at a time in a worker thread"""
+    while True:
+        job_id = await agent_cycle_queue.get()
+        job = agent_cycle_jobs.get(job_id)
+        if job is not None:
+            job["status"] = "running"
+            try:
+                job["result"] = await asyncio.to_thread(vitalflow_agent.run_cycle)
+                job["status"] = "completed"
+                response_cache.clear(*PATIENT_CACHE_NAMESPACES)
+            except Exception as e:
+                job["status"] = "failed"
+                job["error"] = str(e)
+            job["finished_at"] = datetime.now()
+        agent_cycle_queue.task_done()
+
+# Sync endpoints run in a thread pool (Starlette default: 40 threads). The AI checklist
+# and voice endpoints block on remote APIs, so allow more concurrent threads.
+THREADPOOL_SIZE = int(os.getenv("THREADPOOL_SIZE", "100"))
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Start the agent cycle worker for the lifetime of the app. On shutdown, stop the
+    worker and the autonomous agent loop (if started) and release pooled connections.
+    """
+    global agent_cycle_queue
+    anyio.to_thread.current_default_thread_limiter().total_tokens = THREADPOOL_SIZE
+    agent_cycle_queue = asyncio.Queue()
+    worker = asyncio.create_task(agent_cycle_worker())
+    yield
+    await vitalflow_agent.stop_async()
+    worker.cancel()
+    try:
+        await worker
+    except asyncio.CancelledError:
+        pass
+    close_redis_clients()
+
 app = FastAPI(
     title="VitalFlow AI",
     description="Hospital Command Center - Balancing Risk and Capacity",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=FastJSONResponse,
+    lifespan=lifespan
 )
 
 # Enable CORS for frontend
+# Explicit origins are required with credentials; the long max_age lets browsers cache preflights
+CORS_ORIGINS = [
+    origin.strip()
+    for origin in os.getenv(
+        "CORS_ORIGINS", "http://localhost:3000,http://localhost:8501,http://localhost:8502"
+    ).split(",")
+    if origin.strip()
+]
+
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
+    allow_origins=CORS_ORIGINS,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST", "PUT", "DELETE"],
+    allow_headers=["Authorization", "Content-Type", "If-None-Match"],
+    expose_headers=["ETag"],
+    max_age=86400,
 )
 
+@app.middleware("http")
+async def state_sync_middleware(request: Request, call_next):
+    """Pick up state changes made by other workers (no-op without Redis)"""
+    if hospital_state.sync_due():
+        # Version check and reload hit Redis; keep them off the event loop
+        await asyncio.to_thread(hospital_state.sync)
+    return await call_next(request)
+
+# Polled GET endpoints that support conditional requests (ETag / 304)
+# Exact paths: a prefix would also catch detail routes like /api/patients/{id}
+ETAG_PATHS = frozenset((
+    "/api/dashboard", "/api/patients", "/api/beds", "/api/beds/available", "/api/staff", "/api/alerts"
+))
+
+@app.middleware("http")
+async def etag_middleware(request: Request, call_next):
+    """Tag polled responses with an ETag and answer unchanged polls with 304"""
+    response = await call_next(request)
+    if (request.method != "GET" or response.status_code != 200
+            or request.url.path not in ETAG_PATHS):
+        return response
+    
+    body = b"".join([chunk async for chunk in response.body_iterator])
+    etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+    headers = {"ETag": etag, "Cache-Control": "max-age=5, must-revalidate"}
+    
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    
+    headers = {**response.headers, **headers}
+    return Response(content=body, status_code=response.status_code, headers=headers,
+                    media_type=response.media_type)
+
+# Compress large JSON payloads (added last so it wraps the ETag middleware
+# and the ETag is computed on the uncompressed body)
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
+# ============== LOOKUP TABLES ==============
+# Request strings -> enums, built once instead of per request
+ADMISSION_STATUS_MAP = {
+    s.value: s for s in (PatientStatus.CRITICAL, PatientStatus.SERIOUS,
+                         PatientStatus.STABLE, PatientStatus.RECOVERING)
+}
+STAFF_ROLE_MAP = {
+    r.value: r for r in (StaffRole.DOCTOR, StaffRole.NURSE, StaffRole.WARDBOY, StaffRole.DRIVER)
+}
+BED_TYPE_MAP = {bt.value: bt for bt in (BedType.ICU, BedType.EMERGENCY, BedType.GENERAL)}
+BILLING_BED_TYPE_MAP = {name.lower(): bt for name, bt in BED_TYPE_MAP.items()}
+INSURANCE_MAP = {
+    "ayushman": InsuranceType.AYUSHMAN_BHARAT,
+    "ayushman_bharat": InsuranceType.AYUSHMAN_BHARAT,
+    "esi": InsuranceType.ESI,
+    "cghs": InsuranceType.CGHS,
+    "private": InsuranceType.PRIVATE,
+    "none": InsuranceType.NONE
+}
+
 # ============== REQUEST MODELS ==============
 class PatientCreate(BaseModel):
     name: str
@@ -123,7 +405,7 @@ class ConsultationNote(BaseModel):
     findings: str
     diagnosis: str
     treatment_plan: str
-    next_visit: Optional[str] = None
+    next_visit: Optional[datetime] = None
     priority: str = "Routine"
 
 class PrescriptionUpload(BaseModel):
@@ -140,9 +422,9 @@ class MedicineConfirmation(BaseModel):
     notes: str = ""
 
 class DoctorStatusUpdate(BaseModel):
-    status: str
+    status: DoctorStatus
     location: str = ""
-    on_leave_until: Optional[str] = None
+    on_leave_until: Optional[datetime] = None
     leave_reason: str = ""
 
 class PatientTracking(BaseModel):
@@ -153,7 +435,7 @@ class PatientTracking(BaseModel):
     primary_doctor_id: str
     primary_doctor_name: str
     criticality_level: int = 3
-    next_visit: Optional[str] = None
+    next_visit: Optional[datetime] = None
 
 class CriticalityUpdate(BaseModel):
     criticality_level: int
@@ -164,6 +446,90 @@ class AlertAcknowledge(BaseModel):
     response: str = ""
     coming_eta: Optional[int] = None
 
+# Billing, order and CCTV actions
+class BillMedicine(BaseModel):
+    medicine_name: str
+    quantity: int = 1
+
+class BillProcedure(BaseModel):
+    procedure_name: str
+
+def _lowercase(value):
+    """Case-insensitive Literal fields: "ICU" and "icu" were both accepted before"""
+    return value.lower() if isinstance(value, str) else value
+
+class BedCharge(BaseModel):
+    bed_type: Literal["icu", "emergency", "general"]
+    days: float = 1.0
+    
+    _normalize_bed_type = field_validator("bed_type", mode="before")(_lowercase)
+
+class InsuranceApply(BaseModel):
+    insurance_type: Literal["ayushman", "ayushman_bharat", "esi", "cghs", "private", "none"]
+    
+    _normalize_insurance_type = field_validator("insurance_type", mode="before")(_lowercase)
+
+class OrderPlacement(BaseModel):
+    placed_by: str
+
+class OrderReceipt(BaseModel):
+    received_by: str
+
+class CCTVResponseAssign(BaseModel):
+    nurse_id: Optional[str] = None
+    doctor_id: Optional[str] = None
+
+class CCTVAlertResolve(BaseModel):
+    notes: str
+    patient_id: Optional[str] = None
+
+# ============== RESPONSE MODELS ==============
+# Declared on the list endpoints so FastAPI serializes through pydantic-core
+# instead of walking the payload with jsonable_encoder
+class PatientOut(BaseModel):
+    id: str
+    name: str
+    age: int
+    status: str
+    spo2: float
+    heart_rate: int
+    bed_id: Optional[str] = None
+    doctor_id: Optional[str] = None
+    nurse_id: Optional[str] = None
+    priority: int
+    diagnosis: str = ""
+
+class PatientListOut(BaseModel):
+    patients: List[PatientOut]
+    count: int
+
+class BedOut(BaseModel):
+    id: str
+    type: str
+    ward: str
+    floor: int
+    is_occupied: bool
+    patient_id: Optional[str] = None
+    patient_name: Optional[str] = None
+
+class BedListOut(BaseModel):
+    beds: List[BedOut]
+    occupancy: Dict[str, Dict[str, int]]
+
+class StaffOut(BaseModel):
+    id: str
+    name: str
+    role: str
+    status: str
+    specialization: str = ""
+    hours_worked: float
+    is_fatigued: bool
+    patient_count: int
+
+class StaffListOut(BaseModel):
+    staff: List[StaffOut]
+    summary: Dict[str, Any]
+
 # ============== DASHBOARD ENDPOINTS ==============
 @app.get("/")
 def root():
@@ -182,9 +548,8 @@ def root():
         }
     }
 
-@app.get("/api/dashboard")
-def get_dashboard():
-    """Get complete dashboard data"""
+def build_dashboard() -> dict:
+    """Assemble dashboard data from the managers (CPU-bound, in-memory)"""
     stats = hospital_state.get_stats()
     triage_summary = triage_engine.get_triage_summary()
     staff_summary = staff_manager.get_staff_status_summary()
@@ -192,7 +557,7 @@ def get_dashboard():
     queue = triage_engine.get_patient_queue()
     
     return {
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": datetime.now(),
         "hospital_stats": stats,
         "triage_summary": triage_summary,
         "staff_summary": staff_summary,
@@ -201,23 +566,33 @@ def get_dashboard():
         "recent_decisions": hospital_state.get_recent_decisions(5)
     }
 
+@app.get("/api/dashboard")
+@response_cache.cached("dashboard", expire=SHORT_TTL)
+async def get_dashboard():
+    """Get complete dashboard data"""
+    # Misses build off-loop in a single worker thread (the cache offloads its Redis I/O too)
+    return await asyncio.to_thread(build_dashboard)
+
 # ============== PATIENT ENDPOINTS ==============
-@app.get("/api/patients")
+@app.get("/api/patients", response_model=PatientListOut)
+@response_cache.cached("patients", expire=NORMAL_TTL)
 def get_patients():
     """Get all patients"""
+    table = hospital_state.get_patient_table()
+    priorities = triage_engine.calculate_priority_bulk(table).tolist()
     patients = []
-    for p in hospital_state.patients.values():
+    for p, priority in zip(table.patients, priorities):
         patients.append({
             "id": p.id,
             "name": p.name,
             "age": p.age,
-            "status": get_enum_value(p.status),
+            "status": ENUM_STR[p.status],
             "spo2": p.spo2,
             "heart_rate": p.heart_rate,
             "bed_id": p.bed_id,
             "doctor_id": p.assigned_doctor_id,
             "nurse_id": p.assigned_nurse_id,
-            "priority": triage_engine.calculate_priority(p),
+            "priority": priority,
             "diagnosis": p.diagnosis
         })
     return {"patients": patients, "count": len(patients)}
@@ -254,16 +629,10 @@ def get_patient(patient_id: str):
 def create_patient(data: PatientCreate):
     """Admit a new patient"""
     # Generate ID
-    patient_id = f"P-{datetime.now().strftime('%H%M%S')}"
+    patient_id = hospital_state.next_id("patients", "P")
     
     # Map status string to enum
-    status_map = {
-        "Critical": PatientStatus.CRITICAL,
-        "Serious": PatientStatus.SERIOUS,
-        "Stable": PatientStatus.STABLE,
-        "Recovering": PatientStatus.RECOVERING
-    }
-    status = status_map.get(data.status, PatientStatus.STABLE)
+    status = ADMISSION_STATUS_MAP.get(data.status, PatientStatus.STABLE)
     
     patient = Patient(
         id=patient_id,
@@ -280,6 +649,7 @@ def create_patient(data: PatientCreate):
     
     # Process through triage
     result = triage_engine.process_incoming_patient(patient)
+    response_cache.clear(*PATIENT_CACHE_NAMESPACES)
     
     return {
         "success": True,
@@ -297,16 +667,19 @@ def update_vitals(patient_id: str, data: VitalsUpdate):
         blood_pressure=data.blood_pressure,
         temperature=data.temperature
     )
+    response_cache.clear(*PATIENT_CACHE_NAMESPACES)
     return result
 
 @app.post("/api/patients/{patient_id}/discharge")
 def discharge_patient(patient_id: str):
     """Discharge a patient"""
     result = triage_engine.discharge_patient(patient_id)
+    response_cache.clear(*PATIENT_CACHE_NAMESPACES)
     return result
 
 # ============== BED ENDPOINTS ==============
-@app.get("/api/beds")
+@app.get("/api/beds", response_model=BedListOut)
+@response_cache.cached("beds", expire=NORMAL_TTL)
 def get_beds():
     """Get all beds with status"""
     beds = []
@@ -318,7 +691,7 @@ def get_beds():
         
         beds.append({
             "id": b.id,
-            "type": get_enum_value(b.bed_type),
+            "type": ENUM_STR[b.bed_type],
             "ward": b.ward,
             "floor": b.floor,
             "is_occupied": b.is_occupied,
@@ -328,24 +701,23 @@ def get_beds():
     return {"beds": beds, "occupancy": bed_manager.get_bed_occupancy()}
 
 @app.get("/api/beds/available")
+@response_cache.cached("beds", expire=NORMAL_TTL)
 def get_available_beds(bed_type: Optional[str] = None):
     """Get available beds, optionally filtered by type"""
     if bed_type:
-        type_map = {"ICU": BedType.ICU, "Emergency": BedType.EMERGENCY, "General": BedType.GENERAL}
-        bt = type_map.get(bed_type)
+        bt = BED_TYPE_MAP.get(bed_type)
         if bt:
             beds = bed_manager.get_available_beds(bt)
         else:
             beds = []
     else:
-        beds = []
-        for bt in BedType:
-            beds.extend(bed_manager.get_available_beds(bt))
+        beds = bed_manager.get_available_beds()
     
-    return {"available_beds": [{"id": b.id, "type": get_enum_value(b.bed_type)} for b in beds]}
+    return {"available_beds": [{"id": b.id, "type": ENUM_STR[b.bed_type]} for b in beds]}
 
 # ============== STAFF ENDPOINTS ==============
-@app.get("/api/staff")
+@app.get("/api/staff", response_model=StaffListOut)
+@response_cache.cached("staff", expire=NORMAL_TTL)
 def get_staff():
     """Get all staff members"""
     staff_list = []
@@ -354,27 +726,21 @@ def get_staff():
         staff_list.append({
             "id": s.id,
             "name": s.name,
-            "role": get_enum_value(s.role),
-            "status": get_enum_value(s.status),
+            "role": ENUM_STR[s.role],
+            "status": ENUM_STR[s.status],
             "specialization": s.specialization,
             "hours_worked": round(hours, 1) if hours else 0,
             "is_fatigued": staff_manager.is_fatigued(s.id),
             "patient_count": len(s.current_patient_ids)
         })
-    return {"staff": staff_list, "summary": staff_manager.get_staff_summary()}
+    return {"staff": staff_list, "summary": staff_manager.get_staff_status_summary()}
 
 @app.post("/api/staff")
 def create_staff(data: StaffCreate):
     """Add new staff member"""
-    staff_id = f"S-{datetime.now().strftime('%H%M%S')}"
+    staff_id = hospital_state.next_id("staff", "S")
     
-    role_map = {
-        "Doctor": StaffRole.DOCTOR,
-        "Nurse": StaffRole.NURSE,
-        "Wardboy": StaffRole.WARDBOY,
-        "Driver": StaffRole.DRIVER
-    }
-    role = role_map.get(data.role, StaffRole.NURSE)
+    role = STAFF_ROLE_MAP.get(data.role, StaffRole.NURSE)
     
     staff = Staff(
         id=staff_id,
@@ -386,6 +752,7 @@ def create_staff(data: StaffCreate):
     
     hospital_state.add_staff(staff)
     staff_manager.punch_in(staff_id)
+    response_cache.clear("dashboard", "staff")
     
     return {"success": True, "staff_id": staff_id}
 
@@ -395,6 +762,7 @@ def punch_in(staff_id: str):
     success = staff_manager.punch_in(staff_id)
     if not success:
         raise HTTPException(status_code=404, detail="Staff not found")
+    response_cache.clear("dashboard", "staff")
     return {"success": True, "message": f"Staff {staff_id} punched in"}
 
 @app.post("/api/staff/{staff_id}/punch-out")
@@ -403,6 +771,7 @@ def punch_out(staff_id: str):
     success = staff_manager.punch_out(staff_id)
     if not success:
         raise HTTPException(status_code=404, detail="Staff not found")
+    response_cache.clear("dashboard", "staff")
     return {"success": True, "message": f"Staff {staff_id} punched out"}
 
 # ============== ALERTS ENDPOINTS ==============
@@ -445,6 +814,7 @@ def execute_tetris_swap(patient_id: str):
         raise HTTPException(status_code=404, detail="Patient not found")
     
     success, message = bed_manager.execute_swap(patient)
+    response_cache.clear(*PATIENT_CACHE_NAMESPACES)
     return {"success": success, "message": message}
 
 # ============== INIT DATA ==============
@@ -487,6 +857,8 @@ def initialize_demo_data():
         p = Patient(id=pid, name=name, age=age, status=status, spo2=spo2, heart_rate=hr, diagnosis=diag)
         triage_engine.process_incoming_patient(p)
     
+    response_cache.clear()
+    
     return {
         "success": True,
         "message": "Demo data initialized",
@@ -507,6 +879,7 @@ def get_protocol(emergency_type: str):
     return {"protocol": protocol}
 
 @app.get("/api/protocols")
+@response_cache.cached("protocols", expire=LONG_TTL)
 def list_protocols():
     """List all available emergency protocols"""
     return {"protocols": protocol_engine.list_protocols()}
@@ -563,6 +936,7 @@ def register_ambulance(data: AmbulanceRegister):
 def update_ambulance_eta(ambulance_id: str, eta_minutes: int):
     """Update ambulance ETA"""
     result = ambulance_manager.update_eta(ambulance_id, eta_minutes)
+    response_cache.clear("dashboard")  # Pre-clearance is logged to the decision log
     return result
 
 @app.get("/api/ambulances/{ambulance_id}")
@@ -589,45 +963,33 @@ def get_patient_bill(patient_id: str):
         patient = hospital_state.patients.get(patient_id)
         if not patient:
             raise HTTPException(status_code=404, detail="Patient not found")
-        from backend.core_logic.billing_agent import InsuranceType
         billing_agent.start_billing(patient_id, InsuranceType.NONE)
         bill = billing_agent.get_current_bill(patient_id)
     return bill
 
 @app.post("/api/billing/{patient_id}/medicine")
-def add_medicine_to_bill(patient_id: str, medicine_name: str, quantity: int = 1):
+def add_medicine_to_bill(patient_id: str, data: BillMedicine):
     """Add medicine to patient bill"""
-    result = billing_agent.add_medicine(patient_id, medicine_name, quantity)
+    result = billing_agent.add_medicine(patient_id, data.medicine_name, data.quantity)
     return result
 
 @app.post("/api/billing/{patient_id}/procedure")
-def add_procedure_to_bill(patient_id: str, procedure_name: str):
+def add_procedure_to_bill(patient_id: str, data: BillProcedure):
     """Add procedure to patient bill"""
-    result = billing_agent.add_procedure(patient_id, procedure_name)
+    result = billing_agent.add_procedure(patient_id, data.procedure_name)
     return result
 
 @app.post("/api/billing/{patient_id}/bed-charge")
-def add_bed_charge(patient_id: str, bed_type: str, days: float = 1.0):
+def add_bed_charge(patient_id: str, data: BedCharge):
     """Add bed charges to bill"""
-    from shared.models import BedType as BT
-    bed_type_map = {"icu": BT.ICU, "emergency": BT.EMERGENCY, "general": BT.GENERAL}
-    bt = bed_type_map.get(bed_type.lower(), BT.GENERAL)
-    result = billing_agent.add_bed_charges(patient_id, bt, days)
+    bt = BILLING_BED_TYPE_MAP[data.bed_type]
+    result = billing_agent.add_bed_charges(patient_id, bt, data.days)
     return result
 
 @app.post("/api/billing/{patient_id}/apply-insurance")
-def apply_insurance(patient_id: str, insurance_type: str):
+def apply_insurance(patient_id: str, data: InsuranceApply):
     """Apply insurance scheme to bill"""
-    from backend.core_logic.billing_agent import InsuranceType
-    insurance_map = {
-        "ayushman": InsuranceType.AYUSHMAN_BHARAT,
-        "ayushman_bharat": InsuranceType.AYUSHMAN_BHARAT,
-        "esi": InsuranceType.ESI,
-        "cghs": InsuranceType.CGHS,
-        "private": InsuranceType.PRIVATE,
-        "none": InsuranceType.NONE
-    }
-    ins = insurance_map.get(insurance_type.lower(), InsuranceType.NONE)
+    ins = INSURANCE_MAP[data.insurance_type]
     result = billing_agent.apply_insurance_scheme(patient_id, ins)
     return result
 
@@ -640,6 +1002,7 @@ def finalize_bill(patient_id: str):
     return bill
 
 @app.get("/api/billing/price-list")
+@cached_json_response("price_list", expire=LONG_TTL)
 def get_price_list():
     """Get medicine and procedure price list"""
     return {"price_list": billing_agent.PRICE_LIST}
@@ -677,15 +1040,15 @@ def verify_cctv_alert(alert_id: str, data: AlertVerify):
     return result
 
 @app.post("/api/cctv/alerts/{alert_id}/assign")
-def assign_cctv_response(alert_id: str, nurse_id: str = None, doctor_id: str = None):
+def assign_cctv_response(alert_id: str, data: CCTVResponseAssign):
     """Assign staff to respond to verified CCTV alert"""
-    result = fall_detector.assign_response(alert_id, nurse_id, doctor_id)
+    result = fall_detector.assign_response(alert_id, data.nurse_id, data.doctor_id)
     return result
 
 @app.post("/api/cctv/alerts/{alert_id}/resolve")
-def resolve_cctv_alert(alert_id: str, notes: str, patient_id: str = None):
+def resolve_cctv_alert(alert_id: str, data: CCTVAlertResolve):
     """Resolve a CCTV alert"""
-    result = fall_detector.resolve_alert(alert_id, notes, patient_id)
+    result = fall_detector.resolve_alert(alert_id, data.notes, data.patient_id)
     return result
 
 @app.post("/api/cctv/simulate/fall")
@@ -707,25 +1070,40 @@ def get_agent_status():
     return vitalflow_agent.get_status()
 
 @app.post("/api/agent/start")
-def start_agent():
-    """Start the autonomous VitalFlow agent"""
+async def start_agent():
+    """Start the autonomous VitalFlow agent (as a task on the server's event loop)"""
     vitalflow_agent.start()
+    response_cache.clear("dashboard")
     return {"success": True, "message": "VitalFlow Agent started", "status": "running"}
 
 @app.post("/api/agent/stop")
 def stop_agent():
     """Stop the VitalFlow agent"""
     vitalflow_agent.stop()
+    response_cache.clear("dashboard")
     return {"success": True, "message": "VitalFlow Agent stopped", "status": "stopped"}
 
-@app.post("/api/agent/cycle")
-def run_agent_cycle():
-    """Manually trigger one agent decision cycle"""
-    decisions = vitalflow_agent.run_cycle()
-    return {
-        "decisions_made": len(decisions),
-        "decisions": [d.to_dict() if hasattr(d, 'to_dict') else str(d) for d in decisions]
-    }
+@app.post("/api/agent/cycle", status_code=202)
+async def run_agent_cycle():
+    """Queue one agent decision cycle; poll /api/agent/cycle/{job_id} for the result"""
+    if agent_cycle_queue is None:
+        raise HTTPException(status_code=503, detail="Agent cycle worker not running")
+    
+    job_id = f"CYCLE-{uuid.uuid4().hex[:8].upper()}"
+    agent_cycle_jobs[job_id] = {"job_id": job_id, "status": "queued", "queued_at": datetime.now()}
+    while len(agent_cycle_jobs) > AGENT_CYCLE_JOBS_MAX:
+        agent_cycle_jobs.popitem(last=False)
+    
+    agent_cycle_queue.put_nowait(job_id)
+    return {"job_id": job_id, "status": "queued"}
+
+@app.get("/api/agent/cycle/{job_id}")
+def get_agent_cycle(job_id: str):
+    """Get status and result of a queued agent cycle"""
+    job = agent_cycle_jobs.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Cycle job not found")
+    return job
 
 @app.get("/api/agent/pending-approvals")
 def get_pending_approvals():
@@ -743,21 +1121,24 @@ def approve_decision(data: ApprovalRequest):
     
     if not result.get("success"):
         raise HTTPException(status_code=400, detail=result.get("error"))
+    response_cache.clear(*PATIENT_CACHE_NAMESPACES)
     return result
 
 @app.get("/api/agent/history")
 def get_agent_history(limit: int = 50):
     """Get agent decision history"""
-    return {"history": vitalflow_agent.decision_history[-limit:]}
+    return stream_json_list("history", (d.to_json() for d in vitalflow_agent.get_recent_decisions(limit)))
 
 
 # ============== STOCK MANAGEMENT ENDPOINTS ==============
 @app.get("/api/stock")
+@response_cache.cached("stock", expire=NORMAL_TTL)
 def get_stock_summary():
     """Get medicine stock summary"""
     return stock_manager.get_stock_summary()
 
 @app.get("/api/stock/medicines")
+@cached_json_response("stock", expire=NORMAL_TTL)
 def get_all_medicines():
     """Get all medicines with stock info"""
     return {"medicines": stock_manager.get_all_medicines()}
@@ -782,6 +1163,7 @@ def record_medicine_usage(data: MedicineUsage):
     )
     if not result.get("success"):
         raise HTTPException(status_code=400, detail=result.get("error"))
+    response_cache.clear("stock")
     return result
 
 @app.get("/api/stock/orders")
@@ -806,28 +1188,30 @@ def verify_order(order_id: str, data: OrderVerification):
     )
     if not result.get("success"):
         raise HTTPException(status_code=400, detail=result.get("error"))
+    response_cache.clear("stock")
     return result
 
 @app.post("/api/stock/orders/{order_id}/place")
-def place_order(order_id: str, placed_by: str):
+def place_order(order_id: str, data: OrderPlacement):
     """Place verified order with supplier"""
-    result = stock_manager.place_order_with_supplier(order_id, placed_by)
+    result = stock_manager.place_order_with_supplier(order_id, data.placed_by)
     if not result.get("success"):
         raise HTTPException(status_code=400, detail=result.get("error"))
     return result
 
 @app.post("/api/stock/orders/{order_id}/receive")
-def receive_delivery(order_id: str, received_by: str):
+def receive_delivery(order_id: str, data: OrderReceipt):
     """Mark order as delivered and update stock"""
-    result = stock_manager.receive_delivery(order_id, received_by)
+    result = stock_manager.receive_delivery(order_id, data.received_by)
     if not result.get("success"):
         raise HTTPException(status_code=400, detail=result.get("error"))
+    response_cache.clear("stock")
     return result
 
 @app.get("/api/stock/usage-history")
 def get_usage_history(medicine_id: Optional[str] = None, days: int = 7):
     """Get medicine usage history"""
-    return {"history": stock_manager.get_usage_history(medicine_id, days)}
+    return stream_json_list("history", stock_manager.iter_usage_history(medicine_id, days))
 
 @app.get("/api/stock/search")
 def search_medicines(query: str):
@@ -844,6 +1228,7 @@ def initialize_patient_report(patient_id: str, patient_name: str):
         patient_name=patient_name,
         admission_date=datetime.now()
     )
+    response_cache.clear(f"report:{patient_id}")
     return {"success": True, "report": report.to_dict()}
 
 @app.post("/api/reports/{patient_id}/vitals")
@@ -861,15 +1246,12 @@ def record_patient_vitals(patient_id: str, data: VitalsRecord):
     )
     if not result.get("success"):
         raise HTTPException(status_code=400, detail=result.get("error"))
+    response_cache.clear(f"report:{patient_id}")
     return result
 
 @app.post("/api/reports/{patient_id}/consultation")
 def add_consultation(patient_id: str, data: ConsultationNote):
     """Add doctor consultation note"""
-    next_visit = None
-    if data.next_visit:
-        next_visit = datetime.fromisoformat(data.next_visit)
-    
     result = patient_report_system.add_consultation_note(
         patient_id=patient_id,
         doctor_id=data.doctor_id,
@@ -877,14 +1259,16 @@ def add_consultation(patient_id: str, data: ConsultationNote):
         findings=data.findings,
         diagnosis=data.diagnosis,
         treatment_plan=data.treatment_plan,
-        next_visit=next_visit,
+        next_visit=data.next_visit,
         priority=data.priority
     )
     if not result.get("success"):
         raise HTTPException(status_code=400, detail=result.get("error"))
+    response_cache.clear(f"report:{patient_id}")
     return result
 
 @app.get("/api/reports/{patient_id}")
+@cached_json_response("report:{patient_id}", expire=NORMAL_TTL)
 def get_patient_report(patient_id: str):
     """Get patient daily report"""
     report = patient_report_system.get_patient_report(patient_id)
@@ -893,6 +1277,7 @@ def get_patient_report(patient_id: str):
     return report
 
 @app.get("/api/reports/{patient_id}/patient-view")
+@cached_json_response("report:{patient_id}", expire=NORMAL_TTL)
 def get_patient_view(patient_id: str):
     """Get patient-friendly view of their report"""
     view = patient_report_system.get_patient_view(patient_id)
@@ -901,6 +1286,7 @@ def get_patient_view(patient_id: str):
     return view
 
 @app.get("/api/reports/{patient_id}/summary")
+@cached_json_response("report:{patient_id}", expire=NORMAL_TTL)
 def get_daily_summary(patient_id: str):
     """Get daily summary for shift handover"""
     summary = patient_report_system.get_daily_summary(patient_id)
@@ -909,25 +1295,29 @@ def get_daily_summary(patient_id: str):
     return summary
 
 @app.post("/api/reports/{patient_id}/meal/{meal_id}")
-def update_meal_status(patient_id: str, meal_id: str, status: str, served_by: Optional[str] = None):
+def update_meal_status(patient_id: str, meal_id: str, status: MealStatus, served_by: Optional[str] = None):
     """Update meal status"""
-    from backend.core_logic.patient_report import MealStatus
-    meal_status = MealStatus(status)
-    result = patient_report_system.update_meal_status(patient_id, meal_id, meal_status, served_by)
+    result = patient_report_system.update_meal_status(patient_id, meal_id, status, served_by)
     if not result.get("success"):
         raise HTTPException(status_code=400, detail=result.get("error"))
+    response_cache.clear(f"report:{patient_id}")
     return result
 
 @app.get("/api/reports/{patient_id}/medicines/upcoming")
+@cached_json_response("report:{patient_id}", expire=SHORT_TTL)
 def get_upcoming_medicines(patient_id: str, hours: int = 2):
     """Get medicines due in next N hours"""
     return {"medicines": patient_report_system.get_upcoming_medicines(patient_id, hours)}
 
 
 # ============== PRESCRIPTION SCANNER ENDPOINTS ==============
-@app.post("/api/prescriptions/upload")
-def upload_prescription(data: PrescriptionUpload):
-    """Upload prescription for AI scanning"""
+@app.post("/api/prescriptions/upload", status_code=202)
+def upload_prescription(data: PrescriptionUpload, background_tasks: BackgroundTasks):
+    """
+    Upload prescription for AI scanning.
+    Returns immediately; the scan runs after the response is sent. Poll
+    /api/prescriptions/{prescription_id} or listen on /ws/alerts for "scanned".
+    """
     result = prescription_scanner.upload_prescription(
         patient_id=data.patient_id,
         patient_name=data.patient_name,
@@ -935,8 +1325,10 @@ def upload_prescription(data: PrescriptionUpload):
         doctor_name=data.doctor_name,
         uploaded_by=data.uploaded_by,
         raw_text=data.raw_text,
-        image_path=data.image_path
+        image_path=data.image_path,
+        scan=False
     )
+    background_tasks.add_task(prescription_scanner.scan_prescription, result["prescription"]["prescription_id"])
     return result
 
 @app.get("/api/prescriptions/{prescription_id}")
@@ -961,14 +1353,16 @@ def verify_prescription(prescription_id: str, verified_by: str, approved: bool,
     result = prescription_scanner.verify_prescription(prescription_id, verified_by, approved, notes)
     if not result.get("success"):
         raise HTTPException(status_code=400, detail=result.get("error"))
+    response_cache.clear("medicine_alerts")
     return result
 
 @app.get("/api/prescriptions/patient/{patient_id}")
 def get_patient_prescriptions(patient_id: str):
     """Get all prescriptions for a patient"""
-    return {"prescriptions": prescription_scanner.get_patient_prescriptions(patient_id)}
+    return stream_json_list("prescriptions", prescription_scanner.iter_patient_prescriptions(patient_id))
 
 @app.get("/api/prescriptions/alerts/pending")
+@cached_json_response("medicine_alerts", expire=SHORT_TTL)
 def get_pending_medicine_alerts(hours: int = 1):
     """Get medicine alerts due within next N hours"""
     return {"alerts": prescription_scanner.get_pending_alerts(hours)}
@@ -979,6 +1373,7 @@ def send_medicine_alert(alert_id: str):
     result = prescription_scanner.send_alert(alert_id)
     if not result.get("success"):
         raise HTTPException(status_code=400, detail=result.get("error"))
+    response_cache.clear("medicine_alerts")
     return result
 
 @app.post("/api/prescriptions/alerts/{alert_id}/acknowledge")
@@ -987,6 +1382,7 @@ def acknowledge_medicine_alert(alert_id: str, acknowledged_by: str):
     result = prescription_scanner.acknowledge_alert(alert_id, acknowledged_by)
     if not result.get("success"):
         raise HTTPException(status_code=400, detail=result.get("error"))
+    response_cache.clear("medicine_alerts")
     return result
 
 @app.post("/api/prescriptions/alerts/{alert_id}/confirm")
@@ -995,6 +1391,7 @@ def confirm_medicine_given(alert_id: str, data: MedicineConfirmation):
     result = prescription_scanner.confirm_medicine_given(alert_id, data.given_by, data.notes)
     if not result.get("success"):
         raise HTTPException(status_code=400, detail=result.get("error"))
+    response_cache.clear("medicine_alerts")
     return result
 
 @app.post("/api/prescriptions/alerts/{alert_id}/missed")
@@ -1003,22 +1400,30 @@ def mark_medicine_missed(alert_id: str, reason: str = ""):
     result = prescription_scanner.mark_medicine_missed(alert_id, reason)
     if not result.get("success"):
         raise HTTPException(status_code=400, detail=result.get("error"))
+    response_cache.clear("medicine_alerts")
     return result
 
 @app.get("/api/prescriptions/patient/{patient_id}/history")
 def get_medicine_history(patient_id: str):
     """Get medicine administration history for patient"""
-    return prescription_scanner.get_patient_medicine_history(patient_id)
+    return stream_json_list(
+        "history",
+        prescription_scanner.iter_patient_medicine_history(patient_id),
+        fields=prescription_scanner.get_patient_medicine_summary(patient_id)
+    )
 
 @app.post("/api/prescriptions/alerts/check")
 def check_due_alerts():
     """Check and send alerts for medicines due in 1 hour"""
-    alerts = prescription_scanner.check_and_send_due_alerts()
+    alerts, fresh = run_debounced_check("prescriptions", prescription_scanner.check_and_send_due_alerts)
+    if fresh:
+        response_cache.clear("medicine_alerts")
     return {"sent_alerts": alerts, "count": len(alerts)}
 
 
 # ============== DOCTOR ALERT ENDPOINTS ==============
 @app.get("/api/doctor-alerts/doctors")
+@cached_json_response("doctor_alerts", expire=SHORT_TTL)
 def get_doctors_status():
     """Get all doctors' status summary"""
     return doctor_alert_system.get_doctor_status_summary()
@@ -1026,29 +1431,21 @@ def get_doctors_status():
 @app.post("/api/doctor-alerts/doctors/{doctor_id}/status")
 def update_doctor_status(doctor_id: str, data: DoctorStatusUpdate):
     """Update doctor availability status"""
-    on_leave_until = None
-    if data.on_leave_until:
-        on_leave_until = datetime.fromisoformat(data.on_leave_until)
-    
-    status = DoctorStatus(data.status)
     result = doctor_alert_system.update_doctor_status(
         doctor_id=doctor_id,
-        status=status,
+        status=data.status,
         location=data.location,
-        on_leave_until=on_leave_until,
+        on_leave_until=data.on_leave_until,
         leave_reason=data.leave_reason
     )
     if not result.get("success"):
         raise HTTPException(status_code=400, detail=result.get("error"))
+    response_cache.clear("doctor_alerts")
     return result
 
 @app.post("/api/doctor-alerts/track-patient")
 def track_patient(data: PatientTracking):
     """Start tracking patient for critical alerts"""
-    next_visit = None
-    if data.next_visit:
-        next_visit = datetime.fromisoformat(data.next_visit)
-    
     tracking = doctor_alert_system.track_patient(
         patient_id=data.patient_id,
         patient_name=data.patient_name,
@@ -1057,8 +1454,9 @@ def track_patient(data: PatientTracking):
         primary_doctor_id=data.primary_doctor_id,
         primary_doctor_name=data.primary_doctor_name,
         criticality_level=data.criticality_level,
-        next_visit=next_visit
+        next_visit=data.next_visit
     )
+    response_cache.clear("doctor_alerts")
     return {"success": True, "tracking": tracking.to_dict()}
 
 @app.post("/api/doctor-alerts/patients/{patient_id}/criticality")
@@ -1072,9 +1470,11 @@ def update_patient_criticality(patient_id: str, data: CriticalityUpdate):
     )
     if not result.get("success"):
         raise HTTPException(status_code=400, detail=result.get("error"))
+    response_cache.clear("doctor_alerts")
     return result
 
 @app.get("/api/doctor-alerts/alerts")
+@cached_json_response("doctor_alerts", expire=SHORT_TTL)
 def get_doctor_alerts(doctor_id: Optional[str] = None):
     """Get pending alerts for doctors"""
     return {"alerts": doctor_alert_system.get_pending_alerts(doctor_id)}
@@ -1090,6 +1490,7 @@ def acknowledge_doctor_alert(alert_id: str, doctor_id: str, data: AlertAcknowled
     )
     if not result.get("success"):
         raise HTTPException(status_code=400, detail=result.get("error"))
+    response_cache.clear("doctor_alerts")
     return result
 
 @app.post("/api/doctor-alerts/alerts/{alert_id}/responding")
@@ -1098,6 +1499,7 @@ def mark_doctor_responding(alert_id: str):
     result = doctor_alert_system.mark_doctor_responding(alert_id)
     if not result.get("success"):
         raise HTTPException(status_code=400, detail=result.get("error"))
+    response_cache.clear("doctor_alerts")
     return result
 
 @app.post("/api/doctor-alerts/alerts/{alert_id}/resolve")
@@ -1106,6 +1508,7 @@ def resolve_doctor_alert(alert_id: str, notes: str = ""):
     result = doctor_alert_system.resolve_alert(alert_id, notes)
     if not result.get("success"):
         raise HTTPException(status_code=400, detail=result.get("error"))
+    response_cache.clear("doctor_alerts")
     return result
 
 @app.post("/api/doctor-alerts/alerts/{alert_id}/escalate")
@@ -1114,9 +1517,11 @@ def escalate_alert(alert_id: str):
     result = doctor_alert_system.escalate_alert(alert_id)
     if not result.get("success"):
         raise HTTPException(status_code=400, detail=result.get("error"))
+    response_cache.clear("doctor_alerts")
     return result
 
 @app.get("/api/doctor-alerts/critical-patients")
+@cached_json_response("doctor_alerts", expire=SHORT_TTL)
 def get_critical_patients():
     """Get all critical patients being tracked"""
     return {"patients": doctor_alert_system.get_critical_patients()}
@@ -1124,19 +1529,65 @@ def get_critical_patients():
 @app.get("/api/doctor-alerts/history")
 def get_alert_history(patient_id: Optional[str] = None, doctor_id: Optional[str] = None):
     """Get alert history"""
-    return {"history": doctor_alert_system.get_alert_history(patient_id, doctor_id)}
+    return stream_json_list("history", doctor_alert_system.iter_alert_history(patient_id, doctor_id))
 
 @app.post("/api/doctor-alerts/check-escalations")
 def check_escalations():
     """Check and escalate pending alerts that timed out"""
-    escalated = doctor_alert_system.check_and_escalate_pending_alerts()
+    escalated, fresh = run_debounced_check("escalations", doctor_alert_system.check_and_escalate_pending_alerts)
+    if fresh:
+        response_cache.clear("doctor_alerts")
     return {"escalated": escalated, "count": len(escalated)}
 
 
+# ============== ALERT PUSH CHANNEL ==============
+@app.websocket("/ws/alerts")
+async def alerts_socket(websocket: WebSocket, doctor_id: Optional[str] = None):
+    """
+    Push doctor and medicine alert changes as they happen.
+    Replaces polling /api/doctor-alerts/alerts, /api/doctor-alerts/critical-patients and
+    /api/prescriptions/alerts/pending; pass ?doctor_id= to only receive that doctor's alerts
+    and critical patients (plus medicine and prescription events).
+    """
+    await websocket.accept()
+    queue = alert_events.subscribe(doctor_id)
+    
+    async def wait_for_disconnect():
+        # Clients never send; reading notices a closed socket without waiting for the next event
+        while (await websocket.receive())["type"] != "websocket.disconnect":
+            pass
+    
+    disconnected = asyncio.create_task(wait_for_disconnect())
+    try:
+        while True:
+            next_message = asyncio.ensure_future(queue.get())
+            await asyncio.wait({next_message, disconnected}, return_when=asyncio.FIRST_COMPLETED)
+            if disconnected.done():
+                next_message.cancel()
+                break
+            await websocket.send_text(FastJSONResponse(next_message.result()).body.decode())
+    except WebSocketDisconnect:
+        pass
+    finally:
+        disconnected.cancel()
+        alert_events.unsubscribe(queue)
+
+
 # ============== RUN ==============
 if __name__ == "__main__":
     import uvicorn
+    port = int(os.getenv("BACKEND_PORT", "8000"))
+    # Most services keep state in process memory, so more workers are opt-in
+    workers = int(os.getenv("WEB_CONCURRENCY", 1))
     print("\n🏥 Starting VitalFlow AI Backend Server...")
-    print("📍 API Docs: http://localhost:8000/docs")
-    print("📍 Dashboard: http://localhost:8000/api/dashboard\n")
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    print(f"📍 API Docs: http://localhost:{port}/docs")
+    print(f"📍 Dashboard: http://localhost:{port}/api/dashboard\n")
+    uvicorn.run(
+        "app:app" if workers > 1 else app,  # multiple workers need an import string
+        host=os.getenv("BACKEND_HOST", "0.0.0.0"),
+        port=port,
+        workers=workers,
+        loop="auto",   # uvloop when installed
+        http="auto",   # httptools when installed
+        access_log=os.getenv("ACCESS_LOG", "false").lower() == "true"
+    )
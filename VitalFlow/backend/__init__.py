@@ -1,28 +1,36 @@
 """
 Backend package initialization.
+
+Exports are loaded lazily (PEP 562): importing one backend module, e.g. the
+alert system, no longer pulls in the AI services and their optional
+OCR / computer-vision dependencies. Each export is imported on first access.
 """
-from backend.core_logic import (
-    hospital_state,
-    bed_manager,
-    staff_manager,
-    triage_engine
-)
-
-from backend.ai_services import (
-    medicine_ai,
-    voice_service,
-    bed_detector
-)
-
-__all__ = [
+import importlib
+
+# Export name -> module that defines it
+_LAZY_EXPORTS = {
     # Core Logic
-    "hospital_state",
-    "bed_manager", 
-    "staff_manager",
-    "triage_engine",
-    
+    "hospital_state": "backend.core_logic",
+    "bed_manager": "backend.core_logic",
+    "staff_manager": "backend.core_logic",
+    "triage_engine": "backend.core_logic",
+
     # AI Services
-    "medicine_ai",
-    "voice_service",
-    "bed_detector"
-]
+    "medicine_ai": "backend.ai_services",
+    "voice_service": "backend.ai_services",
+    "bed_detector": "backend.ai_services"
+}
+
+__all__ = list(_LAZY_EXPORTS)
+
+
+def __getattr__(name: str):
+    if name in _LAZY_EXPORTS:
+        value = getattr(importlib.import_module(_LAZY_EXPORTS[name]), name)
+        globals()[name] = value  # Later lookups skip __getattr__
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
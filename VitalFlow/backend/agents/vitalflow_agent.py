@@ -10,28 +10,94 @@ This is the main decision loop that continuously:
 
 CORE PRINCIPLE: If safety conflicts with efficiency, SAFETY ALWAYS WINS.
 """
+import os
 import sys
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Deque, Dict, List, Optional, Tuple
+from collections import deque
+from itertools import islice
 from datetime import datetime, timedelta
 from dataclasses import dataclass, field
 from enum import Enum
+import asyncio
 import threading
 import time
 import json
 
+import numpy as np
+
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from shared.models import Patient, Bed, Staff, PatientStatus, BedType, StaffRole
-from shared.utils import get_enum_value
+from shared.utils import ENUM_STR
 from shared.events import event_bus, EventType
-from backend.core_logic.state import hospital_state
+from backend.core_logic.state import hospital_state, PATIENT_STATUS_CODES
 from backend.core_logic.bed_manager import bed_manager
 from backend.core_logic.staff_manager import staff_manager
 from backend.core_logic.triage_engine import triage_engine
 from backend.core_logic.emergency_protocols import emergency_protocol_engine
 from backend.core_logic.ambulance_manager import ambulance_manager
 from backend.core_logic.billing_agent import billing_agent
+from backend.core_logic.response_cache import response_cache, PATIENT_CACHE_NAMESPACES
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# VITALS_JIT=0 forces the NumPy scan even when Numba is installed
+VITALS_JIT = NUMBA_AVAILABLE and os.getenv("VITALS_JIT", "1") != "0"
+
+
+if VITALS_JIT:
+    # Explicit signature: compiled (or loaded from the on-disk cache) at import,
+    # so the first agent cycle doesn't pay the JIT cost
+    @njit("Tuple((int64[:], int64[:]))(float64[:], uint8[:], boolean[:], boolean[:], float64, uint8)",
+          cache=True, nogil=True)
+    def _vitals_scan_kernel(spo2, status, has_bed, has_doctor, critical_spo2, critical_code):
+        """Compiled single pass returning (critical rows, unassigned rows)"""
+        n = spo2.shape[0]
+        critical = np.empty(n, dtype=np.int64)
+        unassigned = np.empty(n, dtype=np.int64)
+        n_critical = 0
+        n_unassigned = 0
+        for i in range(n):
+            if spo2[i] < critical_spo2 or status[i] == critical_code:
+                critical[n_critical] = i
+                n_critical += 1
+            if not (has_bed[i] and has_doctor[i]):
+                unassigned[n_unassigned] = i
+                n_unassigned += 1
+        return critical[:n_critical], unassigned[:n_unassigned]
+
+
+def scan_vitals(table, critical_spo2: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Find the patient rows the agent must look at.
+    
+    Args:
+        table: PatientTable column snapshot
+        critical_spo2: SpO2 below which a patient counts as critical
+        
+    Returns:
+        (critical_rows, unassigned_rows) index arrays into table.patients
+    """
+    critical_code = PATIENT_STATUS_CODES[PatientStatus.CRITICAL]
+    
+    if VITALS_JIT:
+        return _vitals_scan_kernel(table.spo2, table.status, table.has_bed, table.has_doctor,
+                                   float(critical_spo2), critical_code)
+    
+    critical_rows = np.flatnonzero((table.spo2 < critical_spo2) | (table.status == critical_code))
+    unassigned_rows = np.flatnonzero(~(table.has_bed & table.has_doctor))
+    return critical_rows, unassigned_rows
 
 
 class ActionType(str, Enum):
@@ -57,7 +123,44 @@ class AlertSeverity(str, Enum):
     CODE_BLUE = "Code Blue"
 
 
-@dataclass
+# Sort rank used by decide() (most critical first)
+_SEVERITY_ORDER: Dict[AlertSeverity, int] = {
+    AlertSeverity.CODE_BLUE: 0,
+    AlertSeverity.CRITICAL: 1,
+    AlertSeverity.URGENT: 2,
+    AlertSeverity.WARNING: 3,
+    AlertSeverity.INFO: 4
+}
+
+# Trust log text for actions whose explanation doesn't depend on the decision
+_TRUST_TEMPLATES: Dict[ActionType, str] = {
+    ActionType.SWAP_BEDS: (
+        "VitalFlow detected that patient requires ICU care based on critical vitals. "
+        "The system identified a stable patient who can be safely moved to general ward, "
+        "freeing the ICU bed. This decision follows the Tetris protocol for optimal bed utilization "
+        "while prioritizing patient safety."),
+    ActionType.PREPARE_EQUIPMENT: (
+        "An ambulance is approaching and VitalFlow is pre-clearing resources "
+        "to minimize delay upon arrival. Bed, staff, and equipment are being prepared "
+        "based on the reported patient condition."),
+}
+
+_TRUST_FATIGUE = (
+    "VitalFlow is monitoring staff fatigue levels to prevent burnout and ensure "
+    "patient safety. This staff member is approaching the safe working hour limit "
+    "and should be considered for relief.")
+
+# Trust log action key per action type, e.g. "AGENT_SWAP_BEDS"
+_ACTION_LOG_KEYS: Dict[ActionType, str] = {
+    action: f"AGENT_{action.value.upper().replace(' ', '_')}" for action in ActionType
+}
+
+
+# Slotted dataclasses (no per-instance __dict__) where supported (Python 3.10+)
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class AgentObservation:
     """Snapshot of hospital state at observation time"""
     timestamp: datetime
@@ -90,7 +193,7 @@ class AgentObservation:
     concerns: List[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class AgentDecision:
     """A decision made by the agent"""
     decision_id: str
@@ -104,20 +207,40 @@ class AgentDecision:
     approved_by: Optional[str] = None
     executed: bool = False
     outcome: str = ""
+    _dict_cache: Optional[Dict] = field(default=None, init=False, repr=False, compare=False)
+    
+    def __setattr__(self, name, value):
+        # Any field change (outcome, executed, approval...) invalidates to_dict()
+        object.__setattr__(self, name, value)
+        if name != "_dict_cache":
+            object.__setattr__(self, "_dict_cache", None)
     
     def to_dict(self) -> Dict:
-        return {
-            "decision_id": self.decision_id,
-            "timestamp": self.timestamp.isoformat(),
-            "action": self.action_type.value,
-            "severity": self.severity.value,
-            "target": self.target,
-            "reason": self.reason,
-            "details": self.details,
-            "requires_approval": self.requires_approval,
-            "executed": self.executed,
-            "outcome": self.outcome
-        }
+        """
+        Serialized form. The scalar fields are built once and reused until a field
+        changes; each call returns a new dict with a fresh copy of details, so
+        in-place edits to details show up and callers may modify the result.
+        """
+        if self._dict_cache is None:
+            self._dict_cache = {
+                "decision_id": self.decision_id,
+                "timestamp": self.timestamp.isoformat(),
+                "action": self.action_type.value,
+                "severity": self.severity.value,
+                "target": self.target,
+                "reason": self.reason,
+                "details": None,
+                "requires_approval": self.requires_approval,
+                "executed": self.executed,
+                "outcome": self.outcome
+            }
+        return {**self._dict_cache, "details": dict(self.details)}
+    
+    def to_json(self) -> bytes:
+        """JSON encoding of to_dict() (orjson when installed, stdlib json otherwise)"""
+        if ORJSON_AVAILABLE:
+            return orjson.dumps(self.to_dict(), option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+        return json.dumps(self.to_dict(), default=str).encode()
 
 
 class VitalFlowAgent:
@@ -134,13 +257,53 @@ class VitalFlowAgent:
     → MAINTAIN FULL TRANSPARENCY
     """
     
+    # Seconds until the next cycle, by the last observed risk level
+    RISK_LOOP_INTERVALS = {"HIGH": 1, "ELEVATED": 2, "MODERATE": 5, "NORMAL": 10}
+    DEFAULT_LOOP_INTERVAL = 5
+    
+    # In-memory decision history; older entries remain in the trust log
+    MAX_DECISION_HISTORY = 10_000
+    
+    # A cycle error identical to the previous one is logged again only after
+    # this many repeats or this many seconds, whichever comes first
+    ERROR_REPEAT_LOG_EVERY = 100
+    ERROR_REPEAT_LOG_SECONDS = 60
+    
+    # Events that cut the current wait short and trigger a cycle immediately
+    WAKE_EVENTS = (
+        EventType.CODE_BLUE,
+        EventType.VITALS_CRITICAL,
+        EventType.VITALS_WARNING,
+        EventType.PATIENT_ADMITTED,
+        EventType.AMBULANCE_DISPATCHED,
+        EventType.AMBULANCE_ARRIVING,
+    )
+    
     def __init__(self):
         self.is_running = False
-        self.loop_interval_seconds = 5  # Check every 5 seconds
+        self.loop_interval_seconds = self.DEFAULT_LOOP_INTERVAL  # Adapted to risk after each cycle
         self.decision_counter = 0
-        self.decisions: List[AgentDecision] = []
-        self.pending_approvals: List[AgentDecision] = []
+        self._id_prefix = ""  # "DEC-YYYYMMDD-", reformatted only when the day changes
+        self._id_prefix_day = -1
+        self.decisions: Deque[AgentDecision] = deque(maxlen=self.MAX_DECISION_HISTORY)
+        self.total_decisions = 0  # Including those rotated out of self.decisions
+        self._decisions_lock = threading.Lock()  # Cycles append from a worker thread while requests read
+        self.pending_approvals: Dict[str, AgentDecision] = {}  # decision_id -> decision, in queue order
         self._thread: Optional[threading.Thread] = None
+        self._wake_event = threading.Event()
+        
+        # Set instead of _thread when started from a running event loop
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._async_wake: Optional[asyncio.Event] = None
+        
+        # Repeated cycle error suppression (see _run_cycle_logged)
+        self._last_error_sig: Optional[str] = None
+        self._error_repeats = 0  # Occurrences since it was last logged
+        self._last_error_logged = 0.0
+        
+        for event_type in self.WAKE_EVENTS:
+            event_bus.subscribe(event_type, self.wake)
         
         # Thresholds
         self.CRITICAL_SPO2 = 88
@@ -149,10 +312,15 @@ class VitalFlowAgent:
         self.WORSENING_THRESHOLD = 3  # SpO2 drop of 3% triggers concern
         self.ICU_CAPACITY_THRESHOLD = 80  # 80% triggers pre-emptive action
     
-    def _generate_decision_id(self) -> str:
-        """Generate unique decision ID"""
+    def _generate_decision_id(self, now: Optional[datetime] = None) -> str:
+        """Generate unique decision ID (dated `now`, default the current time)"""
         self.decision_counter += 1
-        return f"DEC-{datetime.now().strftime('%Y%m%d')}-{self.decision_counter:04d}"
+        now = now or datetime.now()
+        day = now.toordinal()
+        if day != self._id_prefix_day:
+            self._id_prefix = f"DEC-{now.strftime('%Y%m%d')}-"
+            self._id_prefix_day = day
+        return f"{self._id_prefix}{self.decision_counter:04d}"
     
     # ============== OBSERVE ==============
     def observe(self) -> AgentObservation:
@@ -169,30 +337,35 @@ class VitalFlowAgent:
         obs = AgentObservation(timestamp=datetime.now())
         
         # ===== PATIENT OBSERVATIONS =====
-        for patient in hospital_state.patients.values():
-            status_str = get_enum_value(patient.status)
-            
-            # Critical patients
-            if status_str == "Critical" or patient.spo2 < self.CRITICAL_SPO2:
-                obs.critical_patients.append({
-                    "id": patient.id,
-                    "name": patient.name,
-                    "status": status_str,
-                    "spo2": patient.spo2,
-                    "heart_rate": patient.heart_rate,
-                    "bed_id": patient.bed_id,
-                    "has_doctor": patient.assigned_doctor_id is not None
-                })
-            
-            # Patients without bed or staff
-            if not patient.bed_id or not patient.assigned_doctor_id:
-                obs.unassigned_patients.append({
-                    "id": patient.id,
-                    "name": patient.name,
-                    "status": status_str,
-                    "bed_id": patient.bed_id,
-                    "doctor_id": patient.assigned_doctor_id
-                })
+        # Flag rows in one scan over the column snapshot; dicts are only
+        # built for the flagged patients
+        table = hospital_state.get_patient_table()
+        critical_rows, unassigned_rows = scan_vitals(table, self.CRITICAL_SPO2)
+        status_str_of = ENUM_STR.get
+        
+        # Critical patients
+        for i in critical_rows:
+            patient = table.patients[i]
+            obs.critical_patients.append({
+                "id": patient.id,
+                "name": patient.name,
+                "status": status_str_of(patient.status, patient.status),
+                "spo2": patient.spo2,
+                "heart_rate": patient.heart_rate,
+                "bed_id": patient.bed_id,
+                "has_doctor": patient.assigned_doctor_id is not None
+            })
+        
+        # Patients without bed or staff
+        for i in unassigned_rows:
+            patient = table.patients[i]
+            obs.unassigned_patients.append({
+                "id": patient.id,
+                "name": patient.name,
+                "status": status_str_of(patient.status, patient.status),
+                "bed_id": patient.bed_id,
+                "doctor_id": patient.assigned_doctor_id
+            })
         
         # ===== BED OBSERVATIONS =====
         occupancy = bed_manager.get_bed_occupancy()
@@ -229,15 +402,18 @@ class VitalFlowAgent:
         
         # ===== RISK ASSESSMENT =====
         obs.concerns = []
+        high_risk = False  # Critical patients or no doctors make the cycle HIGH
         
         if obs.critical_patients:
             obs.concerns.append(f"{len(obs.critical_patients)} critical patients")
+            high_risk = True
         
         if obs.icu_occupancy >= self.ICU_CAPACITY_THRESHOLD:
             obs.concerns.append(f"ICU at {obs.icu_occupancy:.0f}% capacity")
         
         if obs.available_doctors == 0:
             obs.concerns.append("No doctors available")
+            high_risk = True
         
         if obs.fatigued_staff:
             obs.concerns.append(f"{len(obs.fatigued_staff)} staff approaching fatigue")
@@ -246,7 +422,7 @@ class VitalFlowAgent:
             obs.concerns.append(f"{len(obs.ambulances_needing_preclearance)} ambulances need pre-clearance")
         
         # Determine overall risk level
-        if len([c for c in obs.concerns if "critical" in c.lower() or "No doctors" in c]) > 0:
+        if high_risk:
             obs.risk_level = "HIGH"
         elif len(obs.concerns) >= 2:
             obs.risk_level = "ELEVATED"
@@ -269,7 +445,15 @@ class VitalFlowAgent:
         - Is staff safe to assign?
         - Is emergency protocol required?
         """
+        # NORMAL risk means no critical patients, ICU below threshold, doctors
+        # available, no fatigue and no pending ambulances: only unassigned
+        # patients can still produce a decision
+        if observation.risk_level == "NORMAL" and not observation.unassigned_patients:
+            return []
+        
         decisions = []
+        now = observation.timestamp  # One timestamp for every decision of the cycle
+        bed_type_str_of = ENUM_STR.get
         
         # ===== CRITICAL PATIENT REASONING =====
         for patient_data in observation.critical_patients:
@@ -280,12 +464,12 @@ class VitalFlowAgent:
             # Check if patient needs ICU but isn't in one
             if patient.bed_id:
                 bed = hospital_state.beds.get(patient.bed_id)
-                bed_type = get_enum_value(bed.bed_type) if bed else None
+                bed_type = bed_type_str_of(bed.bed_type, bed.bed_type) if bed else None
                 
                 if bed_type != "ICU" and patient.spo2 < self.CRITICAL_SPO2:
                     decisions.append(AgentDecision(
-                        decision_id=self._generate_decision_id(),
-                        timestamp=datetime.now(),
+                        decision_id=self._generate_decision_id(now),
+                        timestamp=now,
                         action_type=ActionType.SWAP_BEDS,
                         severity=AlertSeverity.CRITICAL,
                         target=patient.id,
@@ -306,8 +490,8 @@ class VitalFlowAgent:
             if protocol.get("detected"):
                 if not patient_data.get("has_doctor"):
                     decisions.append(AgentDecision(
-                        decision_id=self._generate_decision_id(),
-                        timestamp=datetime.now(),
+                        decision_id=self._generate_decision_id(now),
+                        timestamp=now,
                         action_type=ActionType.ALERT_STAFF,
                         severity=AlertSeverity.CRITICAL,
                         target=patient.id,
@@ -322,8 +506,8 @@ class VitalFlowAgent:
             swap_candidate = bed_manager.find_swap_candidate(BedType.ICU)
             if swap_candidate:
                 decisions.append(AgentDecision(
-                    decision_id=self._generate_decision_id(),
-                    timestamp=datetime.now(),
+                    decision_id=self._generate_decision_id(now),
+                    timestamp=now,
                     action_type=ActionType.OBSERVE_ONLY,
                     severity=AlertSeverity.WARNING,
                     target="ICU",
@@ -338,8 +522,8 @@ class VitalFlowAgent:
                 ))
         elif observation.icu_occupancy >= self.ICU_CAPACITY_THRESHOLD:
             decisions.append(AgentDecision(
-                decision_id=self._generate_decision_id(),
-                timestamp=datetime.now(),
+                decision_id=self._generate_decision_id(now),
+                timestamp=now,
                 action_type=ActionType.OBSERVE_ONLY,
                 severity=AlertSeverity.INFO,
                 target="ICU",
@@ -351,8 +535,8 @@ class VitalFlowAgent:
         for patient_data in observation.unassigned_patients:
             if not patient_data.get("doctor_id") and observation.available_doctors > 0:
                 decisions.append(AgentDecision(
-                    decision_id=self._generate_decision_id(),
-                    timestamp=datetime.now(),
+                    decision_id=self._generate_decision_id(now),
+                    timestamp=now,
                     action_type=ActionType.ASSIGN_STAFF,
                     severity=AlertSeverity.WARNING,
                     target=patient_data["id"],
@@ -363,8 +547,8 @@ class VitalFlowAgent:
         # ===== AMBULANCE REASONING =====
         for amb in observation.ambulances_needing_preclearance:
             decisions.append(AgentDecision(
-                decision_id=self._generate_decision_id(),
-                timestamp=datetime.now(),
+                decision_id=self._generate_decision_id(now),
+                timestamp=now,
                 action_type=ActionType.PREPARE_EQUIPMENT,
                 severity=AlertSeverity.URGENT,
                 target=amb["ambulance_id"],
@@ -376,8 +560,8 @@ class VitalFlowAgent:
         # ===== STAFF FATIGUE REASONING =====
         for staff_warning in observation.fatigued_staff:
             decisions.append(AgentDecision(
-                decision_id=self._generate_decision_id(),
-                timestamp=datetime.now(),
+                decision_id=self._generate_decision_id(now),
+                timestamp=now,
                 action_type=ActionType.ALERT_STAFF,
                 severity=AlertSeverity.WARNING,
                 target=staff_warning["staff_id"],
@@ -398,15 +582,8 @@ class VitalFlowAgent:
         - Never hallucinate resources
         """
         # Sort by severity (most critical first)
-        severity_order = {
-            AlertSeverity.CODE_BLUE: 0,
-            AlertSeverity.CRITICAL: 1,
-            AlertSeverity.URGENT: 2,
-            AlertSeverity.WARNING: 3,
-            AlertSeverity.INFO: 4
-        }
-        
-        decisions.sort(key=lambda d: severity_order.get(d.severity, 5))
+        severity_rank = _SEVERITY_ORDER.__getitem__
+        decisions.sort(key=lambda d: severity_rank(d.severity))
         
         # Mark irreversible actions as requiring approval
         for decision in decisions:
@@ -427,62 +604,68 @@ class VitalFlowAgent:
         - Assign tasks
         """
         results = []
+        staff_alerts = []  # Published as one event after the loop
         
-        for decision in decisions:
-            result = {"decision_id": decision.decision_id, "executed": False, "outcome": ""}
-            
-            if decision.requires_approval and not decision.approved_by:
-                # Queue for approval
-                self.pending_approvals.append(decision)
-                result["outcome"] = "Queued for doctor/admin approval"
+        # Assignments and swaps each save(); persist once for the whole batch
+        with hospital_state.batch():
+            for decision in decisions:
+                result = {"decision_id": decision.decision_id, "executed": False, "outcome": ""}
                 
-            elif decision.action_type == ActionType.OBSERVE_ONLY:
-                result["executed"] = True
-                result["outcome"] = "Observation logged"
-                decision.executed = True
+                if decision.requires_approval and not decision.approved_by:
+                    # Queue for approval
+                    self.pending_approvals[decision.decision_id] = decision
+                    result["outcome"] = "Queued for doctor/admin approval"
                 
-            elif decision.action_type == ActionType.ASSIGN_STAFF:
-                # Auto-assign staff
-                patient_id = decision.target
-                patient = hospital_state.patients.get(patient_id)
-                if patient:
-                    staff_manager.assign_doctor_to_patient(patient)
+                elif decision.action_type == ActionType.OBSERVE_ONLY:
                     result["executed"] = True
-                    result["outcome"] = f"Doctor assigned to patient {patient_id}"
+                    result["outcome"] = "Observation logged"
                     decision.executed = True
+                
+                elif decision.action_type == ActionType.ASSIGN_STAFF:
+                    # Auto-assign staff
+                    patient_id = decision.target
+                    patient = hospital_state.patients.get(patient_id)
+                    if patient:
+                        staff_manager.assign_doctor_to_patient(patient)
+                        result["executed"] = True
+                        result["outcome"] = f"Doctor assigned to patient {patient_id}"
+                        decision.executed = True
                     
-            elif decision.action_type == ActionType.ALERT_STAFF:
-                # Log alert (in real system, would send push notification)
-                result["executed"] = True
-                result["outcome"] = "Alert sent to relevant staff"
-                decision.executed = True
+                elif decision.action_type == ActionType.ALERT_STAFF:
+                    # Log alert (in real system, would send push notification)
+                    result["executed"] = True
+                    result["outcome"] = "Alert sent to relevant staff"
+                    decision.executed = True
                 
-                # Publish event
-                event_bus.publish(EventType.STAFF_ALERT, {
-                    "decision": decision.to_dict(),
-                    "timestamp": datetime.now().isoformat()
-                })
+                    staff_alerts.append(decision)
                 
-            elif decision.action_type == ActionType.PREPARE_EQUIPMENT:
-                # Trigger pre-clearance for ambulance
-                amb_id = decision.target
-                result["executed"] = True
-                result["outcome"] = f"Equipment preparation triggered for ambulance {amb_id}"
-                decision.executed = True
+                elif decision.action_type == ActionType.PREPARE_EQUIPMENT:
+                    # Trigger pre-clearance for ambulance
+                    amb_id = decision.target
+                    result["executed"] = True
+                    result["outcome"] = f"Equipment preparation triggered for ambulance {amb_id}"
+                    decision.executed = True
                 
-            elif decision.action_type == ActionType.SWAP_BEDS and decision.approved_by:
-                # Execute approved swap
-                patient = hospital_state.patients.get(decision.target)
-                if patient:
-                    success, message = bed_manager.execute_swap(patient)
-                    result["executed"] = success
-                    result["outcome"] = message
-                    decision.executed = success
-                    decision.outcome = message
-            
-            results.append(result)
-            decision.outcome = result["outcome"]
-            self.decisions.append(decision)
+                elif decision.action_type == ActionType.SWAP_BEDS and decision.approved_by:
+                    # Execute approved swap
+                    patient = hospital_state.patients.get(decision.target)
+                    if patient:
+                        success, message = bed_manager.execute_swap(patient)
+                        result["executed"] = success
+                        result["outcome"] = message
+                        decision.executed = success
+                        decision.outcome = message
+                
+                results.append(result)
+                decision.outcome = result["outcome"]
+                self._record_decision(decision)
+        
+        if staff_alerts:
+            # Serialized after the loop so each alert carries its final outcome
+            event_bus.publish(EventType.STAFF_ALERTS_BATCH, {
+                "alerts": [d.to_dict() for d in staff_alerts],
+                "timestamp": datetime.now().isoformat()
+            })
         
         return results
     
@@ -511,7 +694,7 @@ class VitalFlowAgent:
             
             # Log to hospital state
             hospital_state.log_decision(
-                f"AGENT_{decision.action_type.value.upper().replace(' ', '_')}",
+                _ACTION_LOG_KEYS[decision.action_type],
                 explanation["trust_log"],
                 decision.to_dict()
             )
@@ -520,26 +703,16 @@ class VitalFlowAgent:
     
     def _generate_trust_log(self, decision: AgentDecision) -> str:
         """Generate human-readable trust log entry"""
-        if decision.action_type == ActionType.SWAP_BEDS:
-            return (f"VitalFlow detected that patient requires ICU care based on critical vitals. "
-                    f"The system identified a stable patient who can be safely moved to general ward, "
-                    f"freeing the ICU bed. This decision follows the Tetris protocol for optimal bed utilization "
-                    f"while prioritizing patient safety.")
+        template = _TRUST_TEMPLATES.get(decision.action_type)
+        if template is not None:
+            return template
         
-        elif decision.action_type == ActionType.ALERT_STAFF:
+        if decision.action_type == ActionType.ALERT_STAFF:
             if "fatigue" in decision.reason.lower():
-                return (f"VitalFlow is monitoring staff fatigue levels to prevent burnout and ensure "
-                        f"patient safety. This staff member is approaching the safe working hour limit "
-                        f"and should be considered for relief.")
+                return _TRUST_FATIGUE
             return f"VitalFlow has generated this alert based on: {decision.reason}"
         
-        elif decision.action_type == ActionType.PREPARE_EQUIPMENT:
-            return (f"An ambulance is approaching and VitalFlow is pre-clearing resources "
-                    f"to minimize delay upon arrival. Bed, staff, and equipment are being prepared "
-                    f"based on the reported patient condition.")
-        
-        else:
-            return f"VitalFlow decision: {decision.reason}"
+        return f"VitalFlow decision: {decision.reason}"
     
     # ============== MAIN LOOP ==============
     def run_cycle(self) -> Dict:
@@ -551,6 +724,8 @@ class VitalFlowAgent:
         
         # 1. OBSERVE
         observation = self.observe()
+        self.loop_interval_seconds = self.RISK_LOOP_INTERVALS.get(
+            observation.risk_level, self.DEFAULT_LOOP_INTERVAL)
         
         # 2. REASON
         decisions = self.reason(observation)
@@ -583,13 +758,33 @@ class VitalFlowAgent:
         }
     
     def start(self):
-        """Start the autonomous decision loop"""
+        """
+        Start the autonomous decision loop.
+        
+        Called from a running event loop (the API server), the loop is an
+        asyncio task on it: waits between cycles are awaited on the event loop
+        and each cycle runs in the default executor, as manual cycles do.
+        Otherwise (scripts, self-tests) it runs in a daemon thread.
+        """
         if self.is_running:
             return
         
         self.is_running = True
-        self._thread = threading.Thread(target=self._run_loop, daemon=True)
-        self._thread.start()
+        self._wake_event.clear()
+        
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        
+        if loop is not None:
+            self._loop = loop
+            self._async_wake = asyncio.Event()
+            self._task = loop.create_task(self._run_loop_async())
+        else:
+            self._loop = self._async_wake = None
+            self._thread = threading.Thread(target=self._run_loop, daemon=True)
+            self._thread.start()
         
         hospital_state.log_decision(
             "AGENT_STARTED",
@@ -600,8 +795,12 @@ class VitalFlowAgent:
     def stop(self):
         """Stop the autonomous decision loop"""
         self.is_running = False
+        self.wake()
         if self._thread:
             self._thread.join(timeout=10)
+            self._thread = None
+        # The asyncio task exits on its own once the current cycle finishes
+        self._task = None
         
         hospital_state.log_decision(
             "AGENT_STOPPED",
@@ -609,77 +808,172 @@ class VitalFlowAgent:
             {}
         )
     
+    async def stop_async(self):
+        """
+        Stop the loop and wait for its asyncio task to exit (server shutdown).
+        A cycle already running in a worker thread finishes on its own.
+        """
+        task = self._task
+        if self.is_running:
+            self.stop()
+        if task is not None and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+    
+    def _run_cycle_logged(self):
+        """
+        Run one cycle, logging instead of raising so the loop keeps going.
+        A recurring error is logged once and then only periodically, with the
+        number of occurrences, so it can't flood the decision log.
+        Cached endpoint results are dropped afterwards, since the cycle may have
+        moved patients, beds or staff (the manual cycle queue does the same).
+        """
+        try:
+            self.run_cycle()
+        except Exception as e:
+            sig = f"{type(e).__name__}: {e}"
+            now = time.monotonic()
+            self._error_repeats += 1
+            
+            if sig == self._last_error_sig:
+                if (self._error_repeats < self.ERROR_REPEAT_LOG_EVERY
+                        and now - self._last_error_logged < self.ERROR_REPEAT_LOG_SECONDS):
+                    return
+            else:
+                self._last_error_sig = sig
+                self._error_repeats = 1
+            
+            hospital_state.log_decision(
+                "AGENT_ERROR",
+                f"Error in decision cycle: {str(e)}",
+                {"error": sig, "repeats": self._error_repeats}
+            )
+            self._last_error_logged = now
+            self._error_repeats = 0
+        else:
+            self._last_error_sig = None
+            self._error_repeats = 0
+        finally:
+            response_cache.clear(*PATIENT_CACHE_NAMESPACES)
+    
     def _run_loop(self):
-        """Internal loop runner"""
+        """Internal loop runner (thread mode)"""
         while self.is_running:
-            try:
-                self.run_cycle()
-            except Exception as e:
-                hospital_state.log_decision(
-                    "AGENT_ERROR",
-                    f"Error in decision cycle: {str(e)}",
-                    {"error": str(e)}
-                )
+            # Clear before the cycle: a wake() arriving mid-cycle triggers the next one
+            self._wake_event.clear()
+            self._run_cycle_logged()
+            
+            # Sleep longer when the hospital is quiet; wake() ends the wait early
+            self._wake_event.wait(timeout=self.loop_interval_seconds)
+    
+    async def _run_loop_async(self):
+        """Internal loop runner (event loop mode)"""
+        wake = self._async_wake
+        # A restart replaces _async_wake, which retires this loop
+        while self.is_running and self._async_wake is wake:
+            wake.clear()  # Before the cycle, so a wake() arriving mid-cycle is kept
+            await asyncio.to_thread(self._run_cycle_logged)
+            if not self.is_running:
+                break
             
-            time.sleep(self.loop_interval_seconds)
+            try:
+                await asyncio.wait_for(wake.wait(), timeout=self.loop_interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+    
+    def wake(self, event=None):
+        """
+        Run the next decision cycle now instead of waiting out the interval.
+        Safe to call from any thread.
+        
+        Args:
+            event: Triggering event when called as an event_bus subscriber
+        """
+        self._wake_event.set()
+        if self._async_wake is not None and self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._async_wake.set)
     
     def approve_decision(self, decision_id: str, approved_by: str) -> Dict:
         """Approve a pending decision"""
-        for decision in self.pending_approvals:
-            if decision.decision_id == decision_id:
-                decision.approved_by = approved_by
-                self.pending_approvals.remove(decision)
-                
-                # Execute the approved decision
-                results = self.act([decision])
-                
-                hospital_state.log_decision(
-                    "DECISION_APPROVED",
-                    f"Decision {decision_id} approved by {approved_by}",
-                    {"decision": decision.to_dict(), "approved_by": approved_by}
-                )
-                
-                return {
-                    "success": True,
-                    "decision_id": decision_id,
-                    "approved_by": approved_by,
-                    "result": results[0] if results else None
-                }
+        decision = self.pending_approvals.pop(decision_id, None)
+        if decision is None:
+            return {"success": False, "error": "Decision not found in pending approvals"}
+        
+        decision.approved_by = approved_by
         
-        return {"success": False, "error": "Decision not found in pending approvals"}
+        # Execute the approved decision
+        results = self.act([decision])
+        
+        hospital_state.log_decision(
+            "DECISION_APPROVED",
+            f"Decision {decision_id} approved by {approved_by}",
+            {"decision": decision.to_dict(), "approved_by": approved_by}
+        )
+        
+        return {
+            "success": True,
+            "decision_id": decision_id,
+            "approved_by": approved_by,
+            "result": results[0] if results else None
+        }
     
     def reject_decision(self, decision_id: str, rejected_by: str, reason: str) -> Dict:
         """Reject a pending decision"""
-        for decision in self.pending_approvals:
-            if decision.decision_id == decision_id:
-                self.pending_approvals.remove(decision)
-                decision.outcome = f"Rejected by {rejected_by}: {reason}"
-                self.decisions.append(decision)
-                
-                hospital_state.log_decision(
-                    "DECISION_REJECTED",
-                    f"Decision {decision_id} rejected by {rejected_by}. Reason: {reason}",
-                    {"decision_id": decision_id, "rejected_by": rejected_by, "reason": reason}
-                )
-                
-                return {"success": True, "decision_id": decision_id}
+        decision = self.pending_approvals.pop(decision_id, None)
+        if decision is None:
+            return {"success": False, "error": "Decision not found"}
         
-        return {"success": False, "error": "Decision not found"}
+        decision.outcome = f"Rejected by {rejected_by}: {reason}"
+        self._record_decision(decision)
+        
+        hospital_state.log_decision(
+            "DECISION_REJECTED",
+            f"Decision {decision_id} rejected by {rejected_by}. Reason: {reason}",
+            {"decision_id": decision_id, "rejected_by": rejected_by, "reason": reason}
+        )
+        
+        return {"success": True, "decision_id": decision_id}
+    
+    def _record_decision(self, decision: AgentDecision):
+        """Append to the bounded decision history"""
+        with self._decisions_lock:
+            self.decisions.append(decision)
+            self.total_decisions += 1
+    
+    def get_recent_decisions(self, limit: int = 10) -> List[AgentDecision]:
+        """
+        Get the most recent decisions, oldest first.
+        
+        Args:
+            limit: Maximum number of decisions to return
+            
+        Returns:
+            List of AgentDecision objects
+        """
+        # Walk back from the newest end so only `limit` entries are touched
+        with self._decisions_lock:
+            recent = list(islice(reversed(self.decisions), max(limit, 0)))
+        recent.reverse()
+        return recent
     
     def get_status(self) -> Dict:
         """Get current agent status"""
         return {
             "is_running": self.is_running,
-            "total_decisions": len(self.decisions),
+            "total_decisions": self.total_decisions,
             "pending_approvals": len(self.pending_approvals),
             "loop_interval_seconds": self.loop_interval_seconds,
-            "recent_decisions": [d.to_dict() for d in self.decisions[-10:]],
-            "pending": [d.to_dict() for d in self.pending_approvals]
+            "recent_decisions": [d.to_dict() for d in self.get_recent_decisions(10)],
+            "pending": self.get_pending_approvals()
         }
     
     def get_pending_approvals(self) -> List[Dict]:
         """Get list of decisions awaiting approval"""
-        return [d.to_dict() for d in self.pending_approvals]
+        # Snapshot first: a running cycle may queue approvals while to_dict() runs
+        return [d.to_dict() for d in list(self.pending_approvals.values())]
 
 
 # Singleton instance
@@ -1,7 +1,13 @@
 """
 AI Services module initialization.
 Exports all AI services for easy importing.
+
+Services are loaded lazily (PEP 562): importing the package, e.g. for the
+prompt templates, doesn't pull in OpenCV or the voice/alert backends until one
+of their exports is first accessed.
 """
+import importlib
+
 from .prompts import (
     MEDICINE_RECOMMENDATION_PROMPT,
     VOICE_ALERT_TEMPLATES,
@@ -10,19 +16,28 @@ from .prompts import (
     get_voice_alert
 )
 
+# Imported eagerly: the singleton shares its submodule's name, and importing
+# the submodule later would otherwise rebind the package attribute to the module
 from .medicine_ai import medicine_ai, MedicineAI
-from .voice_alerts import voice_service, VoiceAlertService
-from .cv_detector import bed_detector, BedDetector
-from .emergency_alerts import (
-    emergency_service,
-    EmergencyNotificationService,
-    EmergencyType,
-    EmergencyAlert,
-    trigger_code_blue,
-    trigger_fall_alert,
-    trigger_critical_vitals,
-    announce_emergency
-)
+
+# Export name -> submodule that defines it
+_LAZY_EXPORTS = {
+    # Services
+    "voice_service": ".voice_alerts",
+    "VoiceAlertService": ".voice_alerts",
+    "bed_detector": ".cv_detector",
+    "BedDetector": ".cv_detector",
+
+    # Emergency Alerts
+    "emergency_service": ".emergency_alerts",
+    "EmergencyNotificationService": ".emergency_alerts",
+    "EmergencyType": ".emergency_alerts",
+    "EmergencyAlert": ".emergency_alerts",
+    "trigger_code_blue": ".emergency_alerts",
+    "trigger_fall_alert": ".emergency_alerts",
+    "trigger_critical_vitals": ".emergency_alerts",
+    "announce_emergency": ".emergency_alerts"
+}
 
 __all__ = [
     # Prompts
@@ -50,3 +65,15 @@ __all__ = [
     "trigger_critical_vitals",
     "announce_emergency"
 ]
+
+
+def __getattr__(name: str):
+    if name in _LAZY_EXPORTS:
+        value = getattr(importlib.import_module(_LAZY_EXPORTS[name], __name__), name)
+        globals()[name] = value  # Later lookups skip __getattr__
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
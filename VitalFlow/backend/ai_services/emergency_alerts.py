@@ -4,10 +4,18 @@ Handles emergency alerts with ElevenLabs TTS and call notifications.
 """
 import os
 import sys
+import time
+import queue
+import secrets
+import itertools
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 from pathlib import Path
-from typing import Optional, Dict, List
+from typing import Deque, Optional, Dict, List, Tuple
+from collections import OrderedDict, deque
+from itertools import islice
 from datetime import datetime
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
 
 # Add parent directory to path
@@ -20,7 +28,14 @@ try:
 except ImportError:
     pass
 
-from .voice_alerts import VoiceAlertService
+from shared.events import emit_code_blue
+from .voice_alerts import voice_service
+
+# Alerts are logged to the hospital state when it is available
+try:
+    from backend.core_logic.state import hospital_state
+except ImportError:
+    hospital_state = None
 
 
 class EmergencyType(str, Enum):
@@ -35,7 +50,11 @@ class EmergencyType(str, Enum):
     STAFF_EMERGENCY = "Staff Emergency"  # Staff member needs help
 
 
-@dataclass
+# slots (Python 3.10+): no per-instance __dict__ for alerts kept in history
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class EmergencyAlert:
     """Emergency alert data structure."""
     id: str
@@ -45,14 +64,10 @@ class EmergencyAlert:
     patient_id: Optional[str] = None
     patient_name: Optional[str] = None
     staff_id: Optional[str] = None
-    timestamp: datetime = None
+    timestamp: datetime = field(default_factory=datetime.now)
     phone_to_call: Optional[str] = None
     audio_path: Optional[Path] = None
     is_acknowledged: bool = False
-    
-    def __post_init__(self):
-        if self.timestamp is None:
-            self.timestamp = datetime.now()
 
 
 class EmergencyNotificationService:
@@ -61,15 +76,67 @@ class EmergencyNotificationService:
     Generates voice alerts and provides call-to-action with phone numbers.
     """
     
+    # Max cached announcement audio paths (least recently used evicted first)
+    TTS_CACHE_MAX_SIZE = 256
+    
+    # Background threads synthesizing and playing announcements
+    TTS_WORKERS = 4
+    
+    # In-memory alert history; older alerts remain in the decision log
+    MAX_ALERT_HISTORY = 10_000
+    
+    # Seconds the playback thread waits for more audio before exiting
+    PLAYER_IDLE_SECONDS = 1.0
+    
     def __init__(self):
-        self.voice_service = VoiceAlertService()
+        # Shared with the other voice alerts: one pooled API connection per process
+        self.voice_service = voice_service
         self.emergency_phone = os.getenv("EMERGENCY_PHONE", "108")
         self.hospital_phone = os.getenv("HOSPITAL_PHONE", "+91-1234567890")
         self.admin_phone = os.getenv("ADMIN_PHONE", "+91-9876543210")
         
-        # Store active alerts
+        # Emergency types routed to the emergency line; others to the hospital
+        self._phone_for: Dict[EmergencyType, str] = {
+            EmergencyType.CODE_BLUE: self.emergency_phone,
+            EmergencyType.CODE_RED: self.emergency_phone,
+        }
+        
+        # Alert IDs: random per-process prefix + hex sequence, e.g. EMRG-3FA2C10002A
+        self._id_prefix = f"EMRG-{secrets.token_hex(3).upper()}"
+        self._id_seq = itertools.count()
+        
+        # Store active alerts (copy-on-write: replaced, never mutated, so
+        # readers use the current map without taking the lock)
         self.active_alerts: Dict[str, EmergencyAlert] = {}
-        self.alert_history: List[EmergencyAlert] = []
+        self.alert_history: Deque[EmergencyAlert] = deque(maxlen=self.MAX_ALERT_HISTORY)
+        
+        # Announcement text -> synthesized audio, so repeated alerts skip TTS
+        self._tts_cache: "OrderedDict[str, Path]" = OrderedDict()
+        
+        # TTS is a network round trip (seconds), so alerts are stored and
+        # logged right away and their audio is produced in the background
+        self._tts_pool = ThreadPoolExecutor(max_workers=self.TTS_WORKERS,
+                                            thread_name_prefix="tts")
+        self._lock = threading.Lock()  # Guards alert stores and the TTS cache
+        
+        # Connect to the TTS API in the background, ahead of the first alert
+        if self.voice_service.api_key:
+            self._tts_pool.submit(self.voice_service.warm_up)
+        
+        # Announcement text -> synthesis in progress; alerts raised together
+        # with the same text (e.g. one Code Blue from several devices) share it
+        self._tts_inflight: Dict[str, Future] = {}
+        
+        # Alert id -> TTS/playback still running for it (removed once done)
+        self._audio_pending: Dict[str, Future] = {}
+        
+        # Announcements play one at a time, in order, on a playback thread
+        # (started on demand), so neither callers nor TTS workers wait on audio
+        self._play_queue: "queue.Queue[Tuple[Path, float]]" = queue.Queue()
+        self._player: Optional[threading.Thread] = None
+        
+        # Bound once; None when the hospital state isn't available
+        self._log_decision = hospital_state.log_decision if hospital_state is not None else None
         
         # Alert templates for TTS
         self.alert_messages = {
@@ -109,9 +176,8 @@ class EmergencyNotificationService:
         }
     
     def _generate_alert_id(self) -> str:
-        """Generate unique alert ID."""
-        import uuid
-        return f"EMRG-{uuid.uuid4().hex[:8].upper()}"
+        """Generate unique alert ID (ordered by creation within a process)."""
+        return f"{self._id_prefix}{next(self._id_seq):05X}"
     
     def create_emergency_alert(
         self,
@@ -141,10 +207,7 @@ class EmergencyNotificationService:
         alert_id = self._generate_alert_id()
         
         # Determine phone number based on emergency type
-        if emergency_type in [EmergencyType.CODE_BLUE, EmergencyType.CODE_RED]:
-            phone = self.emergency_phone
-        else:
-            phone = self.hospital_phone
+        phone = self._phone_for.get(emergency_type, self.hospital_phone)
         
         # Create alert object
         alert = EmergencyAlert(
@@ -159,24 +222,142 @@ class EmergencyNotificationService:
             timestamp=datetime.now()
         )
         
-        # Generate TTS audio
-        message = self._format_alert_message(alert)
-        audio_path = self.voice_service.text_to_speech(message, f"emergency_{alert_id}")
-        alert.audio_path = audio_path
-        
         # Store alert
-        self.active_alerts[alert_id] = alert
-        self.alert_history.append(alert)
+        self._store_alert(alert)
         
-        # Play audio if requested
-        if auto_play and audio_path:
-            self.voice_service.play_audio(audio_path)
+        # Generate TTS audio (and play it if requested) in the background
+        message = self._format_alert_message(alert)
+        self._announce(alert, message, "emergency", auto_play)
         
         # Log the alert
         self._log_alert(alert)
         
         return alert
     
+    def _store_alert(self, alert: EmergencyAlert):
+        """Add a new alert to the active alerts and the history."""
+        with self._lock:
+            self.active_alerts = {**self.active_alerts, alert.id: alert}
+            self.alert_history.append(alert)
+    
+    def _announce(self, alert: EmergencyAlert, message: str, prefix: str, auto_play: bool):
+        """
+        Queue TTS (and playback) for an alert; _audio_pending tracks it until done.
+        
+        Args:
+            alert: Alert being announced
+            message: Text to announce
+            prefix: Audio file name prefix
+            auto_play: Whether to play the audio once generated
+        """
+        future = self._tts_pool.submit(self._synthesize_and_play, alert, message, prefix, auto_play)
+        with self._lock:
+            self._audio_pending[alert.id] = future
+        # Runs immediately if the task already finished
+        future.add_done_callback(lambda _: self._audio_done(alert.id))
+    
+    def _audio_done(self, alert_id: str):
+        """Forget an alert's finished TTS/playback task."""
+        with self._lock:
+            self._audio_pending.pop(alert_id, None)
+    
+    def _synthesize_and_play(self, alert: EmergencyAlert, message: str,
+                             prefix: str, auto_play: bool) -> Optional[Path]:
+        """Background task: set the alert's audio_path, then queue it for playback if asked."""
+        try:
+            audio_path = self._synthesize(message, prefix)
+            alert.audio_path = audio_path
+            
+            if auto_play and audio_path:
+                self._queue_playback(audio_path)
+            
+            return audio_path
+        except Exception as e:
+            print(f"Error announcing alert {alert.id}: {e}")
+            return None
+    
+    def _queue_playback(self, audio_path: Path):
+        """Queue announcement audio, starting the playback thread if needed."""
+        with self._lock:
+            self._play_queue.put((audio_path, time.monotonic()))
+            if self._player is None:
+                self._player = threading.Thread(target=self._playback_loop, name="alert-player")
+                self._player.start()
+    
+    def _playback_loop(self):
+        """Playback thread: play queued audio until idle for PLAYER_IDLE_SECONDS."""
+        last_path, last_finished = None, 0.0
+        while True:
+            try:
+                audio_path, queued_at = self._play_queue.get(timeout=self.PLAYER_IDLE_SECONDS)
+            except queue.Empty:
+                with self._lock:
+                    if self._play_queue.empty():
+                        self._player = None
+                        return
+                continue
+            
+            # Same announcement requested while it was still playing (alert burst)
+            if audio_path == last_path and queued_at < last_finished:
+                continue
+            
+            try:
+                self.voice_service.play_audio(audio_path)
+            except Exception as e:
+                print(f"Error playing alert audio: {e}")
+            last_path, last_finished = audio_path, time.monotonic()
+    
+    def _synthesize(self, message: str, prefix: str) -> Optional[Path]:
+        """
+        Get announcement audio, reusing earlier audio for the same text.
+        
+        Args:
+            message: Text to announce
+            prefix: Audio file name prefix
+            
+        Returns:
+            Path to audio file (or None if TTS failed)
+        """
+        with self._lock:
+            cached = self._tts_cache.get(message)
+            if cached is not None:
+                self._tts_cache.move_to_end(message)
+            pending = self._tts_inflight.get(message)
+            if pending is None:
+                pending = self._tts_inflight[message] = Future()
+                owner = True
+            else:
+                owner = False
+        
+        if not owner:
+            # Another worker is already synthesizing this text
+            return pending.result()
+        
+        try:
+            if cached is not None and cached.exists():
+                audio_path = cached
+            else:
+                # Content-addressed file name: the voice service's disk cache
+                # then also serves repeats of this text after a restart
+                cache_key = f"{prefix}_{self.voice_service._get_cache_key(message)}"
+                audio_path = self.voice_service.text_to_speech(message, cache_key)
+                
+                if audio_path is not None:
+                    with self._lock:
+                        self._tts_cache[message] = audio_path
+                        if len(self._tts_cache) > self.TTS_CACHE_MAX_SIZE:
+                            self._tts_cache.popitem(last=False)
+        except Exception as e:
+            pending.set_exception(e)
+            raise
+        else:
+            pending.set_result(audio_path)
+        finally:
+            with self._lock:
+                del self._tts_inflight[message]
+        
+        return audio_path
+    
     def _format_alert_message(self, alert: EmergencyAlert) -> str:
         """Format alert message for TTS."""
         template = self.alert_messages.get(
@@ -193,9 +374,10 @@ class EmergencyNotificationService:
     
     def _log_alert(self, alert: EmergencyAlert):
         """Log alert to hospital state."""
+        if self._log_decision is None:
+            return
         try:
-            from backend.core_logic.state import hospital_state
-            hospital_state.log_decision(
+            self._log_decision(
                 f"EMERGENCY_{alert.emergency_type.name}",
                 f"{alert.emergency_type.value} at {alert.location}: {alert.description}",
                 {
@@ -204,8 +386,7 @@ class EmergencyNotificationService:
                     "phone": alert.phone_to_call,
                     "timestamp": alert.timestamp.isoformat()
                 }
-            )
-            hospital_state.save()
+            )  # log_decision persists the state itself
         except Exception as e:
             print(f"Error logging alert: {e}")
     
@@ -220,23 +401,25 @@ class EmergencyNotificationService:
         Returns:
             True if acknowledged successfully
         """
-        if alert_id in self.active_alerts:
-            alert = self.active_alerts[alert_id]
+        with self._lock:
+            alert = self.active_alerts.get(alert_id)
+            if alert is not None:
+                self.active_alerts = {k: v for k, v in self.active_alerts.items() if k != alert_id}
+        
+        if alert is not None:
             alert.is_acknowledged = True
             
             # Log acknowledgment
-            try:
-                from backend.core_logic.state import hospital_state
-                hospital_state.log_decision(
-                    "ALERT_ACKNOWLEDGED",
-                    f"Alert {alert_id} acknowledged by staff {staff_id or 'Unknown'}",
-                    {"alert_id": alert_id, "staff_id": staff_id}
-                )
-            except:
-                pass
+            if self._log_decision is not None:
+                try:
+                    self._log_decision(
+                        "ALERT_ACKNOWLEDGED",
+                        f"Alert {alert_id} acknowledged by staff {staff_id or 'Unknown'}",
+                        {"alert_id": alert_id, "staff_id": staff_id}
+                    )
+                except Exception as e:
+                    print(f"Error logging acknowledgment: {e}")
             
-            # Move to history
-            del self.active_alerts[alert_id]
             return True
         return False
     
@@ -245,8 +428,12 @@ class EmergencyNotificationService:
         return list(self.active_alerts.values())
     
     def get_alert_history(self, limit: int = 20) -> List[EmergencyAlert]:
-        """Get recent alert history."""
-        return self.alert_history[-limit:]
+        """Get recent alert history, oldest first."""
+        # Walk back from the newest end so only `limit` entries are touched
+        with self._lock:
+            recent = list(islice(reversed(self.alert_history), max(limit, 0)))
+        recent.reverse()
+        return recent
     
     # ============== CONVENIENCE METHODS ==============
     
@@ -257,13 +444,15 @@ class EmergencyNotificationService:
         patient_id: str = None
     ) -> EmergencyAlert:
         """Trigger Code Blue (cardiac arrest) alert."""
-        return self.create_emergency_alert(
+        alert = self.create_emergency_alert(
             EmergencyType.CODE_BLUE,
             location=location,
             description="Cardiac arrest - immediate resuscitation required",
             patient_name=patient_name,
             patient_id=patient_id
         )
+        emit_code_blue(location, patient_id, patient_name)
+        return alert
     
     def fall_detected_alert(
         self,
@@ -328,22 +517,20 @@ class EmergencyNotificationService:
             phone_to_call=phone or self.hospital_phone
         )
         
+        self._store_alert(alert)
+        
         # Generate custom TTS with phone number
         full_message = f"{message}. For immediate assistance, call {alert.phone_to_call}."
-        audio_path = self.voice_service.text_to_speech(full_message, f"custom_{alert_id}")
-        alert.audio_path = audio_path
-        
-        self.active_alerts[alert_id] = alert
-        self.alert_history.append(alert)
-        
-        if audio_path:
-            self.voice_service.play_audio(audio_path)
+        self._announce(alert, full_message, "custom", auto_play=True)
         
         return alert
     
     def play_alert(self, alert_id: str) -> bool:
         """Replay an alert's audio."""
         alert = self.active_alerts.get(alert_id)
+        pending = self._audio_pending.get(alert_id)
+        if alert and pending is not None:
+            wait((pending,))  # Audio may still be generating
         if alert and alert.audio_path:
             return self.voice_service.play_audio(alert.audio_path)
         return False
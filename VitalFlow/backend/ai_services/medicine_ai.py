@@ -5,8 +5,10 @@ Uses OpenAI GPT or Google Gemini with intelligent fallbacks.
 import os
 import sys
 import json
+import threading
 from pathlib import Path
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Tuple
+from collections import OrderedDict
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
@@ -21,13 +23,20 @@ class MedicineAI:
     Supports OpenAI GPT and Google Gemini with rule-based fallback.
     """
     
+    # Max cached checklists (least recently used evicted first)
+    CACHE_MAX_SIZE = 512
+    
     def __init__(self):
         """Initialize AI service with API keys from environment."""
         self.openai_key = os.getenv("OPENAI_API_KEY")
         self.gemini_key = os.getenv("GEMINI_API_KEY")
         
-        # Cache for recommendations to avoid repeated API calls
-        self._cache: Dict[str, Dict] = {}
+        # LRU cache for recommendations to avoid repeated API calls
+        self._cache: "OrderedDict[Tuple, Dict]" = OrderedDict()
+        self._cache_lock = threading.Lock()  # Endpoints call in from a thread pool
+        
+        # API client created on first use and reused (keeps HTTP connections alive)
+        self._openai_client = None
     
     def get_preparation_checklist(self, patient: Patient) -> Dict:
         """
@@ -39,10 +48,13 @@ class MedicineAI:
         Returns:
             Dict with equipment, medications, urgency, and instructions
         """
-        # Check cache first
-        cache_key = f"{patient.diagnosis}_{patient.status}_{patient.spo2}_{patient.heart_rate}"
-        if cache_key in self._cache:
-            return self._cache[cache_key]
+        # Check cache first (str enums hash like their values, so enum/str status share a key)
+        cache_key = (patient.diagnosis, patient.status, patient.spo2, patient.heart_rate)
+        with self._cache_lock:
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                self._cache.move_to_end(cache_key)
+                return cached
         
         # Build prompt
         prompt = format_prompt(
@@ -67,7 +79,10 @@ class MedicineAI:
             result = self._fallback_recommendation(patient)
         
         # Cache the result
-        self._cache[cache_key] = result
+        with self._cache_lock:
+            self._cache[cache_key] = result
+            if len(self._cache) > self.CACHE_MAX_SIZE:
+                self._cache.popitem(last=False)
         
         return result
     
@@ -85,10 +100,11 @@ class MedicineAI:
             return None
         
         try:
-            from openai import OpenAI
-            client = OpenAI(api_key=self.openai_key)
+            if self._openai_client is None:
+                from openai import OpenAI
+                self._openai_client = OpenAI(api_key=self.openai_key, timeout=30)
             
-            response = client.chat.completions.create(
+            response = self._openai_client.chat.completions.create(
                 model="gpt-3.5-turbo",
                 messages=[
                     {
@@ -425,7 +441,8 @@ class MedicineAI:
     
     def clear_cache(self):
         """Clear recommendation cache."""
-        self._cache.clear()
+        with self._cache_lock:
+            self._cache.clear()
 
 
 # Singleton instance
@@ -5,6 +5,7 @@ Generates audio alerts for hospital announcements with fallback to local TTS.
 import os
 import sys
 import hashlib
+import tempfile
 from pathlib import Path
 from typing import Optional, List
 
@@ -37,6 +38,10 @@ class VoiceAlertService:
             "style": 0.0,
             "use_speaker_boost": True
         }
+        
+        # HTTP session created on first use; pools connections to the API
+        self._session = None
+        self._warmed_up = False
     
     def _get_cache_key(self, text: str) -> str:
         """Generate cache key from text."""
@@ -94,6 +99,34 @@ class VoiceAlertService:
         # Fallback to local TTS
         return self._fallback_tts(text, cache_key)
     
+    def _get_session(self):
+        """Get the pooled HTTP session, creating it on first use."""
+        if self._session is None:
+            import requests
+            self._session = requests.Session()
+        return self._session
+    
+    def warm_up(self) -> bool:
+        """
+        Open a pooled connection to the API ahead of the first alert,
+        so that alert doesn't also pay for DNS and the TLS handshake.
+        No-op without an API key or after the first call.
+        
+        Returns:
+            True if a connection was established
+        """
+        if not self.api_key or self._warmed_up:
+            return False
+        self._warmed_up = True
+        try:
+            self._get_session().head(self.base_url, timeout=5)
+            return True
+        except ImportError:
+            return False
+        except Exception as e:
+            print(f"ElevenLabs warm-up failed: {e}")
+            return False
+    
     def _call_elevenlabs(self, text: str, output_path: Path) -> Optional[Path]:
         """
         Call ElevenLabs API for text-to-speech.
@@ -106,7 +139,7 @@ class VoiceAlertService:
             Path to audio file or None if failed
         """
         try:
-            import requests
+            session = self._get_session()
             
             url = f"{self.base_url}/text-to-speech/{self.voice_id}"
             
@@ -122,15 +155,14 @@ class VoiceAlertService:
                 "voice_settings": self.voice_settings
             }
             
-            response = requests.post(url, json=data, headers=headers, timeout=30)
-            
-            if response.status_code == 200:
-                output_path.write_bytes(response.content)
-                print(f"✓ Audio generated: {output_path.name}")
-                return output_path
-            else:
-                print(f"ElevenLabs API error: {response.status_code} - {response.text[:100]}")
-                return None
+            with session.post(url, json=data, headers=headers, timeout=30, stream=True) as response:
+                if response.status_code == 200:
+                    self._download(response, output_path)
+                    print(f"✓ Audio generated: {output_path.name}")
+                    return output_path
+                else:
+                    print(f"ElevenLabs API error: {response.status_code} - {response.text[:100]}")
+                    return None
                 
         except ImportError:
             print("Requests package not installed. Run: pip install requests")
@@ -139,6 +171,26 @@ class VoiceAlertService:
             print(f"ElevenLabs error: {e}")
             return None
     
+    def _download(self, response, output_path: Path):
+        """
+        Stream a response body to output_path as it arrives.
+        Written to a temporary file first and renamed into place, so an
+        interrupted download never leaves a truncated file in the cache.
+        
+        Args:
+            response: Streaming HTTP response
+            output_path: Where to save the audio
+        """
+        fd, tmp_name = tempfile.mkstemp(dir=output_path.parent, suffix=".part")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                for chunk in response.iter_content(chunk_size=16384):
+                    f.write(chunk)
+            os.replace(tmp_name, output_path)
+        except BaseException:
+            os.unlink(tmp_name)
+            raise
+    
     def _fallback_tts(self, text: str, cache_key: str) -> Optional[Path]:
         """
         Fallback using pyttsx3 (offline TTS) or gTTS if available.
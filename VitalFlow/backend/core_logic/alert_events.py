@@ -0,0 +1,189 @@
+"""
+Push channel for doctor and medicine alerts.
+Nurse/doctor screens subscribe once over /ws/alerts instead of polling the
+alert endpoints every few seconds; alert systems publish an event whenever
+an alert changes state, or a tracked patient enters or leaves the critical list.
+
+Events are delivered in-process, or through Redis pub/sub when REDIS_URL is
+set so every worker fans out events raised on any other worker.
+"""
+import sys
+import json
+import time
+import asyncio
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from .redis_pool import get_redis_client
+
+
+class AlertEventBus:
+    """
+    Fan-out of alert events to subscribed WebSocket connections.
+    publish() may be called from any thread (sync endpoints run in a thread pool);
+    events are handed to each subscriber's event loop thread-safely.
+    """
+
+    CHANNEL = "vf:alerts"
+    QUEUE_SIZE = 100  # Events buffered per slow subscriber before dropping
+    RECONNECT_MIN_DELAY = 0.5  # Seconds before resubscribing after a Redis error, doubled per failure
+    RECONNECT_MAX_DELAY = 30.0
+
+    # Event source -> field naming the doctor an event is addressed to
+    DOCTOR_FIELDS = {"doctor_alerts": "doctor_id", "critical_patients": "primary_doctor_id"}
+
+    def __init__(self):
+        """Initialize bus, using Redis pub/sub when configured."""
+        self._lock = threading.Lock()
+        self._subscribers: List[Tuple[asyncio.AbstractEventLoop, asyncio.Queue, Optional[str]]] = []
+        self._listener: Optional[threading.Thread] = None
+
+        try:
+            self._redis = get_redis_client()
+        except Exception as e:
+            print(f"Warning: Redis unavailable, alert events stay in-process: {e}")
+            self._redis = None
+
+    def subscribe(self, doctor_id: Optional[str] = None) -> asyncio.Queue:
+        """
+        Register a subscriber. Must be called from the subscriber's event loop.
+
+        Args:
+            doctor_id: Only receive doctor alerts and critical patients addressed to
+                       this doctor (medicine and prescription events go to everyone)
+
+        Returns:
+            Queue receiving event dicts
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.QUEUE_SIZE)
+        with self._lock:
+            self._subscribers.append((asyncio.get_running_loop(), queue, doctor_id))
+            if self._redis is not None and self._listener is None:
+                self._listener = threading.Thread(target=self._listen, daemon=True)
+                self._listener.start()
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        """Remove a subscriber registered with subscribe()."""
+        with self._lock:
+            self._subscribers = [s for s in self._subscribers if s[1] is not queue]
+
+    @property
+    def subscriber_count(self) -> int:
+        """Number of connected subscribers in this process."""
+        return len(self._subscribers)
+
+    def publish(self, source: str, event: str, alert: Dict) -> None:
+        """
+        Publish an alert state change.
+
+        Args:
+            source: "doctor_alerts", "medicine_alerts", "prescriptions" or "critical_patients"
+            event: What happened (sent, acknowledged, resolved, scanned, ...)
+            alert: Alert (prescription, patient tracking) as returned by its to_dict()
+        """
+        message = {"source": source, "event": event, "alert": alert}
+        if self._redis is not None:
+            try:
+                self._redis.publish(self.CHANNEL, json.dumps(message, default=str))
+                return
+            except Exception as e:
+                print(f"Warning: Redis publish failed, delivering locally: {e}")
+        self._dispatch(message)
+
+    def _dispatch(self, message: Dict) -> None:
+        """Hand a message to every matching local subscriber."""
+        if not self._subscribers:
+            return
+        doctor_field = self.DOCTOR_FIELDS.get(message["source"])
+        doctor_id = message["alert"].get(doctor_field) if doctor_field else None
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for loop, queue, subscribed_doctor in subscribers:
+            if subscribed_doctor and doctor_id and subscribed_doctor != doctor_id:
+                continue
+            try:
+                loop.call_soon_threadsafe(self._offer, queue, message)
+            except RuntimeError:
+                pass  # Subscriber's loop already closed
+
+    @staticmethod
+    def _offer(queue: asyncio.Queue, message: Dict) -> None:
+        """Enqueue without blocking; a full queue means the client is not keeping up."""
+        try:
+            queue.put_nowait(message)
+        except asyncio.QueueFull:
+            pass
+
+    def _listen(self) -> None:
+        """
+        Relay events published by any worker to this worker's subscribers.
+        Resubscribes with exponential backoff if the Redis connection drops,
+        so a Redis restart does not silently stop cross-worker events.
+        """
+        delay = self.RECONNECT_MIN_DELAY
+        while True:
+            pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+            try:
+                pubsub.subscribe(self.CHANNEL)
+                delay = self.RECONNECT_MIN_DELAY
+                for item in pubsub.listen():
+                    try:
+                        self._dispatch(json.loads(item["data"]))
+                    except Exception as e:
+                        print(f"Alert event relay error: {e}")
+            except Exception as e:
+                print(f"Alert event listener lost Redis, retrying in {delay:.1f}s: {e}")
+            finally:
+                try:
+                    pubsub.close()
+                except Exception:
+                    pass
+            time.sleep(delay)
+            delay = min(delay * 2, self.RECONNECT_MAX_DELAY)
+
+
+# Singleton instance
+alert_events = AlertEventBus()
+
+
+# ============== UNIT TESTS ==============
+if __name__ == "__main__":
+    print("Testing AlertEventBus...")
+
+    async def main():
+        bus = AlertEventBus()
+        bus._redis = None
+
+        everyone = bus.subscribe()
+        dr_a = bus.subscribe(doctor_id="DOC-A")
+        assert bus.subscriber_count == 2
+
+        bus.publish("doctor_alerts", "sent", {"alert_id": "A1", "doctor_id": "DOC-B"})
+        bus.publish("medicine_alerts", "sent", {"alert_id": "M1"})
+        # Publish from a worker thread, as sync endpoints do
+        await asyncio.to_thread(bus.publish, "doctor_alerts", "sent", {"alert_id": "A2", "doctor_id": "DOC-A"})
+        await asyncio.sleep(0)
+
+        got_all = [everyone.get_nowait()["alert"]["alert_id"] for _ in range(everyone.qsize())]
+        got_a = [dr_a.get_nowait()["alert"]["alert_id"] for _ in range(dr_a.qsize())]
+        assert got_all == ["A1", "M1", "A2"], got_all
+        assert got_a == ["M1", "A2"], got_a
+        print("✓ Events fan out with doctor filtering")
+
+        bus.publish("critical_patients", "critical", {"patient_id": "P1", "primary_doctor_id": "DOC-B"})
+        await asyncio.sleep(0)
+        assert everyone.qsize() == 1 and dr_a.qsize() == 0
+        everyone.get_nowait()
+        print("✓ Critical patients filtered by primary doctor")
+
+        bus.unsubscribe(dr_a)
+        assert bus.subscriber_count == 1
+        print("✓ Unsubscribe")
+
+    asyncio.run(main())
+    print("\n✅ All AlertEventBus tests passed!")
@@ -14,6 +14,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from shared.models import Patient, PatientStatus, Ambulance, BedType
 from shared.utils import get_enum_value
+from shared.events import emit_ambulance_dispatched, emit_ambulance_arriving
 from .state import hospital_state
 from .bed_manager import bed_manager
 from .staff_manager import staff_manager
@@ -129,6 +130,8 @@ class AmbulanceManager:
             }
         )
         
+        emit_ambulance_dispatched(ambulance_id, eta_minutes, patient_info.get("condition"))
+        
         # Check if pre-clearance should start immediately
         if eta_minutes <= self.PRE_CLEARANCE_THRESHOLD_MINUTES:
             self._initiate_preclearance(ambulance_id)
@@ -189,6 +192,7 @@ class AmbulanceManager:
         tracking = self.active_ambulances[ambulance_id]
         patient_info = tracking.patient_info or {}
         result = {"ambulance_id": ambulance_id, "steps": []}
+        emit_ambulance_arriving(ambulance_id, tracking.eta_minutes)
         
         # Step 1: Determine required bed type
         condition = patient_info.get("condition", "").lower()
@@ -26,6 +26,11 @@ class BedManager:
     Manages all bed operations including the Tetris swapping algorithm.
     """
     
+    def __init__(self):
+        # get_bed_occupancy() result, reused until the next hospital_state.save()
+        self._occupancy: Dict[str, Dict[str, int]] = {}
+        self._occupancy_version = -1
+    
     def get_available_beds(self, bed_type: BedType = None) -> List[Bed]:
         """
         Get all available beds, optionally filtered by type.
@@ -36,12 +41,7 @@ class BedManager:
         Returns:
             List of available Bed objects
         """
-        available = []
-        for bed in hospital_state.beds.values():
-            if not bed.is_occupied:
-                if bed_type is None or bed.bed_type == bed_type:
-                    available.append(bed)
-        return available
+        return hospital_state.get_free_beds(bed_type)
     
     def get_bed_occupancy(self) -> Dict[str, Dict[str, int]]:
         """
@@ -50,17 +50,21 @@ class BedManager:
         Returns:
             Dict with format: {bed_type: {total, occupied, available}}
         """
-        stats = {}
-        for bed_type in BedType:
-            beds_of_type = [b for b in hospital_state.beds.values() 
-                          if b.bed_type == bed_type or b.bed_type == bed_type.value]
-            occupied = sum(1 for b in beds_of_type if b.is_occupied)
-            stats[get_enum_value(bed_type)] = {
-                "total": len(beds_of_type),
-                "occupied": occupied,
-                "available": len(beds_of_type) - occupied
-            }
-        return stats
+        version = hospital_state.version
+        if self._occupancy_version != version:
+            counts = hospital_state.get_counts()
+            stats = {}
+            for bed_type in BedType:
+                total = counts["beds_total"][bed_type]
+                occupied = counts["beds_occupied"][bed_type]
+                stats[get_enum_value(bed_type)] = {
+                    "total": total,
+                    "occupied": occupied,
+                    "available": total - occupied
+                }
+            self._occupancy = stats
+            self._occupancy_version = version
+        return self._occupancy
     
     def get_recommended_bed_type(self, patient: Patient) -> BedType:
         """
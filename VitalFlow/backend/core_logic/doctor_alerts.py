@@ -5,16 +5,18 @@ when patients become critical before scheduled visits.
 """
 import sys
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Iterator
 from datetime import datetime, timedelta
 from dataclasses import dataclass, field
 from enum import Enum
 import threading
+import numpy as np
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from shared.utils import get_enum_value
 from .state import hospital_state
+from .alert_events import alert_events
 
 
 class AlertPriority(str, Enum):
@@ -60,6 +62,12 @@ class AlertStatus(str, Enum):
     EXPIRED = "Expired"
 
 
+# Integer codes for AlertStatus used in column arrays (index into list(AlertStatus))
+ALERT_STATUS_CODES = {status: code for code, status in enumerate(AlertStatus)}
+OPEN_ALERT_CODES = np.array([ALERT_STATUS_CODES[AlertStatus.PENDING], ALERT_STATUS_CODES[AlertStatus.SENT]],
+                            dtype=np.int8)
+
+
 @dataclass
 class DoctorInfo:
     """Doctor information for alerts"""
@@ -224,6 +232,27 @@ class DoctorAlertSystem:
         self.alerts: Dict[str, DoctorAlert] = {}
         self.alert_counter = 0
         
+        # Secondary indexes over self.alerts so polled lookups don't scan every alert.
+        # Id lists are in creation order (oldest first).
+        self._alerts_by_patient: Dict[str, List[str]] = {}
+        self._alerts_by_doctor: Dict[str, List[str]] = {}
+        
+        # Structure-of-arrays copies of the fields the polled endpoints filter on, so
+        # filters run as NumPy masks. Row i of the alert columns is self._alert_rows[i],
+        # row i of the criticality column is self._tracking_rows[i].
+        self._columns_lock = threading.Lock()
+        self._alert_rows: List[str] = []
+        self._alert_row_of: Dict[str, int] = {}
+        self._alert_status = np.empty(64, dtype=np.int8)     # ALERT_STATUS_CODES
+        self._alert_doctor = np.empty(64, dtype=np.int32)    # self._doctor_codes
+        self._doctor_codes: Dict[str, int] = {}
+        self._tracking_rows: List[str] = []
+        self._tracking_row_of: Dict[str, int] = {}
+        self._criticality = np.empty(64, dtype=np.int8)
+        
+        # Doctor ids per status, kept current so the status summary needs no recount
+        self._doctors_by_status: Dict[DoctorStatus, Dict[str, None]] = {status: {} for status in DoctorStatus}
+        
         # Escalation settings
         self.escalation_timeout_minutes = {
             AlertPriority.CRITICAL: 5,
@@ -267,7 +296,10 @@ class DoctorAlertSystem:
             phone=phone,
             email=email
         )
+        if doctor_id in self.doctors:
+            self._doctors_by_status[self.doctors[doctor_id].status].pop(doctor_id, None)
         self.doctors[doctor_id] = doctor
+        self._doctors_by_status[doctor.status][doctor_id] = None
         
         # Add to backup list
         if specialization not in self.backup_doctors:
@@ -277,6 +309,40 @@ class DoctorAlertSystem:
         
         return doctor
     
+    @staticmethod
+    def _grow(column: np.ndarray, size: int) -> np.ndarray:
+        """Return column with room for at least size rows, doubling capacity"""
+        if size <= len(column):
+            return column
+        grown = np.empty(max(size, 2 * len(column)), dtype=column.dtype)
+        grown[:len(column)] = column
+        return grown
+    
+    def _set_alert_status(self, alert: DoctorAlert, status: AlertStatus):
+        """Change an alert's status, keeping the status column in step"""
+        alert.status = status
+        # Under the lock: a concurrent insert may _grow() and swap the column mid-write
+        with self._columns_lock:
+            self._alert_status[self._alert_row_of[alert.alert_id]] = ALERT_STATUS_CODES[status]
+    
+    def _set_criticality(self, tracking: PatientCriticality, criticality_level: int):
+        """Change a patient's criticality, keeping the criticality column in step"""
+        tracking.criticality_level = criticality_level
+        with self._columns_lock:
+            row = self._tracking_row_of.get(tracking.patient_id)
+            if row is None:
+                row = len(self._tracking_rows)
+                self._criticality = self._grow(self._criticality, row + 1)
+                self._tracking_row_of[tracking.patient_id] = row
+                self._tracking_rows.append(tracking.patient_id)
+            self._criticality[row] = criticality_level
+    
+    def _set_doctor_status(self, doctor: DoctorInfo, status: DoctorStatus):
+        """Change a doctor's status, keeping the per-status index in step"""
+        self._doctors_by_status[doctor.status].pop(doctor.doctor_id, None)
+        doctor.status = status
+        self._doctors_by_status[status][doctor.doctor_id] = None
+    
     def update_doctor_status(self, doctor_id: str, status: DoctorStatus,
                              location: str = "", on_leave_until: Optional[datetime] = None,
                              leave_reason: str = "") -> Dict:
@@ -285,7 +351,7 @@ class DoctorAlertSystem:
             return {"success": False, "error": "Doctor not found"}
         
         doctor = self.doctors[doctor_id]
-        doctor.status = status
+        self._set_doctor_status(doctor, status)
         doctor.current_location = location
         
         if status == DoctorStatus.ON_LEAVE:
@@ -316,6 +382,9 @@ class DoctorAlertSystem:
             next_doctor_visit=next_visit
         )
         self.patient_tracking[patient_id] = tracking
+        self._set_criticality(tracking, criticality_level)
+        if criticality_level <= 2:
+            alert_events.publish("critical_patients", "critical", tracking.to_dict())
         return tracking
     
     def update_patient_criticality(self, patient_id: str, criticality_level: int,
@@ -329,11 +398,16 @@ class DoctorAlertSystem:
         
         tracking = self.patient_tracking[patient_id]
         old_level = tracking.criticality_level
-        tracking.criticality_level = criticality_level
+        self._set_criticality(tracking, criticality_level)
         tracking.current_condition = condition
         tracking.vitals_summary = vitals
         
-        result = {"success": True, "tracking": tracking.to_dict()}
+        tracking_dict = tracking.to_dict()
+        result = {"success": True, "tracking": tracking_dict}
+        
+        # Push changes to the critical-patients list (levels 1-2); "stable" means it left the list
+        if criticality_level <= 2 or old_level <= 2:
+            alert_events.publish("critical_patients", "critical" if criticality_level <= 2 else "stable", tracking_dict)
         
         # Check if patient became more critical
         if criticality_level < old_level and criticality_level <= 2:
@@ -411,6 +485,16 @@ class DoctorAlertSystem:
         )
         
         self.alerts[alert_id] = alert
+        self._alerts_by_patient.setdefault(alert.patient_id, []).append(alert_id)
+        self._alerts_by_doctor.setdefault(alert.doctor_id, []).append(alert_id)
+        with self._columns_lock:
+            row = len(self._alert_rows)
+            self._alert_status = self._grow(self._alert_status, row + 1)
+            self._alert_doctor = self._grow(self._alert_doctor, row + 1)
+            self._alert_status[row] = ALERT_STATUS_CODES[alert.status]
+            self._alert_doctor[row] = self._doctor_codes.setdefault(alert.doctor_id, len(self._doctor_codes))
+            self._alert_row_of[alert_id] = row
+            self._alert_rows.append(alert_id)
         tracking.alert_sent = True
         tracking.alert_count += 1
         
@@ -446,8 +530,9 @@ class DoctorAlertSystem:
     
     def _send_alert(self, alert: DoctorAlert):
         """Send alert to doctor (via SMS/Call/Push notification)"""
-        alert.status = AlertStatus.SENT
+        self._set_alert_status(alert, AlertStatus.SENT)
         alert.sent_at = datetime.now()
+        alert_events.publish("doctor_alerts", "sent", alert.to_dict())
         
         # In production, this would trigger actual notifications
         # For now, we log the action
@@ -466,7 +551,7 @@ class DoctorAlertSystem:
             return {"success": False, "error": "Alert not found"}
         
         alert = self.alerts[alert_id]
-        alert.status = AlertStatus.ACKNOWLEDGED
+        self._set_alert_status(alert, AlertStatus.ACKNOWLEDGED)
         alert.acknowledged_at = datetime.now()
         alert.response_notes = response
         
@@ -475,14 +560,17 @@ class DoctorAlertSystem:
         
         # Update doctor status
         if doctor_id in self.doctors:
-            self.doctors[doctor_id].status = DoctorStatus.EMERGENCY_RECALL
+            self._set_doctor_status(self.doctors[doctor_id], DoctorStatus.EMERGENCY_RECALL)
         
         hospital_state.log_decision(
             "ALERT_ACKNOWLEDGED",
             f"✅ {alert.doctor_name} acknowledged alert for {alert.patient_name}. Response: {response}. ETA: {coming_eta or 'ASAP'} min"
         )
         
-        return {"success": True, "alert": alert.to_dict()}
+        alert_dict = alert.to_dict()
+        alert_events.publish("doctor_alerts", "acknowledged", alert_dict)
+        
+        return {"success": True, "alert": alert_dict}
     
     def mark_doctor_responding(self, alert_id: str) -> Dict:
         """Mark that doctor is on the way"""
@@ -490,14 +578,17 @@ class DoctorAlertSystem:
             return {"success": False, "error": "Alert not found"}
         
         alert = self.alerts[alert_id]
-        alert.status = AlertStatus.DOCTOR_RESPONDING
+        self._set_alert_status(alert, AlertStatus.DOCTOR_RESPONDING)
         
         hospital_state.log_decision(
             "DOCTOR_RESPONDING",
             f"🏃 {alert.doctor_name} is responding to alert for {alert.patient_name}"
         )
         
-        return {"success": True, "alert": alert.to_dict()}
+        alert_dict = alert.to_dict()
+        alert_events.publish("doctor_alerts", "responding", alert_dict)
+        
+        return {"success": True, "alert": alert_dict}
     
     def resolve_alert(self, alert_id: str, resolution_notes: str = "") -> Dict:
         """Resolve the alert"""
@@ -505,7 +596,7 @@ class DoctorAlertSystem:
             return {"success": False, "error": "Alert not found"}
         
         alert = self.alerts[alert_id]
-        alert.status = AlertStatus.RESOLVED
+        self._set_alert_status(alert, AlertStatus.RESOLVED)
         alert.resolved_at = datetime.now()
         alert.response_notes = resolution_notes
         
@@ -514,7 +605,10 @@ class DoctorAlertSystem:
             f"✅ Alert {alert_id} resolved for {alert.patient_name}. Notes: {resolution_notes}"
         )
         
-        return {"success": True, "alert": alert.to_dict()}
+        alert_dict = alert.to_dict()
+        alert_events.publish("doctor_alerts", "resolved", alert_dict)
+        
+        return {"success": True, "alert": alert_dict}
     
     def escalate_alert(self, alert_id: str) -> Dict:
         """Escalate alert to backup doctor"""
@@ -540,7 +634,7 @@ class DoctorAlertSystem:
         # Create new alert for backup doctor
         alert.escalation_level += 1
         alert.escalated_to = backup_doctor.doctor_id
-        alert.status = AlertStatus.ESCALATED
+        self._set_alert_status(alert, AlertStatus.ESCALATED)
         
         # Create new alert for backup
         new_alert = self._create_emergency_alert(
@@ -557,9 +651,12 @@ class DoctorAlertSystem:
             f"⬆️ Alert escalated from {original_doctor.name} to {backup_doctor.name} for {alert.patient_name}"
         )
         
+        alert_dict = alert.to_dict()
+        alert_events.publish("doctor_alerts", "escalated", alert_dict)
+        
         return {
             "success": True,
-            "original_alert": alert.to_dict(),
+            "original_alert": alert_dict,
             "escalated_alert": new_alert.to_dict(),
             "backup_doctor": backup_doctor.to_dict()
         }
@@ -594,25 +691,33 @@ class DoctorAlertSystem:
         escalated = []
         now = datetime.now()
         
-        for alert in self.alerts.values():
-            if alert.status == AlertStatus.SENT:
-                timeout = self.escalation_timeout_minutes.get(alert.priority, 30)
-                if alert.sent_at and (now - alert.sent_at).total_seconds() > timeout * 60:
-                    result = self.escalate_alert(alert.alert_id)
-                    if result["success"]:
-                        escalated.append(result)
+        n = len(self._alert_rows)
+        sent_rows = np.flatnonzero(self._alert_status[:n] == ALERT_STATUS_CODES[AlertStatus.SENT])
+        sent_alerts = [self.alerts[self._alert_rows[i]] for i in sent_rows]
+        timed_out = [
+            alert.alert_id for alert in sent_alerts
+            if alert.status == AlertStatus.SENT and alert.sent_at
+            and (now - alert.sent_at).total_seconds() > self.escalation_timeout_minutes.get(alert.priority, 30) * 60
+        ]
+        
+        # One state write for the whole batch instead of one per escalation
+        with hospital_state.batch():
+            for alert_id in timed_out:
+                result = self.escalate_alert(alert_id)
+                if result["success"]:
+                    escalated.append(result)
         
         return escalated
     
     def get_pending_alerts(self, doctor_id: Optional[str] = None) -> List[Dict]:
         """Get pending alerts, optionally filtered by doctor"""
-        pending_statuses = [AlertStatus.PENDING, AlertStatus.SENT]
+        n = len(self._alert_rows)
+        mask = np.isin(self._alert_status[:n], OPEN_ALERT_CODES)
+        if doctor_id is not None:
+            mask &= self._alert_doctor[:n] == self._doctor_codes.get(doctor_id, -1)
         
-        alerts = [
-            a.to_dict() for a in self.alerts.values()
-            if a.status in pending_statuses
-            and (doctor_id is None or a.doctor_id == doctor_id)
-        ]
+        # Dicts are only built for matching rows
+        alerts = [self.alerts[self._alert_rows[i]].to_dict() for i in np.flatnonzero(mask)]
         
         return sorted(alerts, key=lambda x: (
             0 if x["priority"] == "Critical" else 1 if x["priority"] == "Urgent" else 2,
@@ -621,37 +726,42 @@ class DoctorAlertSystem:
     
     def get_doctor_status_summary(self) -> Dict:
         """Get summary of all doctors' status"""
-        status_counts = {}
-        for status in DoctorStatus:
-            status_counts[get_enum_value(status)] = sum(
-                1 for d in self.doctors.values() if d.status == status
-            )
+        by_status = self._doctors_by_status
         
         return {
             "total_doctors": len(self.doctors),
-            "status_breakdown": status_counts,
-            "on_leave": [d.to_dict() for d in self.doctors.values() if d.status == DoctorStatus.ON_LEAVE],
-            "available": [d.to_dict() for d in self.doctors.values() if d.status == DoctorStatus.AVAILABLE]
+            "status_breakdown": {get_enum_value(status): len(ids) for status, ids in by_status.items()},
+            "on_leave": [self.doctors[i].to_dict() for i in list(by_status[DoctorStatus.ON_LEAVE])],
+            "available": [self.doctors[i].to_dict() for i in list(by_status[DoctorStatus.AVAILABLE])]
         }
     
     def get_critical_patients(self) -> List[Dict]:
         """Get all critical patients being tracked"""
-        return [
-            t.to_dict() for t in self.patient_tracking.values()
-            if t.criticality_level <= 2
-        ]
+        n = len(self._tracking_rows)
+        rows = np.flatnonzero(self._criticality[:n] <= 2)
+        return [self.patient_tracking[self._tracking_rows[i]].to_dict() for i in rows]
+    
+    def iter_alert_history(self, patient_id: Optional[str] = None,
+                           doctor_id: Optional[str] = None) -> Iterator[Dict]:
+        """Yield alert history, newest first"""
+        # Start from the narrowest index; ids are already in creation order
+        if patient_id:
+            alert_ids = self._alerts_by_patient.get(patient_id, [])
+        elif doctor_id:
+            alert_ids = self._alerts_by_doctor.get(doctor_id, [])
+        else:
+            alert_ids = list(self.alerts)
+        
+        for alert_id in reversed(alert_ids):
+            alert = self.alerts[alert_id]
+            if patient_id and doctor_id and alert.doctor_id != doctor_id:
+                continue
+            yield alert.to_dict()
     
     def get_alert_history(self, patient_id: Optional[str] = None,
                           doctor_id: Optional[str] = None) -> List[Dict]:
-        """Get alert history"""
-        alerts = list(self.alerts.values())
-        
-        if patient_id:
-            alerts = [a for a in alerts if a.patient_id == patient_id]
-        if doctor_id:
-            alerts = [a for a in alerts if a.doctor_id == doctor_id]
-        
-        return [a.to_dict() for a in sorted(alerts, key=lambda x: x.created_at, reverse=True)]
+        """Get alert history, newest first"""
+        return list(self.iter_alert_history(patient_id, doctor_id))
 
 
 # Global instance
@@ -5,8 +5,9 @@ NEVER invents medicines - only uses protocol-defined actions.
 """
 import sys
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
+from functools import lru_cache
 from enum import Enum
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
@@ -462,6 +463,48 @@ EMERGENCY_PROTOCOLS: Dict[EmergencyType, EmergencyProtocol] = {
 }
 
 
+# Simple mapping for common shorthand protocol names
+PROTOCOL_SHORTCUTS = {
+    "heart_attack": EmergencyType.HEART_ATTACK,
+    "mi": EmergencyType.HEART_ATTACK,
+    "myocardial_infarction": EmergencyType.HEART_ATTACK,
+    "stroke": EmergencyType.STROKE,
+    "respiratory": EmergencyType.RESPIRATORY_FAILURE,
+    "respiratory_failure": EmergencyType.RESPIRATORY_FAILURE,
+    "sepsis": EmergencyType.SEPSIS,
+    "cardiac_arrest": EmergencyType.CARDIAC_ARREST,
+    "trauma": EmergencyType.TRAUMA,
+    "anaphylaxis": EmergencyType.ANAPHYLAXIS,
+    "diabetic": EmergencyType.DIABETIC_EMERGENCY,
+    "diabetic_emergency": EmergencyType.DIABETIC_EMERGENCY,
+    "dka": EmergencyType.DIABETIC_EMERGENCY,
+    "seizure": EmergencyType.SEIZURE,
+}
+
+# EmergencyType values normalized once for name matching
+_NORMALIZED_TYPE_NAMES = [
+    (emergency_type, emergency_type.value.lower().replace(" ", "_").replace("(", "").replace(")", ""))
+    for emergency_type in EmergencyType
+]
+
+
+@lru_cache(maxsize=256)
+def _protocol_name_candidates(name: str) -> Tuple[EmergencyType, ...]:
+    """
+    Resolve a free-text protocol name to matching emergency types, best match first.
+    Shortcut match comes first, then any type whose name contains (or is contained in) the input.
+    """
+    name_lower = name.lower().replace(" ", "_").replace("-", "_").replace("(", "").replace(")", "")
+    
+    candidates = []
+    if name_lower in PROTOCOL_SHORTCUTS:
+        candidates.append(PROTOCOL_SHORTCUTS[name_lower])
+    for emergency_type, type_value in _NORMALIZED_TYPE_NAMES:
+        if name_lower in type_value or type_value in name_lower:
+            candidates.append(emergency_type)
+    return tuple(candidates)
+
+
 class EmergencyProtocolEngine:
     """
     Engine for matching patients to appropriate emergency protocols.
@@ -595,41 +638,11 @@ class EmergencyProtocolEngine:
         Returns:
             Protocol dict or None
         """
-        # Normalize input
-        name_lower = name.lower().replace(" ", "_").replace("-", "_").replace("(", "").replace(")", "")
-        
-        # Simple mapping for common shorthand
-        shortcuts = {
-            "heart_attack": EmergencyType.HEART_ATTACK,
-            "mi": EmergencyType.HEART_ATTACK,
-            "myocardial_infarction": EmergencyType.HEART_ATTACK,
-            "stroke": EmergencyType.STROKE,
-            "respiratory": EmergencyType.RESPIRATORY_FAILURE,
-            "respiratory_failure": EmergencyType.RESPIRATORY_FAILURE,
-            "sepsis": EmergencyType.SEPSIS,
-            "cardiac_arrest": EmergencyType.CARDIAC_ARREST,
-            "trauma": EmergencyType.TRAUMA,
-            "anaphylaxis": EmergencyType.ANAPHYLAXIS,
-            "diabetic": EmergencyType.DIABETIC_EMERGENCY,
-            "diabetic_emergency": EmergencyType.DIABETIC_EMERGENCY,
-            "dka": EmergencyType.DIABETIC_EMERGENCY,
-            "seizure": EmergencyType.SEIZURE,
-        }
-        
-        # Check shortcuts first
-        if name_lower in shortcuts:
-            protocol = self.protocols.get(shortcuts[name_lower])
+        for emergency_type in _protocol_name_candidates(name):
+            protocol = self.protocols.get(emergency_type)
             if protocol:
                 return self._protocol_to_dict(protocol)
         
-        # Try to match by value
-        for emergency_type in EmergencyType:
-            type_value = emergency_type.value.lower().replace(" ", "_").replace("(", "").replace(")", "")
-            if name_lower in type_value or type_value in name_lower:
-                protocol = self.protocols.get(emergency_type)
-                if protocol:
-                    return self._protocol_to_dict(protocol)
-        
         return None
     
     def _protocol_to_dict(self, protocol: EmergencyProtocol) -> Dict:
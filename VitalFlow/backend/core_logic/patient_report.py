@@ -4,8 +4,10 @@ Generates daily patient reports with recovery tracking, meal/medicine schedules,
 and estimated discharge dates.
 """
 import sys
+import threading
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from collections import OrderedDict
+from typing import Dict, List, Optional, Any, Callable, Tuple
 from datetime import datetime, timedelta
 from dataclasses import dataclass, field
 from enum import Enum
@@ -214,6 +216,9 @@ class PatientReportSystem:
     - Estimated discharge date based on recovery rate
     """
     
+    # Rendered patient views / summaries kept (keyed by report version)
+    VIEW_CACHE_MAX_SIZE = 4096
+    
     def __init__(self):
         self.patient_reports: Dict[str, PatientDailyReport] = {}  # patient_id -> current report
         self.report_history: Dict[str, List[PatientDailyReport]] = {}  # patient_id -> [historical reports]
@@ -224,6 +229,12 @@ class PatientReportSystem:
         self.note_counter = 0
         self.meal_counter = 0
         
+        # Per-patient report version, bumped on every write to that patient's data.
+        # Cached views are keyed on it, so a write makes older entries unreachable.
+        self._versions: Dict[str, int] = {}
+        self._view_cache: "OrderedDict[Tuple, Dict]" = OrderedDict()
+        self._view_cache_lock = threading.Lock()  # Endpoints call in from a thread pool
+        
         # Standard meal times
         self.meal_times = {
             "Breakfast": "08:00",
@@ -232,6 +243,37 @@ class PatientReportSystem:
             "Dinner": "19:30"
         }
     
+    def _touch(self, patient_id: str):
+        """Record a write to a patient's report data"""
+        self._versions[patient_id] = self._versions.get(patient_id, 0) + 1
+    
+    def _cached_view(self, kind: str, patient_id: str, build: Callable[[], Dict]) -> Dict:
+        """
+        Return a rendered view from the LRU cache, building it on a miss.
+        
+        Args:
+            kind: View name ("view" or "summary")
+            patient_id: Patient ID
+            build: Renders the view from current report data
+            
+        Returns:
+            Rendered view (shared; callers must not modify it)
+        """
+        # Views filter on today's date, so the day is part of the key
+        key = (kind, patient_id, self._versions.get(patient_id, 0), datetime.now().date())
+        with self._view_cache_lock:
+            view = self._view_cache.get(key)
+            if view is not None:
+                self._view_cache.move_to_end(key)
+                return view
+        
+        view = build()
+        with self._view_cache_lock:
+            self._view_cache[key] = view
+            if len(self._view_cache) > self.VIEW_CACHE_MAX_SIZE:
+                self._view_cache.popitem(last=False)
+        return view
+    
     def initialize_patient_report(self, patient_id: str, patient_name: str,
                                    admission_date: datetime, diagnosis: str = "") -> PatientDailyReport:
         """Initialize daily report for a new patient"""
@@ -250,6 +292,7 @@ class PatientReportSystem:
         self.medicine_schedules[patient_id] = []
         self.vitals_log[patient_id] = []
         self.consultation_history[patient_id] = []
+        self._touch(patient_id)
         
         # Generate default meal schedule for today
         self._generate_daily_meals(patient_id)
@@ -282,6 +325,7 @@ class PatientReportSystem:
                 diet_type=diet_type
             )
             report.meals.append(meal)
+        self._touch(patient_id)
     
     def record_vitals(self, patient_id: str, recorded_by: str,
                       spo2: float = 98.0, heart_rate: int = 75,
@@ -307,6 +351,7 @@ class PatientReportSystem:
         
         # Update recovery based on vitals
         self._update_recovery_metrics(patient_id)
+        self._touch(patient_id)
         
         hospital_state.log_decision(
             "VITALS_RECORDED",
@@ -431,6 +476,7 @@ class PatientReportSystem:
         
         self.consultation_history[patient_id].append(note)
         self.patient_reports[patient_id].consultation_notes.append(note)
+        self._touch(patient_id)
         
         hospital_state.log_decision(
             "CONSULTATION_ADDED",
@@ -455,6 +501,7 @@ class PatientReportSystem:
                     meal.served_time = datetime.now()
                     meal.served_by = served_by
                 meal.consumption_notes = notes
+                self._touch(patient_id)
                 
                 hospital_state.log_decision(
                     "MEAL_UPDATED",
@@ -486,6 +533,7 @@ class PatientReportSystem:
         
         if patient_id in self.patient_reports:
             self.patient_reports[patient_id].medicines_given.append(schedule)
+        self._touch(patient_id)
         
         hospital_state.log_decision(
             "MEDICINE_SCHEDULED",
@@ -505,6 +553,7 @@ class PatientReportSystem:
                 schedule.given_time = datetime.now()
                 schedule.given_by = given_by
                 schedule.notes = notes
+                self._touch(patient_id)
                 
                 hospital_state.log_decision(
                     "MEDICINE_GIVEN",
@@ -542,7 +591,10 @@ class PatientReportSystem:
         """
         if patient_id not in self.patient_reports:
             return None
-        
+        return self._cached_view("view", patient_id, lambda: self._render_patient_view(patient_id))
+    
+    def _render_patient_view(self, patient_id: str) -> Dict:
+        """Build the patient-friendly view from current report data"""
         report = self.patient_reports[patient_id]
         
         # Get today's schedule
@@ -609,7 +661,11 @@ class PatientReportSystem:
         """Get summary of the day for shift handover"""
         if patient_id not in self.patient_reports:
             return None
-        
+        summary = self._cached_view("summary", patient_id, lambda: self._render_daily_summary(patient_id))
+        return {**summary, "date": datetime.now().isoformat()}
+    
+    def _render_daily_summary(self, patient_id: str) -> Dict:
+        """Build the shift handover summary from current report data"""
         report = self.patient_reports[patient_id]
         
         medicines_given = len([m for m in report.medicines_given 
@@ -649,6 +705,7 @@ class PatientReportSystem:
         report = self.patient_reports[patient_id]
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M")
         report.nurse_notes += f"\n[{timestamp}] {nurse_name}: {notes}"
+        self._touch(patient_id)
         
         return {"success": True, "notes": report.nurse_notes}
 
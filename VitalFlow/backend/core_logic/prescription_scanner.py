@@ -5,7 +5,7 @@ and tracks medicine administration confirmation by nurses.
 """
 import sys
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Iterator
 from datetime import datetime, timedelta
 from dataclasses import dataclass, field
 from enum import Enum
@@ -16,6 +16,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from shared.utils import get_enum_value
 from .state import hospital_state
+from .alert_events import alert_events
 
 
 class PrescriptionStatus(str, Enum):
@@ -188,6 +189,9 @@ class PrescriptionScanner:
     def __init__(self):
         self.prescriptions: Dict[str, Prescription] = {}
         self.alerts: Dict[str, MedicineAlert] = {}
+        self._alerts_by_patient: Dict[str, List[str]] = {}  # patient_id -> alert ids
+        self._alerts_by_hour: Dict[datetime, List[str]] = {}  # scheduled hour -> alert ids
+        self._pruned_before: Optional[datetime] = None
         self.prescription_counter = 0
         self.alert_counter = 0
         
@@ -286,8 +290,15 @@ class PrescriptionScanner:
     def upload_prescription(self, patient_id: str, patient_name: str,
                             doctor_id: str, doctor_name: str,
                             uploaded_by: str, raw_text: str = "",
-                            image_path: Optional[str] = None) -> Dict:
-        """Upload a new prescription for scanning"""
+                            image_path: Optional[str] = None,
+                            scan: bool = True) -> Dict:
+        """
+        Upload a new prescription for scanning.
+        
+        Args:
+            scan: Scan right away; pass False when the caller schedules
+                  scan_prescription() itself (e.g. as a background task)
+        """
         self.prescription_counter += 1
         prescription_id = f"RX-{datetime.now().strftime('%Y%m%d')}-{self.prescription_counter:04d}"
         
@@ -312,7 +323,8 @@ class PrescriptionScanner:
         )
         
         # Auto-scan the prescription
-        self._scan_prescription(prescription_id)
+        if scan:
+            self.scan_prescription(prescription_id)
         
         return {
             "success": True,
@@ -320,7 +332,7 @@ class PrescriptionScanner:
             "message": "Prescription uploaded and scanning initiated"
         }
     
-    def _scan_prescription(self, prescription_id: str):
+    def scan_prescription(self, prescription_id: str):
         """AI scans and parses the prescription"""
         if prescription_id not in self.prescriptions:
             return
@@ -339,6 +351,8 @@ class PrescriptionScanner:
             "PRESCRIPTION_SCANNED",
             f"🔍 Prescription {prescription_id} scanned. Found {len(medicines)} medicines."
         )
+        
+        alert_events.publish("prescriptions", "scanned", prescription.to_dict())
     
     def _parse_prescription_text(self, raw_text: str) -> List[MedicineInfo]:
         """Parse prescription text to extract medicines"""
@@ -455,6 +469,9 @@ class PrescriptionScanner:
             return {"success": False, "error": "Prescription not found"}
         
         prescription = self.prescriptions[prescription_id]
+        if prescription.status in [PrescriptionStatus.UPLOADED, PrescriptionStatus.SCANNING]:
+            return {"success": False, "error": "Prescription is still being scanned"}
+        
         prescription.verified_by = verified_by
         prescription.verified_at = datetime.now()
         prescription.notes = notes
@@ -507,19 +524,54 @@ class PrescriptionScanner:
                         status=MedicineAlertStatus.PENDING
                     )
                     self.alerts[alert.alert_id] = alert
+                    self._alerts_by_patient.setdefault(alert.patient_id, []).append(alert.alert_id)
+                    self._alerts_by_hour.setdefault(self._hour_bucket(scheduled_time), []).append(alert.alert_id)
+    
+    @staticmethod
+    def _hour_bucket(moment: datetime) -> datetime:
+        """Truncate a timestamp to the start of its hour"""
+        return moment.replace(minute=0, second=0, microsecond=0)
+    
+    def _pending_alerts_between(self, start: datetime, end: datetime) -> List[MedicineAlert]:
+        """
+        Get PENDING alerts scheduled in [start, end], earliest first.
+        Only alerts in the hour buckets overlapping the window are read, so
+        alerts outside it are never inspected.
+        
+        Args:
+            start: Window start (normally now)
+            end: Window end
+            
+        Returns:
+            Matching alerts sorted by scheduled time
+        """
+        first_bucket = self._hour_bucket(start)
+        
+        # Windows never start in the past, so buckets before the current hour are dead
+        if self._pruned_before is None or first_bucket > self._pruned_before:
+            for bucket in [b for b in list(self._alerts_by_hour) if b < first_bucket]:
+                self._alerts_by_hour.pop(bucket, None)
+            self._pruned_before = first_bucket
+        
+        # Walk the existing buckets, not every hour in the window: a client-supplied
+        # window can span far more hours than there are scheduled doses
+        alerts = []
+        for bucket, alert_ids in list(self._alerts_by_hour.items()):
+            if not first_bucket <= bucket <= end:
+                continue
+            for alert_id in alert_ids:
+                alert = self.alerts[alert_id]
+                if alert.status == MedicineAlertStatus.PENDING and start <= alert.scheduled_time <= end:
+                    alerts.append(alert)
+        
+        return sorted(alerts, key=lambda a: a.scheduled_time)
     
     def get_pending_alerts(self, within_hours: int = 1) -> List[Dict]:
         """Get alerts due within next N hours"""
         now = datetime.now()
         cutoff = now + timedelta(hours=within_hours)
         
-        pending = []
-        for alert in self.alerts.values():
-            if (alert.status == MedicineAlertStatus.PENDING and 
-                now <= alert.scheduled_time <= cutoff):
-                pending.append(alert.to_dict())
-        
-        return sorted(pending, key=lambda x: x["scheduled_time"])
+        return [alert.to_dict() for alert in self._pending_alerts_between(now, cutoff)]
     
     def send_alert(self, alert_id: str) -> Dict:
         """Mark alert as sent (trigger notification to nurse)"""
@@ -535,9 +587,12 @@ class PrescriptionScanner:
             f"🔔 Alert sent: {alert.medicine_name} ({alert.dosage}) for {alert.patient_name} due at {alert.scheduled_time.strftime('%H:%M')}"
         )
         
+        alert_dict = alert.to_dict()
+        alert_events.publish("medicine_alerts", "sent", alert_dict)
+        
         return {
             "success": True,
-            "alert": alert.to_dict(),
+            "alert": alert_dict,
             "message": f"Alert sent for {alert.medicine_name}"
         }
     
@@ -556,7 +611,10 @@ class PrescriptionScanner:
             f"👍 Alert acknowledged by {acknowledged_by}: {alert.medicine_name} for {alert.patient_name}"
         )
         
-        return {"success": True, "alert": alert.to_dict()}
+        alert_dict = alert.to_dict()
+        alert_events.publish("medicine_alerts", "acknowledged", alert_dict)
+        
+        return {"success": True, "alert": alert_dict}
     
     def confirm_medicine_given(self, alert_id: str, given_by: str, notes: str = "") -> Dict:
         """Nurse confirms medicine was given to patient"""
@@ -574,9 +632,12 @@ class PrescriptionScanner:
             f"✅ Medicine confirmed: {alert.medicine_name} ({alert.dosage}) given to {alert.patient_name} by {given_by}"
         )
         
+        alert_dict = alert.to_dict()
+        alert_events.publish("medicine_alerts", "given", alert_dict)
+        
         return {
             "success": True,
-            "alert": alert.to_dict(),
+            "alert": alert_dict,
             "message": f"Medicine administration confirmed for {alert.patient_name}"
         }
     
@@ -594,25 +655,40 @@ class PrescriptionScanner:
             f"⚠️ Medicine MISSED: {alert.medicine_name} for {alert.patient_name}. Reason: {reason}"
         )
         
-        return {"success": True, "alert": alert.to_dict()}
+        alert_dict = alert.to_dict()
+        alert_events.publish("medicine_alerts", "missed", alert_dict)
+        
+        return {"success": True, "alert": alert_dict}
     
-    def get_patient_medicine_history(self, patient_id: str) -> Dict:
-        """Get medicine administration history for patient"""
-        patient_alerts = [a.to_dict() for a in self.alerts.values() 
-                         if a.patient_id == patient_id]
+    def get_patient_medicine_summary(self, patient_id: str) -> Dict:
+        """Get medicine administration counts and compliance for patient"""
+        statuses = [self.alerts[alert_id].status for alert_id in self._alerts_by_patient.get(patient_id, [])]
         
-        given = [a for a in patient_alerts if a["status"] == "Given"]
-        missed = [a for a in patient_alerts if a["status"] == "Missed"]
-        pending = [a for a in patient_alerts if a["status"] in ["Pending", "Alert Sent", "Acknowledged"]]
+        given = statuses.count(MedicineAlertStatus.GIVEN)
+        missed = statuses.count(MedicineAlertStatus.MISSED)
+        pending = len(statuses) - given - missed
         
         return {
             "patient_id": patient_id,
-            "total_scheduled": len(patient_alerts),
-            "given": len(given),
-            "missed": len(missed),
-            "pending": len(pending),
-            "compliance_rate": (len(given) / len(patient_alerts) * 100) if patient_alerts else 100,
-            "history": sorted(patient_alerts, key=lambda x: x["scheduled_time"], reverse=True)
+            "total_scheduled": len(statuses),
+            "given": given,
+            "missed": missed,
+            "pending": pending,
+            "compliance_rate": (given / len(statuses) * 100) if statuses else 100
+        }
+    
+    def iter_patient_medicine_history(self, patient_id: str) -> Iterator[Dict]:
+        """Yield a patient's medicine alerts, latest scheduled first"""
+        alerts = sorted((self.alerts[alert_id] for alert_id in self._alerts_by_patient.get(patient_id, [])),
+                        key=lambda a: a.scheduled_time, reverse=True)
+        for alert in alerts:
+            yield alert.to_dict()
+    
+    def get_patient_medicine_history(self, patient_id: str) -> Dict:
+        """Get medicine administration history for patient"""
+        return {
+            **self.get_patient_medicine_summary(patient_id),
+            "history": list(self.iter_patient_medicine_history(patient_id))
         }
     
     def get_prescription(self, prescription_id: str) -> Optional[Dict]:
@@ -621,19 +697,26 @@ class PrescriptionScanner:
             return self.prescriptions[prescription_id].to_dict()
         return None
     
+    def iter_patient_prescriptions(self, patient_id: str) -> Iterator[Dict]:
+        """Yield prescriptions for a patient"""
+        for p in list(self.prescriptions.values()):
+            if p.patient_id == patient_id:
+                yield p.to_dict()
+    
     def get_patient_prescriptions(self, patient_id: str) -> List[Dict]:
         """Get all prescriptions for a patient"""
-        return [p.to_dict() for p in self.prescriptions.values() 
-                if p.patient_id == patient_id]
+        return list(self.iter_patient_prescriptions(patient_id))
     
     def check_and_send_due_alerts(self) -> List[Dict]:
         """Check for alerts due in 1 hour and send them"""
-        due_alerts = self.get_pending_alerts(within_hours=1)
+        now = datetime.now()
+        cutoff = now + timedelta(hours=1)
+        due_ids = [alert.alert_id for alert in self._pending_alerts_between(now, cutoff)]
         sent_alerts = []
         
-        for alert_dict in due_alerts:
-            alert_id = alert_dict["alert_id"]
-            if self.alerts[alert_id].status == MedicineAlertStatus.PENDING:
+        # One state write for the whole batch instead of one per alert
+        with hospital_state.batch():
+            for alert_id in due_ids:
                 result = self.send_alert(alert_id)
                 if result["success"]:
                     sent_alerts.append(result["alert"])
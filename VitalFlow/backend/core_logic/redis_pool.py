@@ -0,0 +1,65 @@
+"""
+Shared Redis connection pool.
+The response cache and hospital state both talk to Redis on the request path.
+They share one bounded connection pool per URL, so a worker reuses warm
+connections and does not open a new TCP connection for each command.
+When every connection is busy, callers wait for one to be released instead
+of failing with "Too many connections".
+"""
+import os
+from threading import Lock
+from typing import Dict, Optional
+
+try:
+    import redis
+    from redis.exceptions import RedisError
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+    class RedisError(Exception):
+        """Stand-in so callers can catch Redis failures without redis installed."""
+
+
+# Upper bound on open connections per worker process (sized like the API thread pool)
+REDIS_MAX_CONNECTIONS = int(os.getenv("REDIS_MAX_CONNECTIONS", os.getenv("THREADPOOL_SIZE", "100")))
+# Seconds to wait for a free pooled connection before raising
+REDIS_POOL_TIMEOUT = float(os.getenv("REDIS_POOL_TIMEOUT", "5"))
+
+_clients: Dict[str, "redis.Redis"] = {}
+_lock = Lock()
+
+
+def get_redis_client(redis_url: Optional[str] = None) -> Optional["redis.Redis"]:
+    """
+    Get the shared Redis client for a URL, creating its pool on first use.
+
+    Args:
+        redis_url: Redis URL (defaults to REDIS_URL env var)
+
+    Returns:
+        Redis client backed by the shared pool, or None if Redis is not
+        configured, not installed or not reachable
+    """
+    redis_url = redis_url if redis_url is not None else os.getenv("REDIS_URL")
+    if not redis_url or not REDIS_AVAILABLE:
+        return None
+
+    with _lock:
+        client = _clients.get(redis_url)
+        if client is None:
+            pool = redis.BlockingConnectionPool.from_url(
+                redis_url, max_connections=REDIS_MAX_CONNECTIONS, timeout=REDIS_POOL_TIMEOUT
+            )
+            client = redis.Redis(connection_pool=pool)
+            client.ping()  # Fail fast so callers can fall back to local storage
+            _clients[redis_url] = client
+        return client
+
+
+def close_redis_clients() -> None:
+    """Disconnect all pooled connections (call on shutdown)."""
+    with _lock:
+        for client in _clients.values():
+            client.connection_pool.disconnect()
+        _clients.clear()
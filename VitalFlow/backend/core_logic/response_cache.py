@@ -0,0 +1,318 @@
+"""
+Response cache for hot read endpoints.
+Dashboard and list endpoints are polled continuously by the frontends, and each
+poll walks every patient/bed/staff record. This keeps short-lived copies of the
+endpoint results so repeated polls are answered straight from memory.
+
+Uses Redis when REDIS_URL is set and the redis package is installed, otherwise
+falls back to an in-process store (single worker / hackathon mode).
+"""
+import sys
+import json
+import time
+import asyncio
+import functools
+from itertools import islice
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+from threading import Lock
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from .redis_pool import get_redis_client
+
+
+# Expiry policies (seconds)
+SHORT_TTL = 5      # Dashboard - changes every agent cycle
+NORMAL_TTL = 10    # Patient / bed / staff lists
+LONG_TTL = 600     # Protocols, price list - effectively static
+
+# Namespaces derived from hospital_state, invalidated whenever patients, beds or staff change
+PATIENT_CACHE_NAMESPACES = ("dashboard", "patients", "beds", "staff")
+
+
+class ResponseCache:
+    """
+    Namespaced TTL cache for endpoint results.
+    Each endpoint caches under its own namespace so a patient mutation
+    does not evict unrelated entries like the price list.
+    """
+
+    # Own subprefix: clear() with no namespaces wipes KEY_PREFIX:*, which must not
+    # reach other vf:* keys such as the shared hospital state (vf:state:*)
+    KEY_PREFIX = "vf:cache"
+    # In-memory backend: max entries across namespaces; keys include query arguments,
+    # so without a cap the store grows with every distinct doctor, patient or window
+    MEMORY_MAX_ENTRIES = 4096
+
+    def __init__(self, redis_url: Optional[str] = None):
+        """Initialize cache, connecting to Redis if configured."""
+        self._lock = Lock()
+        self._store: Dict[str, Dict[str, Tuple[float, Any]]] = {}
+        self._size = 0  # Entries in _store
+        self._redis = None
+
+        try:
+            self._redis = get_redis_client(redis_url)
+        except Exception as e:
+            print(f"Warning: Redis unavailable, using in-memory cache: {e}")
+
+    @property
+    def backend(self) -> str:
+        """Name of the active storage backend."""
+        return "redis" if self._redis is not None else "memory"
+
+    def _redis_key(self, namespace: str, key: str) -> str:
+        return f"{self.KEY_PREFIX}:{namespace}:{key}"
+
+    @staticmethod
+    def make_key(func: Callable, args: tuple, kwargs: dict) -> str:
+        """Build the cache key for a call from the function name and its arguments."""
+        key = func.__name__
+        if args or kwargs:
+            key += ":" + repr((args, sorted(kwargs.items())))
+        return key
+
+    def get(self, namespace: str, key: str, raw: bool = False) -> Optional[Any]:
+        """
+        Get a cached value.
+
+        Args:
+            namespace: Cache namespace (usually the endpoint group)
+            key: Key within the namespace
+            raw: Value was stored as bytes (skip JSON decoding on Redis)
+
+        Returns:
+            Cached value or None if missing/expired
+        """
+        if self._redis is not None:
+            try:
+                data = self._redis.get(self._redis_key(namespace, key))
+                if data is None or raw:
+                    return data
+                return json.loads(data)
+            except Exception:
+                return None
+
+        entry = self._store.get(namespace, {}).get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            return None
+        return value
+
+    def set(self, namespace: str, key: str, value: Any, expire: int = NORMAL_TTL,
+            raw: bool = False) -> None:
+        """
+        Store a value under namespace/key for `expire` seconds.
+
+        Args:
+            namespace: Cache namespace
+            key: Key within the namespace
+            value: JSON-serializable value (or bytes when raw=True)
+            expire: Time to live in seconds
+            raw: Store bytes as-is (e.g. an already rendered response body)
+        """
+        if self._redis is not None:
+            try:
+                self._redis.setex(self._redis_key(namespace, key), expire,
+                                  value if raw else json.dumps(value, default=str))
+            except Exception:
+                pass
+            return
+
+        with self._lock:
+            entries = self._store.setdefault(namespace, {})
+            # Re-insert at the end so each namespace stays ordered oldest write first
+            if entries.pop(key, None) is None:
+                self._size += 1
+            entries[key] = (time.monotonic() + expire, value)
+            if self._size > self.MEMORY_MAX_ENTRIES:
+                self._evict()
+
+    def _evict(self) -> None:
+        """
+        Shrink the in-memory store once it exceeds MEMORY_MAX_ENTRIES (caller holds the lock).
+        Expired entries go first; if that leaves more than 3/4 of the cap, the oldest
+        writes of the largest namespaces are dropped down to it, so the sweep runs
+        once per batch of inserts rather than on every insert.
+        """
+        now = time.monotonic()
+        for ns, entries in list(self._store.items()):
+            expired = [k for k, (expires_at, _) in entries.items() if expires_at < now]
+            for k in expired:
+                del entries[k]
+            self._size -= len(expired)
+            if not entries:
+                del self._store[ns]
+
+        target = self.MEMORY_MAX_ENTRIES * 3 // 4
+        while self._size > target:
+            ns, entries = max(self._store.items(), key=lambda item: len(item[1]))
+            for k in list(islice(entries, min(len(entries), self._size - target))):
+                del entries[k]
+                self._size -= 1
+            if not entries:
+                del self._store[ns]
+
+    def clear(self, *namespaces: str) -> None:
+        """
+        Invalidate one or more namespaces (all namespaces if none given).
+
+        Args:
+            namespaces: Namespaces to clear
+        """
+        if self._redis is not None:
+            try:
+                patterns = [f"{self.KEY_PREFIX}:{ns}:*" for ns in namespaces] or [f"{self.KEY_PREFIX}:*"]
+                for pattern in patterns:
+                    keys = list(self._redis.scan_iter(match=pattern))
+                    if keys:
+                        self._redis.delete(*keys)
+            except Exception:
+                pass
+            return
+
+        with self._lock:
+            if not namespaces:
+                self._store.clear()
+                self._size = 0
+            for ns in namespaces:
+                self._size -= len(self._store.pop(ns, ()))
+
+    def cached(self, namespace: str, expire: int = NORMAL_TTL) -> Callable:
+        """
+        Decorator caching an endpoint's return value.
+        The cache key is built from the endpoint name and its arguments,
+        so `/api/beds/available?bed_type=ICU` and `?bed_type=General` are separate entries.
+        Works on both sync and async endpoints; for async ones, Redis lookups and
+        stores run in a worker thread so a slow Redis never blocks the event loop.
+        The namespace may reference keyword arguments, e.g. "report:{patient_id}",
+        so one patient's entries can be invalidated without touching the others.
+
+        Args:
+            namespace: Namespace to cache under (used for invalidation)
+            expire: Time to live in seconds
+
+        Returns:
+            Decorator
+        """
+        def decorator(func: Callable) -> Callable:
+            if asyncio.iscoroutinefunction(func):
+                @functools.wraps(func)
+                async def async_wrapper(*args, **kwargs):
+                    ns = namespace.format(**kwargs)
+                    key = self.make_key(func, args, kwargs)
+                    offload = self._redis is not None  # Memory lookups are cheap enough for the loop
+                    if offload:
+                        value = await asyncio.to_thread(self.get, ns, key)
+                    else:
+                        value = self.get(ns, key)
+                    if value is not None:
+                        return value
+
+                    value = await func(*args, **kwargs)
+                    if offload:
+                        await asyncio.to_thread(self.set, ns, key, value, expire)
+                    else:
+                        self.set(ns, key, value, expire)
+                    return value
+                return async_wrapper
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                ns = namespace.format(**kwargs)
+                key = self.make_key(func, args, kwargs)
+                value = self.get(ns, key)
+                if value is not None:
+                    return value
+
+                value = func(*args, **kwargs)
+                self.set(ns, key, value, expire)
+                return value
+            return wrapper
+        return decorator
+
+
+# Singleton instance
+response_cache = ResponseCache()
+
+
+# ============== UNIT TESTS ==============
+if __name__ == "__main__":
+    print("Testing ResponseCache...")
+
+    cache = ResponseCache(redis_url="")
+    print(f"✓ Backend: {cache.backend}")
+
+    calls = []
+
+    @cache.cached("patients", expire=NORMAL_TTL)
+    def list_patients(limit: int = 10):
+        calls.append(limit)
+        return {"patients": list(range(limit))}
+
+    assert list_patients(limit=3) == {"patients": [0, 1, 2]}
+    assert list_patients(limit=3) == {"patients": [0, 1, 2]}
+    assert calls == [3], "Second call should be served from cache"
+    print("✓ Repeated call served from cache")
+
+    list_patients(limit=5)
+    assert calls == [3, 5], "Different arguments should miss the cache"
+    print("✓ Arguments are part of the cache key")
+
+    cache.set("price_list", "all", {"items": 1}, expire=LONG_TTL)
+    cache.clear("patients")
+    list_patients(limit=3)
+    assert calls == [3, 5, 3], "Cleared namespace should recompute"
+    assert cache.get("price_list", "all") == {"items": 1}, "Other namespaces must survive"
+    print("✓ Namespace invalidation is isolated")
+
+    report_calls = []
+
+    @cache.cached("report:{patient_id}", expire=NORMAL_TTL)
+    def get_report(patient_id: str):
+        report_calls.append(patient_id)
+        return {"patient_id": patient_id}
+
+    get_report(patient_id="P1"); get_report(patient_id="P2")
+    cache.clear("report:P1")
+    get_report(patient_id="P1"); get_report(patient_id="P2")
+    assert report_calls == ["P1", "P2", "P1"], "Only P1's namespace should be invalidated"
+    print("✓ Per-argument namespaces")
+
+    async_calls = []
+
+    @cache.cached("dashboard", expire=SHORT_TTL)
+    async def dashboard():
+        async_calls.append(1)
+        return {"ok": True}
+
+    assert asyncio.run(dashboard()) == {"ok": True}
+    assert asyncio.run(dashboard()) == {"ok": True}
+    assert async_calls == [1], "Async endpoints should be cached too"
+    print("✓ Async endpoint cached")
+
+    cache.set("stock", "body", b'{"medicines":[]}', raw=True)
+    assert cache.get("stock", "body", raw=True) == b'{"medicines":[]}'
+    print("✓ Raw bytes round-trip")
+
+    cache.set("dashboard", "x", {"v": 1}, expire=0)
+    time.sleep(0.01)
+    assert cache.get("dashboard", "x") is None, "Expired entries should miss"
+    print("✓ Entries expire after TTL")
+
+    small = ResponseCache(redis_url="")
+    small.MEMORY_MAX_ENTRIES = 8
+    small.set("doctor:D0", "old", 1, expire=0)
+    time.sleep(0.01)
+    for i in range(8):
+        small.set("alerts", f"k{i}", i)
+    assert "doctor:D0" not in small._store, "Expired entries should be swept"
+    assert small._size == 6, "Sweep should shrink the store to 3/4 of the cap"
+    assert small.get("alerts", "k0") is None and small.get("alerts", "k7") == 7, "Oldest writes go first"
+    print("✓ In-memory store is bounded")
+
+    print("\n✅ All ResponseCache tests passed!")
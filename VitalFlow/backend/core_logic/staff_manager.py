@@ -3,6 +3,7 @@ Staff management with fatigue tracking.
 Ensures patient safety by preventing overworked staff from handling critical cases.
 """
 import sys
+import time
 from pathlib import Path
 from typing import Optional, List, Dict
 from datetime import datetime, timedelta
@@ -27,6 +28,15 @@ class StaffManager:
     MAX_PATIENTS_PER_DOCTOR = StaffConfig.MAX_PATIENTS_PER_DOCTOR  # 5
     MAX_PATIENTS_PER_NURSE = StaffConfig.MAX_PATIENTS_PER_NURSE    # 8
     
+    # Fatigue depends on the clock as well as the state, so a memoized
+    # status summary is also recomputed once it is this old
+    SUMMARY_MAX_AGE_SECONDS = 30
+    
+    def __init__(self):
+        self._summary: Dict = {}
+        self._summary_version = -1
+        self._summary_time = 0.0
+    
     def punch_in(self, staff_id: str) -> bool:
         """
         Record staff starting their shift.
@@ -484,9 +494,18 @@ class StaffManager:
         """
         Get summary of staff status by role.
         
+        Reused until the next hospital_state.save() or for at most
+        SUMMARY_MAX_AGE_SECONDS, whichever comes first.
+        
         Returns:
             Dictionary with staff statistics
         """
+        version = hospital_state.version
+        now = time.monotonic()
+        if (self._summary_version == version
+                and now - self._summary_time < self.SUMMARY_MAX_AGE_SECONDS):
+            return self._summary
+        
         summary = {
             "doctors": {"total": 0, "available": 0, "fatigued": 0},
             "nurses": {"total": 0, "available": 0, "fatigued": 0},
@@ -518,6 +537,9 @@ class StaffManager:
                     "warning": warning
                 })
         
+        self._summary = summary
+        self._summary_version = version
+        self._summary_time = now
         return summary
 
 
@@ -1,19 +1,72 @@
 """
 Central state store for the hospital.
 Uses a simple in-memory store with JSON persistence for hackathon.
+When REDIS_URL is set, state is also mirrored to Redis hashes so multiple
+API workers share one view of patients, beds and staff.
+The patient, bed and staff maps are copy-on-write: inserts and deletes swap
+in a new dict, so readers iterate them without locks.
 Implements Singleton pattern for global state access.
 """
 import json
 import sys
+import time
+import itertools
 from pathlib import Path
 from typing import Dict, List, Optional, Any
-from threading import Lock
+from threading import Lock, local
+from contextlib import contextmanager
 from datetime import datetime
+from dataclasses import dataclass
+
+import numpy as np
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from shared.models import Patient, Bed, Staff, Hospital, PatientStatus, BedType, StaffRole
+from .redis_pool import get_redis_client
+
+try:
+    from redis.exceptions import WatchError
+except ImportError:
+    WatchError = None
+
+
+# Integer codes for PatientStatus used in column arrays (index into list(PatientStatus))
+PATIENT_STATUS_CODES = {status: code for code, status in enumerate(PatientStatus)}
+
+
+@dataclass
+class PatientTable:
+    """
+    Column-oriented (structure-of-arrays) snapshot of patient vitals.
+    Row i of every column belongs to patients[i], so vitals scans can run
+    as single NumPy expressions instead of per-patient attribute access.
+    """
+    patients: List[Patient]
+    status: np.ndarray       # uint8 codes from PATIENT_STATUS_CODES
+    spo2: np.ndarray         # float64 (exact threshold comparisons)
+    heart_rate: np.ndarray   # int16
+    temperature: np.ndarray  # float64
+    has_bed: np.ndarray      # bool
+    has_doctor: np.ndarray   # bool
+    diagnoses: List[str]
+    
+    def __len__(self) -> int:
+        return len(self.patients)
+
+
+@dataclass(frozen=True)
+class StateSnapshot:
+    """
+    Entity maps as of one moment. The maps are never changed in place
+    (writers replace them), so membership stays fixed for the snapshot's life;
+    the entities themselves are the live objects.
+    """
+    version: int
+    patients: Dict[str, Patient]
+    beds: Dict[str, Bed]
+    staff: Dict[str, Staff]
 
 
 class HospitalState:
@@ -24,6 +77,12 @@ class HospitalState:
     _instance = None
     _lock = Lock()
     
+    # Redis layout: one hash per entity type (id -> JSON) plus a version counter
+    REDIS_PREFIX = "vf:state"
+    REDIS_ENTITIES = ("patients", "beds", "staff")
+    SYNC_INTERVAL = 1.0  # Seconds between version checks (local copy acts as L1 cache)
+    SAVE_RETRIES = 5     # Attempts when another worker bumps the version mid-save
+    
     def __new__(cls):
         if cls._instance is None:
             with cls._lock:
@@ -41,36 +100,68 @@ class HospitalState:
         self.decision_log: List[dict] = []
         self.hospital = Hospital()
         
+        # Bumped on every save(); derived counters are recomputed only when it changes
+        self.version = 0
+        self._counts: Dict[str, Dict] = {}
+        self._counts_version = -1
+        self._free_beds: Dict[BedType, List[Bed]] = {}
+        self._free_beds_version = -1
+        
+        # Per-thread save() batching (see batch())
+        self._batch = local()
+        
+        # Serializes copy-on-write swaps of the entity maps
+        self._write_lock = Lock()
+        
+        # Monotonic id sequences for admissions and new staff
+        self._id_seq = {"patients": itertools.count(1), "staff": itertools.count(1)}
+        
         # File path for persistence
         self.state_file = Path(__file__).parent.parent.parent / "shared" / "state.json"
         self.state_file.parent.mkdir(parents=True, exist_ok=True)
         
-        # Try to load existing state
-        self._load_state()
+        # Optional shared store for multi-worker deployments
+        self._redis = None
+        self._redis_version = None
+        # Last JSON written to / read from Redis per entity id; saves only send ids whose JSON differs
+        self._redis_shadow: Dict[str, Dict[str, str]] = {entity: {} for entity in self.REDIS_ENTITIES}
+        self._last_sync = 0.0
+        try:
+            self._redis = get_redis_client()
+        except Exception as e:
+            print(f"Warning: Redis unavailable, using local state: {e}")
+        
+        # Try to load existing state (shared store first, then JSON file)
+        if not self._load_from_redis():
+            self._load_state()
     
     def _load_state(self) -> bool:
         """Load state from JSON file if exists"""
         try:
             if self.state_file.exists():
                 data = json.loads(self.state_file.read_text())
+                patients, beds, staff = {}, {}, {}
                 
                 # Reconstruct Patient objects
                 for pid, pdata in data.get("patients", {}).items():
                     if isinstance(pdata.get("status"), str):
                         pdata["status"] = PatientStatus(pdata["status"])
-                    self.patients[pid] = Patient(**pdata)
+                    patients[pid] = Patient(**pdata)
                 
                 # Reconstruct Bed objects
                 for bid, bdata in data.get("beds", {}).items():
                     if isinstance(bdata.get("bed_type"), str):
                         bdata["bed_type"] = BedType(bdata["bed_type"])
-                    self.beds[bid] = Bed(**bdata)
+                    beds[bid] = Bed(**bdata)
                 
                 # Reconstruct Staff objects
                 for sid, sdata in data.get("staff", {}).items():
                     if isinstance(sdata.get("role"), str):
                         sdata["role"] = StaffRole(sdata["role"])
-                    self.staff[sid] = Staff(**sdata)
+                    staff[sid] = Staff(**sdata)
+                
+                with self._write_lock:
+                    self.patients, self.beds, self.staff = patients, beds, staff
                 
                 self.decision_log = data.get("decision_log", [])
                 return True
@@ -78,10 +169,153 @@ class HospitalState:
             print(f"Warning: Could not load state: {e}")
         return False
     
+    def _load_from_redis(self) -> bool:
+        """Replace local state with the shared Redis copy (single pipelined round-trip)"""
+        if self._redis is None:
+            return False
+        try:
+            pipe = self._redis.pipeline()
+            pipe.get(f"{self.REDIS_PREFIX}:version")
+            for entity in self.REDIS_ENTITIES:
+                pipe.hgetall(f"{self.REDIS_PREFIX}:{entity}")
+            pipe.get(f"{self.REDIS_PREFIX}:decision_log")
+            version, patients, beds, staff, decision_log = pipe.execute()
+            if version is None:
+                return False
+            
+            # Swap in fresh maps so requests iterating the old ones are unaffected
+            shadows = [
+                {key.decode(): value.decode() for key, value in raw.items()}
+                for raw in (patients, beds, staff)
+            ]
+            loaded = [
+                {key: model(**json.loads(value)) for key, value in shadow.items()}
+                for model, shadow in zip((Patient, Bed, Staff), shadows)
+            ]
+            with self._write_lock:
+                self.patients, self.beds, self.staff = loaded
+            self.decision_log[:] = json.loads(decision_log) if decision_log else []
+            
+            self._redis_shadow = dict(zip(self.REDIS_ENTITIES, shadows))
+            self._redis_version = version
+            self.version += 1
+            return True
+        except Exception as e:
+            print(f"Warning: Could not load state from Redis: {e}")
+            return False
+    
+    def _redis_changes(self) -> Dict[str, tuple]:
+        """
+        Diff local state against the last copy exchanged with Redis.
+        
+        Returns:
+            Entity type -> (changed id -> JSON, removed ids)
+        """
+        changes = {}
+        for entity in self.REDIS_ENTITIES:
+            shadow = self._redis_shadow[entity]
+            container = getattr(self, entity)
+            changed = {}
+            for key, value in container.items():
+                encoded = json.dumps(value.dict(), default=str)
+                if shadow.get(key) != encoded:
+                    changed[key] = encoded
+            changes[entity] = (changed, [key for key in shadow if key not in container])
+        return changes
+    
+    def _save_to_redis(self) -> None:
+        """
+        Write this worker's changes to Redis in one transaction.
+        Only entities changed or removed since the last sync are sent. The
+        write is guarded by WATCH on the version counter: if another worker
+        saved since this one last synced, ids it also changed are left alone
+        (its newer copy wins and reaches this worker on the next sync()).
+        """
+        version_key = f"{self.REDIS_PREFIX}:version"
+        changes = self._redis_changes()
+        with self._redis.pipeline() as pipe:
+            for _ in range(self.SAVE_RETRIES):
+                try:
+                    pipe.watch(version_key)
+                    current = pipe.get(version_key)
+                    stale = current != self._redis_version
+                    writes = {}
+                    for entity, (changed, removed) in changes.items():
+                        shadow = self._redis_shadow[entity]
+                        if stale and (changed or removed):
+                            # Drop ids another worker rewrote since our copy was taken
+                            ids = [*changed, *removed]
+                            remote = pipe.hmget(f"{self.REDIS_PREFIX}:{entity}", ids)
+                            conflicts = {
+                                key for key, value in zip(ids, remote)
+                                if (value.decode() if value is not None else None) != shadow.get(key)
+                            }
+                            if conflicts:
+                                print(f"Warning: skipped stale {entity} writes: {sorted(conflicts)}")
+                            changed = {k: v for k, v in changed.items() if k not in conflicts}
+                            removed = [k for k in removed if k not in conflicts]
+                        writes[entity] = (changed, removed)
+                    
+                    pipe.multi()
+                    for entity, (changed, removed) in writes.items():
+                        key = f"{self.REDIS_PREFIX}:{entity}"
+                        if removed:
+                            pipe.hdel(key, *removed)
+                        if changed:
+                            pipe.hset(key, mapping=changed)
+                    pipe.set(f"{self.REDIS_PREFIX}:decision_log", json.dumps(self.decision_log[-50:], default=str))
+                    pipe.incr(version_key)
+                    new_version = pipe.execute()[-1]
+                    break
+                except WatchError:
+                    continue
+            else:
+                raise RuntimeError("state changed concurrently too often, save not written")
+        
+        for entity, (changed, removed) in writes.items():
+            shadow = self._redis_shadow[entity]
+            shadow.update(changed)
+            for key in removed:
+                shadow.pop(key, None)
+        # A stale worker keeps its old version so the next sync() pulls the other writes
+        if not stale:
+            self._redis_version = str(new_version).encode()
+    
+    def sync(self) -> bool:
+        """
+        Pull state written by other workers, if it changed.
+        No-op without Redis; checks the shared version at most once per SYNC_INTERVAL.
+        
+        Returns:
+            True if local state was reloaded
+        """
+        if not self.sync_due():
+            return False
+        self._last_sync = time.monotonic()
+        try:
+            if self._redis.get(f"{self.REDIS_PREFIX}:version") == self._redis_version:
+                return False
+        except Exception:
+            return False
+        with self._lock:
+            return self._load_from_redis()
+    
+    def sync_due(self) -> bool:
+        """True if sync() would query Redis now (cheap, no I/O)"""
+        return self._redis is not None and time.monotonic() - self._last_sync >= self.SYNC_INTERVAL
+    
     def save(self) -> bool:
-        """Persist state to JSON for frontend to read"""
+        """Persist state to JSON for frontend to read (and to Redis when configured)"""
         with self._lock:
+            self.version += 1
+            if getattr(self._batch, "depth", 0):
+                # Inside batch(): write once when the outermost block exits
+                self._batch.pending = True
+                return True
             try:
+                if self._redis is not None:
+                    self._save_to_redis()
+                
                 data = {
                     "timestamp": datetime.now().isoformat(),
                     "patients": {k: v.dict() for k, v in self.patients.items()},
@@ -96,6 +330,23 @@ class HospitalState:
                 print(f"Error saving state: {e}")
                 return False
     
+    @contextmanager
+    def batch(self):
+        """
+        Group several mutations into a single save().
+        save() calls made by this thread inside the block only bump the version;
+        state is persisted once when the outermost block exits.
+        """
+        depth = getattr(self._batch, "depth", 0)
+        self._batch.depth = depth + 1
+        try:
+            yield self
+        finally:
+            self._batch.depth = depth
+            if depth == 0 and getattr(self._batch, "pending", False):
+                self._batch.pending = False
+                self.save()
+    
     def log_decision(self, action: str, reason: str, details: dict = None) -> None:
         """
         Log an AI decision for transparency.
@@ -115,25 +366,80 @@ class HospitalState:
         # Auto-save after each decision
         self.save()
     
+    def get_counts(self, snap: Optional[StateSnapshot] = None) -> Dict[str, Dict]:
+        """
+        Get entity counters (beds by type, occupied beds by type, patients by status).
+        Counted in a single pass and reused until the next save(), so repeated
+        dashboard reads between mutations are O(1).
+        
+        Args:
+            snap: Snapshot to count (defaults to a fresh one)
+        """
+        snap = snap or self.snapshot()
+        if self._counts_version != snap.version:
+            beds_total = {bed_type: 0 for bed_type in BedType}
+            beds_occupied = {bed_type: 0 for bed_type in BedType}
+            for b in snap.beds.values():
+                if b.bed_type in beds_total:
+                    beds_total[b.bed_type] += 1
+                    if b.is_occupied:
+                        beds_occupied[b.bed_type] += 1
+            
+            patients_by_status = {status: 0 for status in PatientStatus}
+            for p in snap.patients.values():
+                if p.status in patients_by_status:
+                    patients_by_status[p.status] += 1
+            
+            self._counts = {
+                "beds_total": beds_total,
+                "beds_occupied": beds_occupied,
+                "patients_by_status": patients_by_status
+            }
+            self._counts_version = snap.version
+        return self._counts
+    
+    def get_free_beds(self, bed_type: Optional[BedType] = None) -> List[Bed]:
+        """
+        Get unoccupied beds, optionally of a single type.
+        Backed by a per-type index rebuilt once per save(), so the lookups made
+        while placing a patient touch only the free beds of the requested type.
+        
+        Args:
+            bed_type: Optional BedType to filter by
+            
+        Returns:
+            List of free Bed objects in insertion order
+        """
+        if self._free_beds_version != self.version:
+            free_beds = {t: [] for t in BedType}
+            for b in self.beds.values():
+                if not b.is_occupied and b.bed_type in free_beds:
+                    free_beds[b.bed_type].append(b)
+            self._free_beds = free_beds
+            self._free_beds_version = self.version
+        
+        if bed_type is not None:
+            return list(self._free_beds.get(bed_type, ()))
+        return [b for beds in self._free_beds.values() for b in beds]
+    
     def get_stats(self) -> dict:
-        """Get current hospital statistics"""
-        total_beds = len(self.beds)
-        occupied_beds = sum(1 for b in self.beds.values() if b.is_occupied)
+        """Get current hospital statistics (all figures from one snapshot)"""
+        snap = self.snapshot()
+        counts = self.get_counts(snap)
+        total_beds = len(snap.beds)
+        occupied_beds = sum(counts["beds_occupied"].values())
         
         stats_by_type = {}
         for bed_type in BedType:
-            beds_of_type = [b for b in self.beds.values() if b.bed_type == bed_type]
-            occupied = sum(1 for b in beds_of_type if b.is_occupied)
+            total = counts["beds_total"][bed_type]
+            occupied = counts["beds_occupied"][bed_type]
             stats_by_type[bed_type.value] = {
-                "total": len(beds_of_type),
+                "total": total,
                 "occupied": occupied,
-                "available": len(beds_of_type) - occupied
+                "available": total - occupied
             }
         
-        patients_by_status = {}
-        for status in PatientStatus:
-            count = sum(1 for p in self.patients.values() if p.status == status)
-            patients_by_status[status.value] = count
+        patients_by_status = {status.value: count for status, count in counts["patients_by_status"].items()}
         
         return {
             "total_beds": total_beds,
@@ -142,15 +448,75 @@ class HospitalState:
             "occupancy_rate": (occupied_beds / total_beds * 100) if total_beds > 0 else 0,
             "by_bed_type": stats_by_type,
             "patients_by_status": patients_by_status,
-            "total_patients": len(self.patients),
-            "total_staff": len(self.staff)
+            "total_patients": len(snap.patients),
+            "total_staff": len(snap.staff)
         }
     
+    def get_patient_table(self) -> PatientTable:
+        """Build a column-oriented snapshot of all current patients"""
+        patients = list(self.patients.values())
+        return PatientTable(
+            patients=patients,
+            status=np.fromiter((PATIENT_STATUS_CODES[p.status] for p in patients),
+                               dtype=np.uint8, count=len(patients)),
+            spo2=np.fromiter((p.spo2 for p in patients), dtype=np.float64, count=len(patients)),
+            heart_rate=np.fromiter((p.heart_rate for p in patients), dtype=np.int16, count=len(patients)),
+            temperature=np.fromiter((p.temperature for p in patients), dtype=np.float64, count=len(patients)),
+            has_bed=np.fromiter((bool(p.bed_id) for p in patients), dtype=bool, count=len(patients)),
+            has_doctor=np.fromiter((bool(p.assigned_doctor_id) for p in patients), dtype=bool, count=len(patients)),
+            diagnoses=[p.diagnosis for p in patients]
+        )
+    
+    def next_id(self, entity: str, prefix: str) -> str:
+        """
+        Generate a unique id such as "P-000042" for a new patient or staff member.
+        Uses a shared Redis counter when available so workers never collide,
+        otherwise a local counter; ids already in use are skipped.
+        
+        Args:
+            entity: "patients" or "staff"
+            prefix: Id prefix
+            
+        Returns:
+            Unused id
+        """
+        existing = getattr(self, entity)
+        while True:
+            if self._redis is not None:
+                seq = self._redis.incr(f"{self.REDIS_PREFIX}:seq:{entity}")
+            else:
+                seq = next(self._id_seq[entity])
+            new_id = f"{prefix}-{seq:06d}"
+            if new_id not in existing:
+                return new_id
+    
+    def snapshot(self) -> StateSnapshot:
+        """Get the current patient, bed and staff maps as one consistent view"""
+        with self._write_lock:
+            return StateSnapshot(self.version, self.patients, self.beds, self.staff)
+    
+    def _put(self, entity: str, key: str, value: Any) -> bool:
+        """Copy-on-write insert into an entity map; False if the key exists"""
+        with self._write_lock:
+            current = getattr(self, entity)
+            if key in current:
+                return False
+            setattr(self, entity, {**current, key: value})
+            return True
+    
+    def _discard(self, entity: str, key: str) -> bool:
+        """Copy-on-write delete from an entity map; False if the key is missing"""
+        with self._write_lock:
+            current = getattr(self, entity)
+            if key not in current:
+                return False
+            setattr(self, entity, {k: v for k, v in current.items() if k != key})
+            return True
+    
     def add_patient(self, patient: Patient) -> bool:
         """Add a new patient to the system"""
-        if patient.id in self.patients:
+        if not self._put("patients", patient.id, patient):
             return False
-        self.patients[patient.id] = patient
         self.save()
         return True
     
@@ -173,17 +539,15 @@ class HospitalState:
     
     def remove_patient(self, patient_id: str) -> bool:
         """Remove patient from system (discharge)"""
-        if patient_id in self.patients:
-            del self.patients[patient_id]
+        if self._discard("patients", patient_id):
             self.save()
             return True
         return False
     
     def add_bed(self, bed: Bed) -> bool:
         """Add a new bed to the system"""
-        if bed.id in self.beds:
+        if not self._put("beds", bed.id, bed):
             return False
-        self.beds[bed.id] = bed
         self.save()
         return True
     
@@ -193,9 +557,8 @@ class HospitalState:
     
     def add_staff(self, staff_member: Staff) -> bool:
         """Add a new staff member"""
-        if staff_member.id in self.staff:
+        if not self._put("staff", staff_member.id, staff_member):
             return False
-        self.staff[staff_member.id] = staff_member
         self.save()
         return True
     
@@ -205,9 +568,8 @@ class HospitalState:
     
     def clear_all(self) -> None:
         """Clear all state (for testing/reset)"""
-        self.patients.clear()
-        self.beds.clear()
-        self.staff.clear()
+        with self._write_lock:
+            self.patients, self.beds, self.staff = {}, {}, {}
         self.decision_log.clear()
         self.save()
     
@@ -289,6 +651,59 @@ if __name__ == "__main__":
     assert stats["total_beds"] == 1
     print(f"✓ Stats: {stats['total_patients']} patients, {stats['total_beds']} beds")
     
+    # Test counters refresh after a saved mutation
+    bed.is_occupied = True
+    state.save()
+    assert state.get_stats()["occupied_beds"] == 1
+    assert state.get_stats()["by_bed_type"]["ICU"]["available"] == 0
+    print("✓ Counters refresh after save")
+    
+    # Test free bed index follows saved mutations
+    assert state.get_free_beds(BedType.ICU) == []
+    bed.is_occupied = False
+    state.save()
+    assert [b.id for b in state.get_free_beds(BedType.ICU)] == [bed.id]
+    assert [b.id for b in state.get_free_beds()] == [bed.id]
+    assert state.get_free_beds(BedType.GENERAL) == []
+    print("✓ Free bed index refreshes after save")
+    
+    # Test batched saves write once
+    with state.batch():
+        state.log_decision("BATCH_1", "first")
+        state.log_decision("BATCH_2", "second")
+        assert "BATCH_1" not in state.state_file.read_text(), "Saves inside a batch are deferred"
+    assert "BATCH_2" in state.state_file.read_text()
+    print("✓ Batched saves persist once")
+    
+    # Test id generation skips ids in use
+    state._id_seq["patients"] = itertools.count(1)
+    state._put("patients", "P-000002", patient)
+    assert state.next_id("patients", "P") == "P-000001"
+    assert state.next_id("patients", "P") == "P-000003", "Ids already in use are skipped"
+    state._discard("patients", "P-000002")
+    print("✓ Generated ids are unique")
+    
+    # Test entity maps are copy-on-write
+    snap = state.snapshot()
+    state.add_patient(Patient(id="TEST-P002", name="Second", age=40, diagnosis="Test",
+                              status=PatientStatus.STABLE, spo2=97.0, heart_rate=70))
+    assert "TEST-P002" not in snap.patients and "TEST-P002" in state.patients
+    for pid in state.patients:  # Deleting while iterating the old map is safe
+        state.remove_patient("TEST-P002")
+    assert state.get_patient("TEST-P002") is None
+    print("✓ Snapshots are unaffected by later writes")
+
+    # Test shared state survives a full response cache clear (as /api/init does)
+    if state._redis is not None:
+        from .response_cache import response_cache
+        state.save()
+        response_cache.clear()
+        state._redis_version = None  # Force the next sync() to reload from Redis
+        state._last_sync = 0.0
+        assert state.sync(), "State keys must survive response_cache.clear()"
+        assert state.get_patient("TEST-P001") is not None
+        print("✓ Redis state survives response cache clear")
+
     # Test persistence
     assert state.save(), "Failed to save state"
     print("✓ State saved to JSON")
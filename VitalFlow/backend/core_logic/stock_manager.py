@@ -5,7 +5,7 @@ Auto-books medicines after medical staff verification.
 """
 import sys
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Iterator
 from datetime import datetime, timedelta
 from dataclasses import dataclass, field
 from enum import Enum
@@ -584,20 +584,26 @@ class StockManager:
         """Get all orders"""
         return [o.to_dict() for o in self.orders.values()]
     
+    def iter_usage_history(self, medicine_id: Optional[str] = None,
+                           days: int = 7) -> Iterator[Dict]:
+        """
+        Yield medicine usage entries, newest first.
+        usage_log is appended in time order, so this walks it backwards and
+        stops at the first entry older than the cutoff.
+        """
+        cutoff = (datetime.now() - timedelta(days=days)).isoformat()
+        
+        for u in reversed(self.usage_log):
+            if u["date"] <= cutoff:
+                break
+            if medicine_id and u["medicine_id"] != medicine_id:
+                continue
+            yield u
+    
     def get_usage_history(self, medicine_id: Optional[str] = None, 
                           days: int = 7) -> List[Dict]:
         """Get medicine usage history"""
-        cutoff = datetime.now() - timedelta(days=days)
-        
-        history = [
-            u for u in self.usage_log
-            if datetime.fromisoformat(u["date"]) > cutoff
-        ]
-        
-        if medicine_id:
-            history = [u for u in history if u["medicine_id"] == medicine_id]
-        
-        return sorted(history, key=lambda x: x["date"], reverse=True)
+        return list(self.iter_usage_history(medicine_id, days))
     
     def search_medicine(self, query: str) -> List[Dict]:
         """Search medicines by name or category"""
@@ -7,16 +7,68 @@ from pathlib import Path
 from typing import Dict, Optional, List
 from datetime import datetime
 
+import numpy as np
+
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from shared.models import Patient, Bed, PatientStatus, BedType
 from shared.constants import VitalThresholds, TriagePriority
 from shared.utils import get_enum_value
-from .state import hospital_state
+from shared.events import emit_patient_admitted, emit_vitals_critical, emit_vitals_warning
+from .state import hospital_state, PatientTable, PATIENT_STATUS_CODES
 from .bed_manager import bed_manager
 from .staff_manager import staff_manager
 
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+if NUMBA_AVAILABLE:
+    # Thresholds bound as module globals so Numba freezes them as constants
+    _SPO2_CRITICAL = VitalThresholds.SPO2_CRITICAL
+    _SPO2_LOW = VitalThresholds.SPO2_LOW
+    _HR_CRITICAL_LOW = VitalThresholds.HR_CRITICAL_LOW
+    _HR_CRITICAL_HIGH = VitalThresholds.HR_CRITICAL_HIGH
+    _HR_LOW = VitalThresholds.HR_LOW
+    _HR_HIGH = VitalThresholds.HR_HIGH
+    _TEMP_HIGH_FEVER = VitalThresholds.TEMP_HIGH_FEVER
+    _TEMP_FEVER = VitalThresholds.TEMP_FEVER
+    _TEMP_HYPOTHERMIA = VitalThresholds.TEMP_HYPOTHERMIA
+    
+    # Serial on purpose: rows are trivial, and parallel kernels called from several
+    # request threads at once abort the process under Numba's workqueue layer
+    @njit("int8[:](int8[:], float64[:], int16[:], float64[:], int8[:])", cache=True)
+    def _priority_kernel(base, spo2, heart_rate, temperature, diagnosis_cap):
+        """Compiled per-patient priority loop (same rules as calculate_priority)"""
+        n = base.shape[0]
+        out = np.empty(n, dtype=np.int8)
+        for i in range(n):
+            p = min(base[i], diagnosis_cap[i])
+            
+            if spo2[i] < _SPO2_CRITICAL:
+                p = 1
+            elif spo2[i] < _SPO2_LOW:
+                p = min(p, 2)
+            
+            if heart_rate[i] > _HR_CRITICAL_HIGH or heart_rate[i] < _HR_CRITICAL_LOW:
+                p = 1
+            elif heart_rate[i] > _HR_HIGH or heart_rate[i] < _HR_LOW:
+                p = min(p, 2)
+            
+            if temperature[i] >= _TEMP_HIGH_FEVER:
+                p = min(p, 2)
+            elif temperature[i] >= _TEMP_FEVER:
+                p = min(p, 3)
+            elif temperature[i] <= _TEMP_HYPOTHERMIA:
+                p = min(p, 2)
+            
+            out[i] = p
+        return out
+
 
 class TriageEngine:
     """
@@ -24,6 +76,29 @@ class TriageEngine:
     Core decision-making engine for patient flow.
     """
     
+    # Dangerous diagnosis keywords
+    CRITICAL_KEYWORDS = ('cardiac arrest', 'stroke', 'heart attack', 'trauma',
+                         'hemorrhage', 'respiratory failure', 'sepsis', 'anaphylaxis')
+    URGENT_KEYWORDS = ('chest pain', 'difficulty breathing', 'severe pain',
+                       'fracture', 'head injury', 'burns')
+    
+    # Status-based priority indexed by PATIENT_STATUS_CODES
+    STATUS_PRIORITY = np.array([
+        {PatientStatus.CRITICAL: 1, PatientStatus.SERIOUS: 2, PatientStatus.STABLE: 3,
+         PatientStatus.RECOVERING: 4}.get(status, 5)
+        for status in PATIENT_STATUS_CODES
+    ], dtype=np.int8)
+    
+    def _diagnosis_priority(self, diagnosis: str) -> int:
+        """Priority cap implied by diagnosis keywords (5 if none match)"""
+        if diagnosis:
+            diagnosis_lower = diagnosis.lower()
+            if any(kw in diagnosis_lower for kw in self.CRITICAL_KEYWORDS):
+                return 1
+            if any(kw in diagnosis_lower for kw in self.URGENT_KEYWORDS):
+                return 2
+        return 5
+    
     def calculate_priority(self, patient: Patient) -> int:
         """
         Calculate triage priority (1-5, 1 is most urgent).
@@ -82,20 +157,47 @@ class TriageEngine:
         
         # ========== SPECIAL CONDITIONS ==========
         # Check for dangerous diagnosis keywords
-        if patient.diagnosis:
-            diagnosis_lower = patient.diagnosis.lower()
-            critical_keywords = ['cardiac arrest', 'stroke', 'heart attack', 'trauma', 
-                               'hemorrhage', 'respiratory failure', 'sepsis', 'anaphylaxis']
-            urgent_keywords = ['chest pain', 'difficulty breathing', 'severe pain',
-                             'fracture', 'head injury', 'burns']
-            
-            if any(kw in diagnosis_lower for kw in critical_keywords):
-                priority = 1
-            elif any(kw in diagnosis_lower for kw in urgent_keywords):
-                priority = min(priority, 2)
+        priority = min(priority, self._diagnosis_priority(patient.diagnosis))
         
         return priority
     
+    def calculate_priority_bulk(self, table: PatientTable) -> np.ndarray:
+        """
+        Vectorized calculate_priority over a column snapshot of patients.
+        Applies the same status, vitals and diagnosis rules in one pass,
+        using the compiled Numba kernel when available and NumPy otherwise.
+        
+        Args:
+            table: PatientTable from hospital_state.get_patient_table()
+            
+        Returns:
+            int8 array of priorities aligned with table.patients
+        """
+        priority = self.STATUS_PRIORITY[table.status]
+        spo2, hr, temp = table.spo2, table.heart_rate, table.temperature
+        
+        # Diagnosis keywords are string matches, so they stay per-row
+        diagnosis_cap = np.fromiter((self._diagnosis_priority(d) for d in table.diagnoses),
+                                    dtype=np.int8, count=len(table))
+        
+        if NUMBA_AVAILABLE:
+            return _priority_kernel(priority, spo2, hr, temp, diagnosis_cap)
+        
+        # Vitals overrides (every rule only ever lowers the priority number)
+        priority = np.where(spo2 < VitalThresholds.SPO2_CRITICAL, 1,
+                   np.where(spo2 < VitalThresholds.SPO2_LOW, np.minimum(priority, 2), priority))
+        
+        hr_critical = (hr > VitalThresholds.HR_CRITICAL_HIGH) | (hr < VitalThresholds.HR_CRITICAL_LOW)
+        hr_abnormal = (hr > VitalThresholds.HR_HIGH) | (hr < VitalThresholds.HR_LOW)
+        priority = np.where(hr_critical, 1, np.where(hr_abnormal, np.minimum(priority, 2), priority))
+        
+        temp_cap = np.where(temp >= VitalThresholds.TEMP_HIGH_FEVER, 2,
+                   np.where(temp >= VitalThresholds.TEMP_FEVER, 3,
+                   np.where(temp <= VitalThresholds.TEMP_HYPOTHERMIA, 2, 5)))
+        priority = np.minimum(priority, temp_cap)
+        
+        return np.minimum(priority, diagnosis_cap).astype(np.int8)
+    
     def get_priority_label(self, priority: int) -> str:
         """
         Get human-readable label for priority level.
@@ -220,6 +322,12 @@ class TriageEngine:
         new_priority = self.calculate_priority(patient)
         hospital_state.save()
         
+        # Wake the agent for status upgrades instead of waiting out its interval
+        if status_changed and patient.status == PatientStatus.CRITICAL:
+            emit_vitals_critical(patient_id, patient.bed_id, patient.spo2, patient.heart_rate)
+        elif status_changed and patient.status == PatientStatus.SERIOUS:
+            emit_vitals_warning(patient_id, patient.bed_id, patient.spo2, patient.heart_rate)
+        
         return {
             "success": True,
             "patient_id": patient_id,
@@ -264,8 +372,7 @@ class TriageEngine:
         result["actions_taken"].append(f"Triage priority set to {priority}")
         
         # Step 2: Register patient in system
-        if patient.id not in hospital_state.patients:
-            hospital_state.patients[patient.id] = patient
+        if hospital_state.add_patient(patient):
             result["actions_taken"].append("Patient registered in system")
         
         # Step 3: Bed Assignment
@@ -321,6 +428,7 @@ class TriageEngine:
         result["message"] = f"Patient processed successfully with priority {priority}"
         
         hospital_state.save()
+        emit_patient_admitted(patient.id, patient.name, priority, result["bed_assigned"])
         return result
     
     def discharge_patient(self, patient_id: str, reason: str = "Recovery") -> Dict:
@@ -371,9 +479,7 @@ class TriageEngine:
         )
         
         # Remove from active patients
-        del hospital_state.patients[patient_id]
-        
-        hospital_state.save()
+        hospital_state.remove_patient(patient_id)
         return result
     
     def get_patient_queue(self) -> List[Dict]:
@@ -463,8 +569,10 @@ class TriageEngine:
         waiting_for_bed = 0
         waiting_for_doctor = 0
         
-        for patient in hospital_state.patients.values():
-            priority = self.calculate_priority(patient)
+        table = hospital_state.get_patient_table()
+        priorities = self.calculate_priority_bulk(table).tolist()
+        
+        for patient, priority in zip(table.patients, priorities):
             priority_counts[priority] = priority_counts.get(priority, 0) + 1
             
             if not patient.bed_id:
@@ -582,6 +690,12 @@ if __name__ == "__main__":
         triage_engine.process_incoming_patient(p)
     
     queue = triage_engine.get_patient_queue()
+    
+    bulk = triage_engine.calculate_priority_bulk(hospital_state.get_patient_table())
+    scalar = [triage_engine.calculate_priority(p) for p in hospital_state.patients.values()]
+    assert bulk.tolist() == scalar, f"Bulk priorities {bulk.tolist()} != {scalar}"
+    print("✓ Vectorized priorities match per-patient calculation")
+    
     print(f"✓ Patient queue ({len(queue)} patients):")
     for p in queue:
         print(f"  - {p['name']}: Priority {p['priority']} ({p['priority_label']})")
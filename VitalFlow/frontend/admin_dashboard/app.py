@@ -458,7 +458,7 @@ def render_new_patient_registration():
                 )
                 
                 # Add patient to state
-                hospital_state.patients[patient_id] = new_patient
+                hospital_state.add_patient(new_patient)
                 
                 # Log patient registration
                 hospital_state.log_decision(
@@ -0,0 +1,35 @@
+"""
+Gunicorn configuration for the VitalFlow AI backend.
+Run with: gunicorn -c gunicorn_conf.py app:app
+
+Each worker is a separate process with its own copy of hospital_state.
+A single worker is started unless WEB_CONCURRENCY asks for more. Only
+hospital_state and the response cache are shared through Redis; alerts,
+prescriptions, stock, billing, reports, pending approvals, agent cycle jobs
+and WebSocket clients stay per-process, so multiple workers need REDIS_URL
+plus sticky sessions.
+"""
+import os
+
+bind = f"{os.getenv('BACKEND_HOST', '0.0.0.0')}:{os.getenv('BACKEND_PORT', '8000')}"
+
+# Same default as app.py: most services keep state in process memory, so more workers are opt-in
+workers = int(os.getenv("WEB_CONCURRENCY", 1))
+
+# Uvicorn workers pick uvloop and httptools automatically when installed
+worker_class = "uvicorn.workers.UvicornWorker"
+worker_connections = 1000
+
+timeout = 30
+graceful_timeout = 30
+keepalive = 5
+
+# No periodic worker recycling: a restarted worker loses every in-process service
+# state and any running agent loop. Re-enable once that state lives outside the process.
+max_requests = 0
+max_requests_jitter = 0
+
+# Per-request access lines are off unless ACCESS_LOG=true; errors still go to stderr
+accesslog = "-" if os.getenv("ACCESS_LOG", "false").lower() == "true" else None
+errorlog = "-"
+loglevel = os.getenv("LOG_LEVEL", "info").lower()
@@ -29,6 +29,7 @@ class EventType(str, Enum):
     STAFF_PUNCH_OUT = "staff_punch_out"
     STAFF_ASSIGNED = "staff_assigned"
     STAFF_FATIGUE_WARNING = "staff_fatigue_warning"
+    STAFF_ALERTS_BATCH = "staff_alerts_batch"  # All agent staff alerts of one cycle
     
     # Alert Events
     CODE_BLUE = "code_blue"
@@ -247,6 +248,54 @@ def emit_vitals_warning(patient_id: str, bed_id: str, spo2: float, heart_rate: i
     )
 
 
+def emit_vitals_critical(patient_id: str, bed_id: str, spo2: float, heart_rate: int):
+    """Emit critical vitals event."""
+    event_bus.publish(
+        EventType.VITALS_CRITICAL,
+        {
+            "patient_id": patient_id,
+            "bed_id": bed_id,
+            "spo2": spo2,
+            "heart_rate": heart_rate
+        }
+    )
+
+
+def emit_ambulance_dispatched(ambulance_id: str, eta_minutes: int, condition: str = None):
+    """Emit ambulance dispatched event."""
+    event_bus.publish(
+        EventType.AMBULANCE_DISPATCHED,
+        {
+            "ambulance_id": ambulance_id,
+            "eta_minutes": eta_minutes,
+            "condition": condition
+        }
+    )
+
+
+def emit_ambulance_arriving(ambulance_id: str, eta_minutes: int):
+    """Emit ambulance arriving (pre-clearance window) event."""
+    event_bus.publish(
+        EventType.AMBULANCE_ARRIVING,
+        {
+            "ambulance_id": ambulance_id,
+            "eta_minutes": eta_minutes
+        }
+    )
+
+
+def emit_code_blue(location: str, patient_id: str = None, patient_name: str = None):
+    """Emit Code Blue event."""
+    event_bus.publish(
+        EventType.CODE_BLUE,
+        {
+            "location": location,
+            "patient_id": patient_id,
+            "patient_name": patient_name
+        }
+    )
+
+
 def emit_bed_swap(patient_out: str, patient_in: str, bed_freed: str, bed_assigned: str):
     """Emit bed swap event."""
     event_bus.publish(
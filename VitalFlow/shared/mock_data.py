@@ -400,17 +400,16 @@ def load_mock_data_to_state():
     # Generate data
     data = populate_hospital_state(occupancy_rate=0.6)
     
-    # Load into state
-    for bed in data["beds"]:
-        hospital_state.beds[bed.id] = bed
-    
-    for patient in data["patients"]:
-        hospital_state.patients[patient.id] = patient
-    
-    for staff_member in data["staff"]:
-        hospital_state.staff[staff_member.id] = staff_member
-    
-    hospital_state.save()
+    # Load into state (one save for the whole batch)
+    with hospital_state.batch():
+        for bed in data["beds"]:
+            hospital_state.add_bed(bed)
+        
+        for patient in data["patients"]:
+            hospital_state.add_patient(patient)
+        
+        for staff_member in data["staff"]:
+            hospital_state.add_staff(staff_member)
     
     stats = hospital_state.get_stats()
     print(f"✓ Mock data loaded:")
@@ -1,6 +1,17 @@
 """
 Utility functions for VitalFlow AI.
 """
+from .models import PatientStatus, BedType, StaffRole, StaffStatus
+
+
+# Every shared enum member mapped to its string value. Because these are str
+# enums, a plain string like "Critical" hashes equal to its member and hits too.
+ENUM_STR = {
+    member: member.value
+    for enum_cls in (PatientStatus, BedType, StaffRole, StaffStatus)
+    for member in enum_cls
+}
+
 
 def get_enum_value(enum_val) -> str:
     """
@@ -13,4 +24,7 @@ def get_enum_value(enum_val) -> str:
     Returns:
         String value
     """
-    return enum_val.value if hasattr(enum_val, 'value') else str(enum_val)
+    try:
+        return ENUM_STR[enum_val]
+    except (KeyError, TypeError):
+        return enum_val.value if hasattr(enum_val, 'value') else str(enum_val)
@@ -58,6 +58,26 @@ def print_info(text):
 def print_critical(text):
     print(f"{Colors.BOLD}{Colors.MAGENTA}💀 {text}{Colors.END}")
 
+def run_agent_cycle(timeout=30):
+    """Queue an agent cycle and wait for its result"""
+    job = requests.post(f"{BASE_URL}/api/agent/cycle").json()
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = requests.get(f"{BASE_URL}/api/agent/cycle/{job['job_id']}").json()
+        if job.get("status") in ("completed", "failed"):
+            break
+        time.sleep(0.2)
+    return job
+
+def wait_for_prescription(prescription_id, timeout=10):
+    """Wait for an uploaded prescription to finish scanning"""
+    deadline = time.time() + timeout
+    while True:
+        prescription = requests.get(f"{BASE_URL}/api/prescriptions/{prescription_id}").json()
+        if prescription.get("status") not in ("Uploaded", "Scanning") or time.time() >= deadline:
+            return prescription
+        time.sleep(0.2)
+
 def scenario_setup():
     """Setup the nightmare scenario"""
     print_header("🌙 SCENARIO: MIDNIGHT MASS CASUALTY INCIDENT")
@@ -401,10 +421,9 @@ Ranitidine 50mg IV BD x 7 days"""
             "raw_text": rx["prescription"]
         })
         
-        if r.status_code == 200:
-            result = r.json()
-            prescription_id = result["prescription"]["prescription_id"]
-            medicines_count = len(result["prescription"]["medicines"])
+        if r.status_code == 202:
+            prescription_id = r.json()["prescription"]["prescription_id"]
+            medicines_count = len(wait_for_prescription(prescription_id)["medicines"])
             print_success(f"Prescription {prescription_id}: {rx['patient_name']}")
             print(f"   └─ {medicines_count} medicines parsed")
             
@@ -498,10 +517,10 @@ def phase_9_vitalflow_agent():
     
     for cycle in range(3):
         print_info(f"Agent Cycle {cycle + 1}/3...")
-        r = requests.post(f"{BASE_URL}/api/agent/cycle")
+        job = run_agent_cycle()
         
-        if r.status_code == 200:
-            result = r.json()
+        if job.get("status") == "completed":
+            result = job["result"]
             decisions = result.get("decisions_made", 0)
             total_decisions += decisions
             print_success(f"   └─ {decisions} decisions made")
@@ -598,7 +617,7 @@ def phase_11_stock_emergency_orders():
                 print_success(f"   └─ VERIFIED by CMO")
                 
                 # Place order immediately
-                r = requests.post(f"{BASE_URL}/api/stock/orders/{order['order_id']}/place?placed_by=CMO")
+                r = requests.post(f"{BASE_URL}/api/stock/orders/{order['order_id']}/place", json={"placed_by": "CMO"})
                 if r.status_code == 200:
                     print_success(f"   └─ Order placed with supplier!")
     else:
@@ -2,10 +2,22 @@
 VitalFlow AI - Complete System Test
 Tests all major features of the VitalFlow hospital command center.
 """
+import time
 import requests
 
 BASE_URL = 'http://localhost:8000'
 
+def run_agent_cycle(timeout=30):
+    """Queue an agent cycle and wait for its result"""
+    job = requests.post(f'{BASE_URL}/api/agent/cycle').json()
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = requests.get(f'{BASE_URL}/api/agent/cycle/{job["job_id"]}').json()
+        if job.get("status") in ("completed", "failed"):
+            break
+        time.sleep(0.2)
+    return job
+
 def main():
     print('=' * 60)
     print('🏥 VitalFlow AI - Complete System Test')
@@ -59,21 +71,21 @@ def main():
     else:
         print(f'   ⚠ Could not get bill: {r.status_code}')
 
-    r = requests.post(f'{BASE_URL}/api/billing/P001/medicine?medicine_name=aspirin&quantity=2')
+    r = requests.post(f'{BASE_URL}/api/billing/P001/medicine', json={'medicine_name': 'aspirin', 'quantity': 2})
     if r.status_code == 200:
         result = r.json()
         print(f'   ✓ Medicine added: {result.get("item_name", "aspirin")}')
     else:
         print(f'   ⚠ Medicine add failed: {r.status_code}')
 
-    r = requests.post(f'{BASE_URL}/api/billing/P001/procedure?procedure_name=ecg')
+    r = requests.post(f'{BASE_URL}/api/billing/P001/procedure', json={'procedure_name': 'ecg'})
     if r.status_code == 200:
         result = r.json()
         print(f'   ✓ Procedure added: {result.get("item_name", "ecg")}')
     else:
         print(f'   ⚠ Procedure add failed')
 
-    r = requests.post(f'{BASE_URL}/api/billing/P001/bed-charge?bed_type=icu&days=0.5')
+    r = requests.post(f'{BASE_URL}/api/billing/P001/bed-charge', json={'bed_type': 'icu', 'days': 0.5})
     if r.status_code == 200:
         print(f'   ✓ Bed charges added')
     else:
@@ -113,8 +125,7 @@ def main():
     print(f'   ✓ Agent running: {status.get("is_running", False)}')
     print(f'     Cycles: {status.get("cycle_count", 0)}, Decisions: {status.get("decision_count", 0)}')
 
-    r = requests.post(f'{BASE_URL}/api/agent/cycle')
-    result = r.json()
+    result = run_agent_cycle().get('result') or {}
     print(f'   ✓ Manual cycle executed: {result.get("decisions_made", 0)} decisions')
     
     r = requests.get(f'{BASE_URL}/api/agent/pending-approvals')
@@ -5,11 +5,21 @@ Test script for new VitalFlow AI features:
 3. Prescription Scanner
 4. Doctor Alerts
 """
+import time
 import requests
 from datetime import datetime, timedelta
 
 BASE_URL = "http://localhost:8000"
 
+def wait_for_prescription(prescription_id, timeout=10):
+    """Wait for an uploaded prescription to finish scanning"""
+    deadline = time.time() + timeout
+    while True:
+        prescription = requests.get(f"{BASE_URL}/api/prescriptions/{prescription_id}").json()
+        if prescription.get("status") not in ("Uploaded", "Scanning") or time.time() >= deadline:
+            return prescription
+        time.sleep(0.2)
+
 def test_stock_management():
     """Test medicine stock management"""
     print("\n" + "="*60)
@@ -192,9 +202,10 @@ Paracetamol 500mg TDS x 5 days"""
     result = r.json()
     if result.get("success"):
         prescription_id = result["prescription"]["prescription_id"]
+        prescription = wait_for_prescription(prescription_id)
         print(f"   ✓ Prescription uploaded: {prescription_id}")
-        print(f"   ✓ Status: {result['prescription']['status']}")
-        print(f"   ✓ Medicines found: {len(result['prescription']['medicines'])}")
+        print(f"   ✓ Status: {prescription['status']}")
+        print(f"   ✓ Medicines found: {len(prescription['medicines'])}")
     
     # 2. Get detailed medicine info
     print("\n2️⃣ Getting AI-generated medicine details...")